@@ -3,6 +3,7 @@ from functools import partial, partialmethod
 import logging
 import inspect
 from itertools import chain
+from os.path import abspath, join, normcase
 import re
 import shutil
 from subprocess import check_call, CalledProcessError, DEVNULL
@@ -10,6 +11,7 @@ from types import MappingProxyType
 
 from cli_helpers.utils import strip_ansi
 from coalib.bearlib.abstractions.LinterClass import LinterClass
+from coalib.bearlib.abstractions.LinterDaemon import LinterDaemon
 from coalib.bears.LocalBear import LocalBear
 from coalib.bears.GlobalBear import GlobalBear
 from coala_utils.ContextManagers import make_temp
@@ -43,7 +45,9 @@ def _prepare_options(options, bear_class):
                        'executable_check_fail_info',
                        'prerequisite_check_command',
                        'global_bear',
-                       'strip_ansi'}
+                       'strip_ansi',
+                       'batch_size',
+                       'use_daemon'}
 
     if not options['use_stdout'] and not options['use_stderr']:
         raise ValueError('No output streams provided at all.')
@@ -152,6 +156,32 @@ def _prepare_options(options, bear_class):
         raise ValueError('Incompatible arguments provided:'
                          "'use_stdin' and 'global_bear' can't both be True.")
 
+    if options['use_daemon']:
+        options.setdefault('daemon_arguments', ())
+        options.setdefault('daemon_timeout', 30)
+        assert_right_type(options['daemon_arguments'], tuple,
+                          'daemon_arguments')
+        assert_right_type(options['daemon_timeout'], (int, float),
+                          'daemon_timeout')
+        if options['daemon_timeout'] <= 0:
+            raise ValueError('Invalid value for `daemon_timeout`: ' +
+                             repr(options['daemon_timeout']))
+        allowed_options |= {'daemon_arguments', 'daemon_timeout'}
+
+    if options['batch_size'] < 1:
+        raise ValueError('Invalid value for `batch_size`: ' +
+                         repr(options['batch_size']))
+
+    if options['batch_size'] > 1:
+        if options['global_bear'] or options['use_stdin']:
+            raise ValueError('Incompatible arguments provided: '
+                             "'batch_size' can't be used together with "
+                             "'global_bear' or 'use_stdin'.")
+        if (options['output_format'] != 'regex' or
+                'filename' not in options['output_regex'].groupindex):
+            raise ValueError("'batch_size' needs output-format 'regex' with "
+                             'the named group `filename` in `output_regex`.')
+
     # Check for illegal superfluous options.
     superfluous_options = options.keys() - allowed_options
     if superfluous_options:
@@ -230,17 +260,23 @@ def _create_linter(klass, options):
                         return options['prerequisite_check_fail_message']
                 return True
 
+        # The names of the parameters taking the files to lint. The default
+        # ``generate_config`` keeps its single file names in batch mode.
+        _file_params = ({'filename', 'file', 'filenames', 'files'}
+                        if options['batch_size'] > 1 else
+                        {'filename', 'file'})
+
         @classmethod
         def _get_create_arguments_metadata(cls):
             return FunctionMetadata.from_function(
                 cls.create_arguments,
-                omit={'self', 'filename', 'file', 'config_file'})
+                omit={'self', 'config_file'} | cls._file_params)
 
         @classmethod
         def _get_generate_config_metadata(cls):
             return FunctionMetadata.from_function(
                 cls.generate_config,
-                omit={'filename', 'file'})
+                omit=cls._file_params)
 
         @classmethod
         def _get_process_output_metadata(cls):
@@ -321,9 +357,10 @@ def _create_linter(klass, options):
                                                     groups['origin'].strip())
 
             # GlobalBears do not pass a filename to the function. But they can
-            # still give one through the regex
-            if filename is None:
-                filename = groups.get('filename', None)
+            # still give one through the regex. The executable runs inside the
+            # config directory, so relative paths are relative to it.
+            if filename is None and groups.get('filename'):
+                filename = join(self.get_config_dir(), groups['filename'])
 
             if options['remove_zero_numbers']:
                 for variable in ('line', 'column', 'end_line', 'end_column'):
@@ -629,16 +666,20 @@ def _create_linter(klass, options):
                         fl.write(content)
                     yield config_file
 
-        def run(self, filename=None, file=None, **kwargs):
+        def _execute(self, filename, file, kwargs):
             """
-            Runs the wrapped tool.
+            Runs the wrapped tool and collects its output.
 
             :param filename:
                 The filename of the file being linted. ``None`` for project
-                scope.
+                scope. A tuple of filenames when linting a batch.
             :param file:
                 The content of the file being linted. ``None`` for project
-                scope.
+                scope. A tuple of file contents when linting a batch.
+            :param kwargs:
+                Section settings passed from ``run()``.
+            :return:
+                The output to process, or ``None`` if there is none.
             """
             # Get the **kwargs params to forward to `generate_config()`
             # (from `_create_config()`).
@@ -670,16 +711,19 @@ def _create_linter(klass, options):
                 except TypeError:
                     self.err('The given arguments '
                              '{!r} are not iterable.'.format(args))
-                    return
+                    return None
 
                 arguments = (self.get_executable(),) + args
                 self.debug("Running '{}'".format(
                     ' '.join(str(arg) for arg in arguments)))
 
-                result = run_shell_command(
-                    arguments,
-                    stdin=''.join(file) if options['use_stdin'] else None,
-                    cwd=self.get_config_dir())
+                stdin = ''.join(file) if options['use_stdin'] else None
+                if options['use_daemon']:
+                    result = self._get_daemon().run(
+                        args, stdin=stdin, cwd=self.get_config_dir())
+                else:
+                    result = run_shell_command(
+                        arguments, stdin=stdin, cwd=self.get_config_dir())
 
                 stdout, stderr = result
 
@@ -708,20 +752,128 @@ def _create_linter(klass, options):
                     logging.info(
                         '{}: No output; skipping processing'.format(
                             self.__class__.__name__))
-                    return
+                    return None
 
                 if options['strip_ansi']:
                     output = tuple(map(strip_ansi, output))
 
                 if len(output) == 1:
-                    output = output[0]
+                    return output[0]
                 else:
-                    output = tuple(output)
+                    return tuple(output)
+
+        def _get_daemon(self):
+            """
+            Returns the daemon running the executable for this bear, which is
+            started on its first request.
+
+            :return:
+                A ``LinterDaemon``.
+            """
+            if getattr(self, '_daemon', None) is None:
+                self._daemon = LinterDaemon(
+                    (self.get_executable(),) + options['daemon_arguments'],
+                    cwd=self.get_config_dir(),
+                    timeout=options['daemon_timeout'])
+            return self._daemon
+
+        def _run_batch(self, filenames, files, kwargs):
+            """
+            Runs the wrapped tool once on multiple files and assigns the
+            results to the files using the ``filename`` group of
+            ``output_regex``.
+
+            :param filenames:
+                The filenames of the files to lint.
+            :param files:
+                The contents of the files to lint.
+            :param kwargs:
+                Section settings passed from ``run()``.
+            :return:
+                A dict mapping each of the filenames to a list of its results.
+                Results of other files are dropped, just like results without
+                a file unless only a single file is linted.
+            """
+            results = {filename: [] for filename in filenames}
+
+            output = self._execute(tuple(filenames), tuple(files), kwargs)
+            if output is None:
+                return results
+
+            process_output_kwargs = FunctionMetadata.filter_parameters(
+                self._get_process_output_metadata(), kwargs)
+            known_files = {normcase(abspath(filename)): filename
+                           for filename in filenames}
+            for result in self.process_output(output, None, None,
+                                              **process_output_kwargs):
+                if result.affected_code:
+                    filename = known_files.get(
+                        normcase(result.affected_code[0].file))
+                elif len(filenames) == 1:
+                    filename = filenames[0]
+                else:
+                    filename = None
+
+                if filename is None:
+                    logging.warning(
+                        '{}: Dropping result not belonging to any linted '
+                        'file: {}'.format(self.__class__.__name__,
+                                          result.message))
+                else:
+                    results[filename].append(result)
+
+            return results
 
-                process_output_kwargs = FunctionMetadata.filter_parameters(
-                    self._get_process_output_metadata(), kwargs)
-                return self.process_output(output, filename, file,
-                                           **process_output_kwargs)
+        def prepare_batch(self, filenames, files):
+            """
+            Runs the wrapped tool on all given files at once if the linter
+            uses batches. ``run()`` returns the results of these files
+            afterwards.
+
+            :param filenames:
+                The filenames of the files to lint.
+            :param files:
+                The contents of the files to lint.
+            """
+            if options['batch_size'] == 1:
+                return
+
+            # Results of files that were never run on, e.g. because they
+            # couldn't be read, are discarded with the next batch.
+            self._batch_results = {}
+            try:
+                kwargs = self.get_section_params()
+            except ValueError:
+                # Missing settings are reported when running on the files.
+                return
+
+            self._batch_results = self._run_batch(filenames, files, kwargs)
+
+        def run(self, filename=None, file=None, **kwargs):
+            """
+            Runs the wrapped tool.
+
+            :param filename:
+                The filename of the file being linted. ``None`` for project
+                scope.
+            :param file:
+                The content of the file being linted. ``None`` for project
+                scope.
+            """
+            if options['batch_size'] > 1:
+                if filename not in self._batch_results:
+                    self._batch_results.update(
+                        self._run_batch((filename,), (file,), kwargs))
+                return self._batch_results.pop(filename)
+
+            output = self._execute(filename, file, kwargs)
+            if output is None:
+                return
+
+            process_output_kwargs = FunctionMetadata.filter_parameters(
+                self._get_process_output_metadata(), kwargs)
+            return self.process_output(output, filename, file,
+                                       **process_output_kwargs)
 
         def __repr__(self):
             return '<{} linter object (wrapping {!r}) at {}>'.format(
@@ -734,6 +886,13 @@ def _create_linter(klass, options):
 
     class LocalLinterBase(LinterBase, LocalBear, metaclass=LocalLinterMeta):
 
+        BATCH_SIZE = options['batch_size']
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            # The results of files linted in a batch but not returned yet.
+            self._batch_results = {}
+
         @staticmethod
         def create_arguments(filename, file, config_file):
             """
@@ -805,6 +964,8 @@ def linter(executable: str,
            prerequisite_check_command: tuple = (),
            output_format: (str, None) = None,
            strip_ansi: bool = False,
+           batch_size: int = 1,
+           use_daemon: bool = False,
            **options):
     """
     Decorator that creates a ``Bear`` that is able to process results from
@@ -873,6 +1034,19 @@ def linter(executable: str,
     ...                          config_file):
     ...         return '--lint', filename, '--config', config_file
 
+    Tools which take a long time to start up can lint multiple files per
+    invocation with ``batch_size``. The files are passed as tuples then:
+
+    >>> @linter('xlint',
+    ...         batch_size=50,
+    ...         output_format='regex',
+    ...         output_regex=r'(?P<filename>.+):(?P<line>\\d+): '
+    ...                      r'(?P<message>.*)')
+    ... class XLintBear:
+    ...     @staticmethod
+    ...     def create_arguments(filenames, files, config_file):
+    ...         return ('--lint',) + filenames
+
     As you can see you don't need to copy additional keyword-arguments you
     introduced from ``create_arguments()`` to ``generate_config()`` and
     vice-versa. ``linter`` takes care of forwarding the right arguments to the
@@ -1013,6 +1187,28 @@ def linter(executable: str,
     :param strip_ansi:
         Supresses colored output from linters when enabled by stripping the
         ascii characters around the text.
+    :param batch_size:
+        The maximum number of files to lint with a single invocation of the
+        executable. By default each file is linted on its own. If greater
+        than ``1``, ``create_arguments()`` and ``generate_config()`` receive
+        tuples of filenames and file contents instead of a single file, and
+        the results are assigned to the files using the named group
+        ``filename`` of ``output_regex``, which needs to match the filenames
+        passed to the executable. Requires ``output_format='regex'``, and
+        can't be used together with ``use_stdin`` or ``global_bear``.
+    :param use_daemon:
+        Whether to keep the executable running in the background and send it
+        the arguments of each run instead of starting it every time. This
+        saves the startup time of tools that support a server mode. See
+        ``coalib.bearlib.abstractions.LinterDaemon`` for the protocol the
+        executable needs to speak. The output is processed as usual.
+    :param daemon_arguments:
+        The arguments to start the executable as daemon with. Can only be
+        provided together with ``use_daemon``.
+    :param daemon_timeout:
+        The number of seconds to wait for the daemon to answer a request,
+        30 by default. The daemon is restarted if it doesn't answer in time.
+        Can only be provided together with ``use_daemon``.
     :raises ValueError:
         Raised when invalid options are supplied.
     :raises TypeError:
@@ -1034,5 +1230,7 @@ def linter(executable: str,
     options['prerequisite_check_command'] = prerequisite_check_command
     options['global_bear'] = global_bear
     options['strip_ansi'] = strip_ansi
+    options['batch_size'] = batch_size
+    options['use_daemon'] = use_daemon
 
     return partial(_create_linter, options=options)
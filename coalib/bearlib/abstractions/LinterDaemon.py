@@ -0,0 +1,217 @@
+import atexit
+import json
+import logging
+import os
+import queue
+from subprocess import DEVNULL, PIPE, Popen, TimeoutExpired
+import threading
+
+from coalib.misc.Shell import ShellCommandResult
+
+
+def write_message(stream, message):
+    """
+    Writes a JSON message with a ``Content-Length`` header to a binary stream.
+
+    >>> import io
+    >>> stream = io.BytesIO()
+    >>> write_message(stream, {'stdout': 'text'})
+    >>> stream.getvalue()
+    b'Content-Length: 18\\r\\n\\r\\n{"stdout": "text"}'
+
+    :param stream:  The stream to write to.
+    :param message: The JSON serializable message.
+    """
+    body = json.dumps(message).encode('utf-8')
+    header = 'Content-Length: {}\r\n\r\n'.format(len(body))
+    stream.write(header.encode('ascii') + body)
+    stream.flush()
+
+
+def read_message(stream):
+    """
+    Reads a JSON message written by ``write_message`` from a binary stream.
+
+    >>> import io
+    >>> read_message(io.BytesIO(b'Content-Length: 2\\r\\n\\r\\n{}'))
+    {}
+    >>> read_message(io.BytesIO(b'')) is None
+    True
+
+    :param stream:      The stream to read from.
+    :raises ValueError: Raised when the stream doesn't contain a valid
+                        message.
+    :return:            The message or ``None`` if the stream ended.
+    """
+    length = None
+    while True:
+        line = stream.readline()
+        if not line:
+            return None
+
+        line = line.strip()
+        if not line:
+            break
+
+        name, _, value = line.decode('ascii').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+
+    if length is None:
+        raise ValueError('Message without Content-Length header.')
+
+    body = stream.read(length)
+    if len(body) < length:
+        return None
+    return json.loads(body.decode('utf-8'))
+
+
+class LinterDaemon:
+    """
+    Keeps an executable running in the background and sends it requests to
+    lint files, so its startup cost is only paid once per process.
+
+    Requests and responses are JSON objects, each preceded by a
+    ``Content-Length`` header with the length of the object in bytes and an
+    empty line (see ``write_message``).
+
+    A request has the keys ``arguments`` (the list of arguments to lint with),
+    ``stdin`` (the input to lint or ``null``) and ``cwd`` (the directory to
+    resolve relative paths against or ``null``). The response may contain the
+    keys ``stdout``, ``stderr`` and ``code``, which are treated like the
+    output streams and exit code of a normal invocation of the executable.
+
+    The daemon is started on the first request. If it crashes, it is
+    restarted and the request is sent again once. If it doesn't respond in
+    time, it is killed and restarted on the next request. The daemon should
+    exit when its stdin is closed.
+    """
+
+    def __init__(self, command, cwd=None, timeout=30):
+        """
+        :param command: The command starting the daemon.
+        :param cwd:     The working directory of the daemon.
+        :param timeout: The number of seconds to wait for a response.
+        """
+        self.command = tuple(command)
+        self.cwd = cwd
+        self.timeout = timeout
+        self._process = None
+        self._responses = None
+        self._owner_pid = None
+        self._stop_at_exit = False
+
+    def __getstate__(self):
+        # The daemon process belongs to the process which started it.
+        state = self.__dict__.copy()
+        state.update(_process=None, _responses=None, _owner_pid=None,
+                     _stop_at_exit=False)
+        return state
+
+    @property
+    def running(self):
+        """
+        Whether the daemon of this process is running.
+        """
+        return (self._process is not None and
+                self._owner_pid == os.getpid() and
+                self._process.poll() is None)
+
+    def start(self):
+        """
+        Starts the daemon.
+        """
+        self._process = Popen(self.command,
+                              stdin=PIPE,
+                              stdout=PIPE,
+                              stderr=DEVNULL,
+                              cwd=self.cwd)
+        self._owner_pid = os.getpid()
+        self._responses = queue.Queue()
+        threading.Thread(target=self._read_responses,
+                         args=(self._process.stdout, self._responses),
+                         daemon=True).start()
+
+        if not self._stop_at_exit:
+            atexit.register(self.stop)
+            self._stop_at_exit = True
+
+    def stop(self):
+        """
+        Stops the daemon by closing its stdin, or kills it if it doesn't exit
+        within a second.
+        """
+        if self._process is None or self._owner_pid != os.getpid():
+            self._process = None
+            return
+
+        try:
+            self._process.stdin.close()
+            self._process.wait(timeout=1)
+        except (OSError, TimeoutExpired):
+            self._process.kill()
+            self._process.wait()
+        self._process = None
+
+    @staticmethod
+    def _read_responses(stream, responses):
+        while True:
+            try:
+                response = read_message(stream)
+            except (OSError, ValueError):
+                response = None
+            responses.put(response)
+            if response is None:
+                return
+
+    def _request(self, request):
+        """
+        Sends a request to the daemon.
+
+        :return: The response or ``None`` if the daemon crashed.
+        """
+        try:
+            write_message(self._process.stdin, request)
+            return self._responses.get(timeout=self.timeout)
+        except OSError:
+            return None
+        except queue.Empty:
+            self._process.kill()
+            self.stop()
+            raise TimeoutError('The daemon {!r} did not respond within {} '
+                               'seconds.'.format(' '.join(self.command),
+                                                 self.timeout))
+
+    def run(self, arguments, stdin=None, cwd=None):
+        """
+        Lets the daemon lint, starting it if it's not running.
+
+        :param arguments:     The arguments to lint with.
+        :param stdin:         The input to lint.
+        :param cwd:           The directory to resolve relative paths against.
+        :raises TimeoutError: Raised when the daemon doesn't respond in time.
+        :raises OSError:      Raised when the daemon crashes again after it
+                              was restarted.
+        :return:              A ``ShellCommandResult`` of the response.
+        """
+        request = {'arguments': [str(argument) for argument in arguments],
+                   'stdin': stdin,
+                   'cwd': cwd}
+
+        for attempt in range(2):
+            if not self.running:
+                self.stop()
+                self.start()
+
+            response = self._request(request)
+            if response is not None:
+                return ShellCommandResult(response.get('code', 0),
+                                          response.get('stdout', ''),
+                                          response.get('stderr', ''))
+
+            self.stop()
+            if attempt == 0:
+                logging.debug('The daemon {!r} crashed, restarting it.'
+                              .format(' '.join(self.command)))
+
+        raise OSError('The daemon {!r} crashed.'.format(' '.join(self.command)))
@@ -6,6 +6,11 @@ from coala_utils.decorators import (
     enforce_signature, generate_eq, generate_repr)
 from coalib.parsing.ConfParser import ConfParser
 
+# Definitions loaded by ``DocstyleDefinition.load``, mapped by language,
+# docstyle and coalang file, together with the modification time and size of
+# the coalang file they were parsed from.
+_loaded_definitions = {}
+
 
 @generate_repr()
 @generate_eq('language', 'docstyle', 'markers')
@@ -234,20 +239,42 @@ class DocstyleDefinition:
         """
 
         docstyle = docstyle.lower()
-
-        language_config_parser = ConfParser(remove_empty_iter_elements=False)
+        language = language.lower()
 
         coalang_file = os.path.join(
             coalang_dir or os.path.dirname(__file__), docstyle + '.coalang')
 
+        # Definitions are parsed only once per process, as long as their
+        # coalang file doesn't change.
+        try:
+            stat = os.stat(coalang_file)
+        except OSError:
+            stamp = None
+        else:
+            stamp = stat.st_mtime_ns, stat.st_size
+            key = language, docstyle, coalang_file
+            loaded = _loaded_definitions.get(key)
+            if loaded is not None and loaded[0] == stamp:
+                return loaded[1]
+
+        definition = cls._parse(language, docstyle, coalang_file)
+        if stamp is not None:
+            _loaded_definitions[key] = stamp, definition
+        return definition
+
+    @classmethod
+    def _parse(cls, language, docstyle, coalang_file):
+        """
+        Parses a ``DocstyleDefinition`` from a coalang file, see ``load``.
+        """
+        language_config_parser = ConfParser(remove_empty_iter_elements=False)
+
         try:
             docstyle_settings = language_config_parser.parse(coalang_file)
         except FileNotFoundError:
             raise FileNotFoundError('Docstyle definition ' + repr(docstyle) +
                                     ' not found.')
 
-        language = language.lower()
-
         try:
             docstyle_settings = docstyle_settings[language]
         except KeyError:
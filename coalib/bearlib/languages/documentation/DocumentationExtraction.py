@@ -6,6 +6,7 @@ exposes a single function :func:`extract_documentation_with_markers`
 which is used by :class:`.DocBaseClass`, to extract documentation.
 """
 
+from functools import lru_cache
 import re
 
 from coalib.bearlib.languages.documentation.DocumentationComment import (
@@ -190,6 +191,43 @@ def _compile_multi_match_regex(strings):
     return re.compile('|'.join(re.escape(s) for s in strings))
 
 
+@lru_cache()
+def _get_begin_matcher(markers):
+    """
+    Prepares a marker-tuple dict that maps a begin pattern to the
+    corresponding marker_set(s), together with a regex matching any of the
+    begin patterns. Both only depend on the markers of a docstyle, so they
+    are built once for each.
+
+    :param markers: A tuple of marker sets.
+    :return:        A tuple of the begin regex and the marker-tuple dict.
+    """
+    marker_dict = {}
+    for marker_set in markers:
+        if marker_set[0] not in marker_dict:
+            marker_dict[marker_set[0]] = [marker_set]
+        else:
+            marker_dict[marker_set[0]].append(marker_set)
+
+    # Using regexes to perform a variable match is faster than finding each
+    # substring with ``str.find()`` choosing the lowest match.
+    begin_regex = _compile_multi_match_regex(
+        marker_set[0] for marker_set in markers)
+
+    return begin_regex, marker_dict
+
+
+@lru_cache()
+def _get_string_literal_regex(start_marker):
+    """
+    Compiles a regex matching the start of a string literal with the given
+    start marker.
+    """
+    return re.compile(r'^\s*r?(?P<marker>' +
+                      ('|'.join(re.escape(s) for s in start_marker)) +
+                      ')')
+
+
 def _extract_doc_comment_from_line(content, line, column, regex,
                                    marker_dict, docstyle_definition):
     cur_line = content[line]
@@ -236,24 +274,11 @@ def extract_documentation_with_markers(content, docstyle_definition):
     :return:
         An iterator returning each DocumentationComment found in the content.
     """
-    # Prepare marker-tuple dict that maps a begin pattern to the corresponding
-    # marker_set(s). This makes it faster to retrieve a marker-set from a
+    # The marker-tuple dict makes it faster to retrieve a marker-set from a
     # begin sequence we initially want to search for in source code. Then
     # the possible found documentation match is processed further with the
     # rest markers.
-    markers = docstyle_definition.markers
-
-    marker_dict = {}
-    for marker_set in markers:
-        if marker_set[0] not in marker_dict:
-            marker_dict[marker_set[0]] = [marker_set]
-        else:
-            marker_dict[marker_set[0]].append(marker_set)
-
-    # Using regexes to perform a variable match is faster than finding each
-    # substring with ``str.find()`` choosing the lowest match.
-    begin_regex = _compile_multi_match_regex(
-        marker_set[0] for marker_set in markers)
+    begin_regex, marker_dict = _get_begin_matcher(docstyle_definition.markers)
 
     line = 0
     column = 0
@@ -270,10 +295,7 @@ def extract_documentation_with_markers(content, docstyle_definition):
             yield doc
         elif doc:
             # Ignore string literals
-            ignore_regex = re.compile(
-                r'^\s*r?(?P<marker>' +
-                ('|'.join(re.escape(s) for s in doc.marker[0])) +
-                ')')
+            ignore_regex = _get_string_literal_regex(doc.marker[0])
             # Starting line of doc_string where marker is present
             start_line = doc.range.start.line - 1
             ignore_string_match = ignore_regex.search(content[start_line])
@@ -415,15 +415,26 @@ class Bear(Printer, LogPrinterMixin, metaclass=bearclass):
         self._dump_bear_profile_data(profiler)
         return results
 
+    def get_section_params(self):
+        """
+        Returns the keyword arguments for ``run()`` taken from the section.
+
+        :raises ValueError: Raised when a required setting is missing.
+        :return:            A dict of the arguments.
+        """
+        kwargs = {}
+        # Don't get `language` setting from `section.contents`
+        if self.section.language and (
+                'language' in self.get_metadata()._optional_params or
+                'language' in self.get_metadata()._non_optional_params):
+            kwargs['language'] = self.section.language
+        kwargs.update(
+            self.get_metadata().create_params_from_section(self.section))
+        return kwargs
+
     def run_bear_from_section(self, args, kwargs):
         try:
-            # Don't get `language` setting from `section.contents`
-            if self.section.language and (
-                    'language' in self.get_metadata()._optional_params or
-                    'language' in self.get_metadata()._non_optional_params):
-                kwargs['language'] = self.section.language
-            kwargs.update(
-                self.get_metadata().create_params_from_section(self.section))
+            kwargs.update(self.get_section_params())
         except ValueError as err:
             self.warn('The bear {} cannot be executed.'.format(
                 self.name), str(err))
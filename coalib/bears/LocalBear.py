@@ -18,12 +18,30 @@ class LocalBear(Bear):
         tabs, etc.
     -   A VariableNameBear that checks variable names and constant names for
         certain conditions
+
+    Bears that can analyze multiple files at once more efficiently, e.g.
+    because they call an external tool, can set ``BATCH_SIZE`` to the maximum
+    number of files they want to get at once. Before running the bear on each
+    of these files, coala calls ``prepare_batch()`` with all of them.
     """
 
+    BATCH_SIZE = 1
+
     @staticmethod
     def kind():
         return BEAR_KIND.LOCAL
 
+    def prepare_batch(self, filenames, files):
+        """
+        Prepares running the bear on multiple files. ``run()`` is called for
+        each of the files afterwards and may reuse the work done here.
+
+        By default nothing is prepared.
+
+        :param filenames: The filenames of the files.
+        :param files:     The file contents as string arrays.
+        """
+
     def run(self,
             filename,
             file,
@@ -155,7 +155,10 @@ def run_coala(console_printer=None,
                            settings_changed(None, settings_hash))
 
         if cache is None and not sections['cli'].get('disable_caching', False):
-            cache = FileDictFileCache(None, os.getcwd(), flush_cache)
+            cache = FileDictFileCache(
+                None, os.getcwd(), flush_cache,
+                track_content=bool(
+                    sections['cli'].get('content_cache', False)))
 
         if targets:
             sections = OrderedDict(
@@ -92,6 +92,38 @@ def mode_json(args, debug=False):
     return 0 if args.show_bears else exitcode
 
 
+def mode_json_lines(args, debug=False):
+    import functools
+    import sys
+
+    from coalib.coala_main import run_coala
+    from coalib.output.ConsoleInteraction import print_results_json_lines
+    from coalib.output.Logging import configure_json_logging
+    from coalib.output.JSONEncoder import create_json_encoder
+
+    JSONEncoder = create_json_encoder(use_relpath=args.relpath)
+
+    stream = open(str(args.output[0]), 'w') if args.output else sys.stdout
+    try:
+        if args.log_json:
+            configure_json_logging(stream)
+
+        _, exitcode, _ = run_coala(
+            print_results=functools.partial(print_results_json_lines,
+                                            stream,
+                                            JSONEncoder),
+            args=args,
+            debug=debug)
+    finally:
+        if args.output:
+            if args.log_json:
+                # Don't log to the closed file anymore.
+                configure_json_logging()
+            stream.close()
+
+    return exitcode
+
+
 def mode_format(args, debug=False):
     from coalib.coala_main import run_coala
     from coalib.output.ConsoleInteraction import print_results_formatted
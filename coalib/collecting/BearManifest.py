@@ -0,0 +1,139 @@
+from collections import namedtuple
+import os
+
+from coalib import VERSION
+from coalib.misc.CachingUtilities import pickle_dump, pickle_load
+
+BearInfo = namedtuple('BearInfo',
+                      'name kind languages can_detect can_fix aspects')
+BearInfo.__doc__ = """
+Describes a bear without the need to import it.
+
+``aspects`` contains the qualified names of the aspects the bear can detect
+or fix.
+"""
+
+
+def _get_aspect_names(aspects):
+    return frozenset(aspect.__qualname__ if isinstance(aspect, type) else
+                     type(aspect).__qualname__
+                     for aspect in aspects)
+
+
+def get_bear_info(bear_class, kind):
+    """
+    Creates the ``BearInfo`` of a bear class.
+
+    >>> from coalib.bears.BEAR_KIND import BEAR_KIND
+    >>> from coalib.bears.LocalBear import LocalBear
+    >>> class SomeBear(LocalBear):
+    ...     LANGUAGES = {'Python'}
+    ...     CAN_DETECT = {'Formatting'}
+    >>> info = get_bear_info(SomeBear, BEAR_KIND.LOCAL)
+    >>> info.name, info.languages, info.can_detect
+    ('SomeBear', frozenset({'Python'}), frozenset({'Formatting'}))
+
+    :param bear_class: The bear class.
+    :param kind:       The kind of the bear.
+    :return:           A ``BearInfo`` instance.
+    """
+    aspects = getattr(bear_class, 'aspects', {})
+    return BearInfo(
+        name=bear_class.name,
+        kind=kind,
+        languages=frozenset(bear_class.LANGUAGES),
+        can_detect=frozenset(bear_class.can_detect),
+        can_fix=frozenset(bear_class.CAN_FIX),
+        aspects=(_get_aspect_names(aspects.get('detect', ())) |
+                 _get_aspect_names(aspects.get('fix', ()))))
+
+
+class BearManifest:
+    """
+    A persistent index of the bears defined in bear files, so bear files
+    without interesting bears don't need to be imported.
+
+    >>> import tempfile
+    >>> from coalib.bears.BEAR_KIND import BEAR_KIND
+    >>> manifest = BearManifest('test_bear_manifest')
+    >>> with tempfile.NamedTemporaryFile(suffix='.py') as bear_file:
+    ...     manifest.get(bear_file.name) is None
+    ...     manifest.update(bear_file.name, [
+    ...         BearInfo('SomeBear', BEAR_KIND.LOCAL, frozenset({'C'}),
+    ...                  frozenset(), frozenset(), frozenset())])
+    ...     [info.name for info in manifest.get(bear_file.name)]
+    True
+    ['SomeBear']
+
+    Entries are valid as long as the modification time and size of the bear
+    file and the coala version stay the same. Bears imported from other files
+    through ``__additional_bears__`` are recorded for the importing file, so
+    the index can miss changes of those.
+    """
+
+    def __init__(self, identifier='bear_manifest'):
+        """
+        :param identifier: The identifier of the manifest inside the coala user
+                           data directory.
+        """
+        self.identifier = identifier
+        data = pickle_load(None, identifier, None)
+        if data is None or data.get('version') != VERSION:
+            self.files = {}
+        else:
+            self.files = data['files']
+        self.changed = False
+
+    @staticmethod
+    def _get_stamp(file_path):
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self, file_path):
+        """
+        Returns the recorded bears of a bear file.
+
+        :param file_path: The path of the bear file.
+        :return:          A list of ``BearInfo`` instances, or ``None`` if the
+                          file isn't recorded or changed since.
+        """
+        entry = self.files.get(file_path)
+        if entry is not None and entry[0] == self._get_stamp(file_path):
+            return entry[1]
+        return None
+
+    def update(self, file_path, bear_infos):
+        """
+        Records the bears of a bear file.
+
+        :param file_path:  The path of the bear file.
+        :param bear_infos: A list of ``BearInfo`` instances for all bears
+                           defined in the file.
+        """
+        self.files[file_path] = self._get_stamp(file_path), list(bear_infos)
+        self.changed = True
+
+    def save(self):
+        """
+        Stores the manifest if it changed.
+        """
+        if self.changed:
+            pickle_dump(None, self.identifier,
+                        {'version': VERSION, 'files': self.files})
+            self.changed = False
+
+
+_manifest = None
+
+
+def get_bear_manifest():
+    """
+    Returns the ``BearManifest`` shared inside this process.
+    """
+    global _manifest
+    if _manifest is None:
+        _manifest = BearManifest()
+    return _manifest
@@ -1,3 +1,4 @@
+from collections import OrderedDict
 import functools
 import logging
 import os
@@ -7,12 +8,14 @@ import re
 from types import ModuleType
 
 from coalib.bears.BEAR_KIND import BEAR_KIND
+from coalib.collecting.BearManifest import get_bear_info, get_bear_manifest
 from coalib.collecting.Importers import iimport_objects
 from coala_utils.decorators import yield_once
 from coalib.misc.Exceptions import log_exception
 from coalib.misc.IterUtilities import partition
 from coalib.output.printers.LOG_LEVEL import LOG_LEVEL
-from coalib.parsing.Globbing import fnmatch, iglob, glob_escape, has_wildcard
+from coalib.parsing.Globbing import (
+    fnmatch, iglob, iglob_files, glob_escape, has_wildcard, GlobSet)
 from coalib.bearlib.languages.Language import Languages
 from coalib.bearlib.languages import definitions
 
@@ -25,18 +28,33 @@ def _get_kind(bear_class):
 
 
 def _import_bears(file_path, kinds):
+    bear_classes = []
     # recursive imports:
     for bear_list in iimport_objects(file_path,
                                      names='__additional_bears__',
                                      types=list):
-        for bear_class in bear_list:
-            if _get_kind(bear_class) in kinds:
-                yield bear_class
+        bear_classes += bear_list
     # normal import
-    for bear_class in iimport_objects(file_path,
-                                      attributes='kind',
-                                      local=True):
-        if _get_kind(bear_class) in kinds:
+    bear_classes += iimport_objects(file_path,
+                                    attributes='kind',
+                                    local=True)
+
+    bear_classes = [(bear_class, _get_kind(bear_class))
+                    for bear_class in bear_classes]
+    # Record all bears of the file, so it doesn't need to be imported again
+    # to find out whether it contains bears of other kinds.
+    try:
+        bear_infos = [get_bear_info(bear_class, kind)
+                      for bear_class, kind in bear_classes
+                      if kind is not None]
+    except AttributeError:
+        # Not a complete bear, so the file is imported again next time.
+        pass
+    else:
+        get_bear_manifest().update(file_path, bear_infos)
+
+    for bear_class, kind in bear_classes:
+        if kind in kinds:
             yield bear_class
 
 
@@ -54,6 +72,26 @@ def _sort_bears(bears, key=lambda x: x.name.lower(), reverse=False):
     return sorted(bears, key=key, reverse=reverse)
 
 
+def _strip_trailing_globstars(ignored_globs):
+    """
+    Removes the unnecessary trailing globstar from ignore globs of the form
+    ``dir/**`` and warns about it.
+
+    :param ignored_globs: List of globs to ignore when matching files
+    :return:              The fixed list of globs
+    """
+    if ignored_globs is None:
+        ignored_globs = []
+    for index, glob in enumerate(ignored_globs):
+        dirname, basename = os.path.split(glob)
+        if not has_wildcard(dirname) and basename == '**':
+            logging.warning("Detected trailing globstar in ignore glob '{}'. "
+                            "Please remove the unnecessary '**' from its end."
+                            .format(glob))
+            ignored_globs[index] = glob.rstrip('*')
+    return ignored_globs
+
+
 @yield_once
 def icollect(file_paths, ignored_globs=None, match_cache={},
              match_function=fnmatch):
@@ -70,15 +108,7 @@ def icollect(file_paths, ignored_globs=None, match_cache={},
     if isinstance(file_paths, str):
         file_paths = [file_paths]
 
-    if ignored_globs is None:
-        ignored_globs = []
-    for index, glob in enumerate(ignored_globs):
-        dirname, basename = os.path.split(glob)
-        if not has_wildcard(dirname) and basename == '**':
-            logging.warning("Detected trailing globstar in ignore glob '{}'. "
-                            "Please remove the unnecessary '**' from its end."
-                            .format(glob))
-            ignored_globs[index] = glob.rstrip('*')
+    ignored_globs = _strip_trailing_globstars(ignored_globs)
 
     for file_path in file_paths:
         if file_path not in match_cache:
@@ -131,20 +161,20 @@ def collect_files(file_paths, log_printer=None, ignored_file_paths=None,
     """
     Evaluate globs in file paths and return all matching files
 
+    The filesystem is walked once for all globs, without descending into
+    ignored directories (see ``coalib.parsing.Globbing.iglob_files``).
+
     :param file_paths:         File path or list of such that can include globs
     :param ignored_file_paths: List of globs that match to-be-ignored files
     :param limit_file_paths:   List of globs that the files are limited to
     :param section_name:       Name of currently executing section
     :return:                   List of paths of all matching files
     """
-    limit_fnmatch = (functools.partial(fnmatch, globs=limit_file_paths)
+    limit_fnmatch = (GlobSet(limit_file_paths).match
                      if limit_file_paths else lambda fname: True)
 
-    valid_files = list(
-        filter(lambda fname: os.path.isfile(fname[0]),
-               icollect(file_paths,
-                        ignored_file_paths,
-                        match_function=match_dir_or_file_pattern)))
+    valid_files = list(iglob_files(
+        file_paths, _strip_trailing_globstars(ignored_file_paths)))
 
     # Find globs that gave no files and warn the user
     if valid_files:
@@ -157,8 +187,9 @@ def collect_files(file_paths, log_printer=None, ignored_file_paths=None,
                          'If this rule is not required, you can remove it '
                          'from section [' + section_name + '] in your '
                          '.coafile to deactivate this warning.')
-    limited_files = list(filter(limit_fnmatch, collected_files))
-    return limited_files
+    limited_files = filter(limit_fnmatch, collected_files)
+    # Files matched by multiple globs are collected only once.
+    return list(OrderedDict.fromkeys(limited_files))
 
 
 def collect_dirs(dir_paths, ignored_dir_paths=None):
@@ -179,17 +210,31 @@ def collect_dirs(dir_paths, ignored_dir_paths=None):
 
 
 @yield_once
-def icollect_bears(bear_dir_glob, bear_globs, kinds, log_printer=None):
+def icollect_bears(bear_dir_glob, bear_globs, kinds, log_printer=None,
+                   bear_filter=None):
     """
     Collect all bears from bear directories that have a matching kind.
 
+    Bear files are only imported if the bear manifest (see
+    ``coalib.collecting.BearManifest``) doesn't know them yet or lists a bear
+    to be collected in them.
+
     :param bear_dir_glob: Directory globs or list of such that can contain bears
     :param bear_globs:    Globs of bears to collect
     :param kinds:         List of bear kinds to be collected
     :param log_printer:   Log_printer to handle logging
+    :param bear_filter:   A function taking a ``BearInfo`` and returning
+                          whether to collect the bear, or ``None`` to collect
+                          all bears.
     :return:              Iterator that yields a tuple with bear class and
                           which bear_glob was used to find that bear class.
     """
+    def is_wanted(bear_info):
+        return (bear_info.kind in kinds and
+                (bear_filter is None or bear_filter(bear_info)))
+
+    manifest = get_bear_manifest()
+
     for bear_dir, dir_glob in filter(lambda x: os.path.isdir(x[0]),
                                      icollect(bear_dir_glob)):
         # Since we get a real directory here and since we
@@ -201,9 +246,17 @@ def icollect_bears(bear_dir_glob, bear_globs, kinds, log_printer=None):
             matching_files = sorted(matching_files)
 
             for matching_file in matching_files:
+                bear_infos = manifest.get(matching_file)
+                if bear_infos is not None and not any(map(is_wanted,
+                                                          bear_infos)):
+                    continue
+
                 try:
                     for bear in _import_bears(matching_file, kinds):
-                        yield bear, bear_glob
+                        if (bear_filter is None or
+                                bear_filter(get_bear_info(bear,
+                                                          _get_kind(bear)))):
+                            yield bear, bear_glob
                 except pkg_resources.VersionConflict as exception:
                     log_exception(
                         ('Unable to collect bears from {file} because there '
@@ -224,9 +277,11 @@ def icollect_bears(bear_dir_glob, bear_globs, kinds, log_printer=None):
                         exception,
                         log_level=LOG_LEVEL.WARNING)
 
+    manifest.save()
+
 
 def collect_bears(bear_dirs, bear_globs, kinds, log_printer=None,
-                  warn_if_unused_glob=True):
+                  warn_if_unused_glob=True, bear_filter=None):
     """
     Collect all bears from bear directories that have a matching kind
     matching the given globs.
@@ -238,13 +293,17 @@ def collect_bears(bear_dirs, bear_globs, kinds, log_printer=None,
     :param log_printer:         log_printer to handle logging.
     :param warn_if_unused_glob: True if warning message should be shown if a
                                 glob didn't give any bears.
+    :param bear_filter:         A function taking a ``BearInfo`` and
+                                returning whether to collect the bear, or
+                                ``None`` to collect all bears.
     :return:                    Tuple of list of matching bear classes based on
                                 kind. The lists are in the same order as kinds
                                 and not sorted based upon bear name.
     """
     bears_found = tuple([] for i in range(len(kinds)))
     bear_globs_with_bears = set()
-    for bear, glob in icollect_bears(bear_dirs, bear_globs, kinds):
+    for bear, glob in icollect_bears(bear_dirs, bear_globs, kinds,
+                                     bear_filter=bear_filter):
         index = kinds.index(_get_kind(bear))
         bears_found[index].append(bear)
         bear_globs_with_bears.add(glob)
@@ -261,7 +320,8 @@ def collect_bears(bear_dirs, bear_globs, kinds, log_printer=None,
                 suffix_globs[glob + 'Bear'] = glob
 
     for bear, glob in icollect_bears(bear_dirs,
-                                     set(suffix_globs.keys()), kinds):
+                                     set(suffix_globs.keys()), kinds,
+                                     bear_filter=bear_filter):
         index = kinds.index(_get_kind(bear))
         bears_found[index].append(bear)
         bear_globs_with_bears.add(suffix_globs[glob])
@@ -307,7 +367,18 @@ def collect_bears_by_aspects(aspects, kinds):
                     in the same order as kinds and not sorted based upon bear
                     name.
     """
-    all_bears = get_all_bears()
+    aspect_names = [type(aspect).__qualname__
+                    for aspect in aspects.get_leaf_aspects()]
+
+    def may_cover_aspects(bear_info):
+        # Bears declare whole aspect trees by their root aspect, so compare
+        # the names like ``issubaspect`` does.
+        return any(aspect_name == name or aspect_name.startswith(name + '.')
+                   for aspect_name in aspect_names
+                   for name in bear_info.aspects)
+
+    # Only bears declaring any of the aspects need to be imported.
+    all_bears = get_all_bears(bear_filter=may_cover_aspects)
     bears_found = tuple([] for i in range(len(kinds)))
     unfulfilled_aspects = []
     for aspect in aspects.get_leaf_aspects():
@@ -359,16 +430,20 @@ def filter_capabilities_by_languages(bears, languages):
     return language_bears_capabilities
 
 
-def get_all_bears():
+def get_all_bears(bear_filter=None):
     """
     Get an unsorted ``list`` of all available bears.
+
+    :param bear_filter: A function taking a ``BearInfo`` and returning whether
+                        to collect the bear, or ``None`` to collect all bears.
     """
     from coalib.settings.Section import Section
     local_bears, global_bears = collect_bears(
         Section('').bear_dirs(),
         ['**'],
         [BEAR_KIND.LOCAL, BEAR_KIND.GLOBAL],
-        warn_if_unused_glob=False)
+        warn_if_unused_glob=False,
+        bear_filter=bear_filter)
     return list(itertools.chain(local_bears, global_bears))
 
 
@@ -402,13 +477,16 @@ def get_all_languages(include_unknown=False):
 
 def collect_all_bears_from_sections(sections,
                                     log_printer=None,
-                                    bear_globs=('**',)):
+                                    bear_globs=('**',),
+                                    bear_filter=None):
     """
     Collect all kinds of bears from bear directories given in the sections.
 
     :param sections:    List of sections so bear_dirs are taken into account
     :param log_printer: Log_printer to handle logging
     :param bear_globs:  List of glob patterns.
+    :param bear_filter: A function taking a ``BearInfo`` and returning whether
+                        to collect the bear, or ``None`` to collect all bears.
     :return:            Tuple of dictionaries of unsorted local and
                         global bears. The dictionary key is section class and
                         dictionary value is a list of Bear classes
@@ -421,7 +499,8 @@ def collect_all_bears_from_sections(sections,
             bear_dirs,
             bear_globs,
             [BEAR_KIND.LOCAL, BEAR_KIND.GLOBAL],
-            warn_if_unused_glob=False)
+            warn_if_unused_glob=False,
+            bear_filter=bear_filter)
     return local_bears, global_bears
 
 
@@ -1,22 +1,79 @@
+from binascii import hexlify
 from collections import defaultdict
 from functools import partial
+from hashlib import sha1
 import inspect
 import logging
+import os
 from os import makedirs
 from os.path import join, abspath, exists
+import shutil
 
 from appdirs import user_data_dir
 
 from coala_utils.decorators import (enforce_signature, classproperty,
                                     get_public_members)
 
+from dependency_management.requirements.ExecutableRequirement import (
+    ExecutableRequirement)
+import pkg_resources
 import requests
 
+from coalib.core.PersistentHash import fingerprint
 from coalib.results.Result import Result
 from coalib.settings.ConfigurationGathering import get_config_directory
 from coalib.settings.FunctionMetadata import FunctionMetadata
 from coalib.settings.Section import Section
 
+# Digests of source files, mapped by their path, modification time and size.
+_source_file_digests = {}
+
+
+def _get_source_file_digest(path):
+    """
+    Returns the SHA-1 digest of a source file. Digests are kept as long as the
+    file isn't modified, so shared modules like the ones of base classes are
+    read only once.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+
+    key = path, stat.st_mtime_ns, stat.st_size
+    digest = _source_file_digests.get(key)
+    if digest is None:
+        with open(path, 'rb') as fl:
+            digest = sha1(fl.read()).digest()
+        _source_file_digests[key] = digest
+    return digest
+
+
+def _get_requirement_state(requirement):
+    """
+    Describes a requirement together with the state of what is installed for
+    it, as far as this can be determined cheaply: Executables are identified
+    by their path, modification time and size, pip packages by their installed
+    version.
+    """
+    state = (type(requirement).__name__,
+             str(getattr(requirement, 'package', requirement)),
+             str(getattr(requirement, 'version', '')))
+
+    if isinstance(requirement, ExecutableRequirement):
+        path = shutil.which(requirement.executable)
+        if path is not None:
+            stat = os.stat(path)
+            state += (path, stat.st_mtime_ns, stat.st_size)
+    elif getattr(requirement, 'type', None) == 'pip':
+        try:
+            state += (
+                pkg_resources.get_distribution(requirement.package).version,)
+        except pkg_resources.DistributionNotFound:
+            pass
+
+    return state
+
 
 class Bear:
     """
@@ -159,6 +216,52 @@ class Bear:
         """
         return inspect.getfile(cls)
 
+    @classproperty
+    def version_fingerprint(cls):
+        """
+        A fingerprint of the code of the bear, used by result caches to
+        recompute the results of a bear once it changed.
+
+        It takes into account the source files of the bear and its base
+        classes as well as its ``REQUIREMENTS`` and what is installed for them,
+        like the version of a pip package or the executable of a linter:
+
+        >>> from dependency_management.requirements.PipRequirement import (
+        ...     PipRequirement)
+        >>> class SomeBear(Bear): pass
+        >>> class SomeOtherBear(Bear):
+        ...     REQUIREMENTS = {PipRequirement('coala_decorators', '0.2.1')}
+        >>> len(SomeBear.version_fingerprint)
+        40
+        >>> SomeBear.version_fingerprint == SomeOtherBear.version_fingerprint
+        False
+
+        The fingerprint is computed once per bear class and process.
+        """
+        version_fingerprint = cls.__dict__.get('_version_fingerprint')
+        if version_fingerprint is None:
+            paths = []
+            for klass in cls.__mro__:
+                if issubclass(klass, Bear):
+                    try:
+                        path = inspect.getfile(klass)
+                    except TypeError:
+                        # Classes defined interactively have no source file.
+                        continue
+                    if path not in paths:
+                        paths.append(path)
+            source_digests = [_get_source_file_digest(path) for path in paths]
+
+            requirement_states = sorted(
+                (_get_requirement_state(requirement)
+                 for requirement in cls.REQUIREMENTS),
+                key=repr)
+
+            version_fingerprint = hexlify(fingerprint(
+                (source_digests, requirement_states))).decode('ascii')
+            cls._version_fingerprint = version_fingerprint
+        return version_fingerprint
+
     @classproperty
     def maintainers(cls):
         """
@@ -281,7 +384,10 @@ class Bear:
         """
         # Those members get duplicated if they aren't excluded because they
         # exist also as fields.
-        excluded_members = {'can_detect', 'maintainers', 'maintainers_emails'}
+        # The version fingerprint is excluded too, as it describes the
+        # installation of the bear instead of the bear itself.
+        excluded_members = {'can_detect', 'maintainers', 'maintainers_emails',
+                            'version_fingerprint'}
 
         # json cannot serialize properties, so drop them
         data = {
@@ -451,6 +557,49 @@ class Bear:
         raise NotImplementedError('This function has to be implemented for a '
                                   'runnable bear.')
 
+    def create_command(self, *args, **kwargs):
+        """
+        Creates the command line of an external program to run for a task
+        instead of ``execute_task``.
+
+        Bears wrapping external programs can return the command here. The core
+        then runs the program asynchronously, so it doesn't occupy a worker
+        of the executor while waiting for it, and passes the output to
+        ``process_command_output``. By default no command is created:
+
+        >>> bear = Bear(Section('my-section'), {})
+        >>> bear.create_command('file1.txt') is None
+        True
+
+        :param args:
+            The arguments of a task.
+        :param kwargs:
+            The keyword-arguments of a task.
+        :return:
+            ``None`` to execute the task with ``execute_task``, or a tuple
+            ``(command, stdin)`` with the sequence of program arguments and
+            the input to pass to the program (or ``None``). The program is run
+            inside the directory returned by ``get_config_dir``.
+        """
+        return None
+
+    def process_command_output(self, output, *args, **kwargs):
+        """
+        Processes the output of the program run for a task whose command was
+        created by ``create_command``.
+
+        :param output:
+            A ``ShellCommandResult`` of the program.
+        :param args:
+            The arguments of a task.
+        :param kwargs:
+            The keyword-arguments of a task.
+        :return:
+            An iterable of results.
+        """
+        raise NotImplementedError('This function has to be implemented for a '
+                                  'bear creating commands.')
+
     def generate_tasks(self):
         """
         This method is responsible for providing the job arguments ``analyze``
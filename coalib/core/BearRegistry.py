@@ -0,0 +1,112 @@
+import os
+import pickle
+import shutil
+import tempfile
+
+# Bears loaded by the current (worker) process, mapped by their handle.
+_loaded_bears = {}
+
+
+def get_registered_bear(handle):
+    """
+    Returns the bear registered under the given handle. The bear is loaded
+    only once per process and kept for further tasks.
+
+    :param handle:
+        The handle returned from ``BearRegistry.register``.
+    :return:
+        The bear instance.
+    """
+    bear = _loaded_bears.get(handle)
+    if bear is None:
+        with open(handle, 'rb') as fl:
+            bear = pickle.load(fl)
+        _loaded_bears[handle] = bear
+    return bear
+
+
+def execute_registered_task(handle, args, kwargs):
+    """
+    Executes a task of a registered bear. This is the function submitted to
+    executors instead of the bound ``execute_task`` method of a bear, so only
+    the handle and the task arguments need to be transferred.
+
+    :param handle:
+        The handle returned from ``BearRegistry.register``.
+    :param args:
+        The arguments of the task.
+    :param kwargs:
+        The keyword-arguments of the task.
+    :return:
+        The results of the task.
+    """
+    return get_registered_bear(handle).execute_task(args, kwargs)
+
+
+class BearRegistry:
+    """
+    Stores bears for worker processes, so a bear together with its section and
+    file-dictionary is pickled only once instead of once per task.
+
+    A registered bear is identified by a small handle:
+
+    >>> from coalib.core.Bear import Bear
+    >>> from coalib.settings.Section import Section
+    >>> bear = Bear(Section('my-section'), {'file.py': ['x = 1\\n']})
+    >>> registry = BearRegistry()
+    >>> handle = registry.register(bear)
+
+    Worker processes load the bear from the handle once:
+
+    >>> loaded_bear = get_registered_bear(handle)
+    >>> loaded_bear.file_dict
+    {'file.py': ['x = 1\\n']}
+    >>> get_registered_bear(handle) is loaded_bear
+    True
+
+    Registering a bear again returns the same handle:
+
+    >>> registry.register(bear) == handle
+    True
+    >>> registry.close()
+
+    The pickled bears are stored inside a temporary directory, from where each
+    worker process loads them on first use. The page cache keeps them in
+    memory, so loading doesn't read from disk in practice.
+    """
+
+    def __init__(self):
+        self.handles = {}
+        self.directory = None
+
+    def register(self, bear):
+        """
+        Stores a bear for worker processes. Bears are pickled in their current
+        state, so this has to happen after their dependency results are set.
+
+        :param bear:
+            The bear instance.
+        :return:
+            The handle to pass to ``execute_registered_task``.
+        """
+        if bear not in self.handles:
+            if self.directory is None:
+                self.directory = tempfile.mkdtemp(prefix='coala-bears-')
+
+            handle = os.path.join(self.directory, str(len(self.handles)))
+            with open(handle, 'wb') as fl:
+                pickle.dump(bear, fl, protocol=4)
+            self.handles[bear] = handle
+
+        return self.handles[bear]
+
+    def close(self):
+        """
+        Removes the stored bears.
+        """
+        for handle in self.handles.values():
+            _loaded_bears.pop(handle, None)
+        self.handles.clear()
+        if self.directory is not None:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
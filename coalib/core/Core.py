@@ -1,12 +1,22 @@
 import asyncio
+from collections import defaultdict, deque
 import concurrent.futures
 import functools
+import heapq
+import itertools
 import logging
-
+import multiprocessing
+import platform
+import queue
+import threading
+import time
+
+from coalib.core.BearRegistry import BearRegistry, execute_registered_task
+from coalib.core.DependencyBear import DependencyBear
 from coalib.core.DependencyTracker import DependencyTracker
 from coalib.core.Graphs import traverse_graph
-from coalib.core.PersistentHash import persistent_hash
-from coalib.misc.Compatibility import run_coroutine_threadsafe
+from coalib.core.PersistentHash import fingerprint
+from coalib.misc.Shell import run_shell_command, run_shell_command_async
 
 
 def group(iterable, key=lambda x: x):
@@ -155,6 +165,81 @@ def initialize_dependencies(bears):
     return dependency_tracker, bears
 
 
+def get_priorities(bears, dependency_tracker, bear_times=None):
+    """
+    Computes the scheduling priorities of bears along the critical paths of
+    the dependency graph. The priority of a bear is its estimated run time
+    plus the highest priority of its dependants, so bears starting long chains
+    of dependants are run first.
+
+    >>> from coalib.core.DependencyTracker import DependencyTracker
+    >>> tracker = DependencyTracker()
+    >>> tracker.add('parser', 'analysis1')
+    >>> tracker.add('parser', 'analysis2')
+    >>> tracker.add('analysis2', 'report')
+    >>> priorities = get_priorities({'report', 'analysis1', 'other'}, tracker)
+    >>> [(bear, priorities[bear]) for bear in sorted(priorities)]
+    ... # doctest: +NORMALIZE_WHITESPACE
+    [('analysis1', 1.0), ('analysis2', 2.0), ('other', 1.0), ('parser', 3.0),
+     ('report', 1.0)]
+
+    The run times of bears are estimated from ``bear_times``. Bears without a
+    recorded time are assumed to take the average time of the others, or one
+    second if no times are recorded at all.
+
+    :param bears:
+        The bears to run.
+    :param dependency_tracker:
+        The ``DependencyTracker`` holding the dependencies of the bears.
+    :param bear_times:
+        A dictionary mapping bear types to the seconds all tasks of the bear
+        took in a previous run, or ``None``.
+    :return:
+        A dictionary mapping all bears, including dependencies, to their
+        priority.
+    """
+    bears = (set(bears) | dependency_tracker.dependencies |
+             dependency_tracker.dependants)
+
+    times = {}
+    if bear_times:
+        times = {bear: bear_times[type(bear)]
+                 for bear in bears if type(bear) in bear_times}
+    default_time = sum(times.values()) / len(times) if times else 1.0
+
+    priorities = {}
+
+    def get_priority(bear):
+        if bear not in priorities:
+            priorities[bear] = times.get(bear, default_time) + max(
+                (get_priority(dependant)
+                 for dependant in dependency_tracker.get_dependants(bear)),
+                default=0.0)
+        return priorities[bear]
+
+    for bear in bears:
+        get_priority(bear)
+
+    return priorities
+
+
+def _timed_call(function, *args):
+    """
+    Calls a function and measures the time it takes, also inside worker
+    processes.
+
+    :return:
+        A tuple ``(seconds, return_value)``.
+    """
+    start_time = time.perf_counter()
+    return_value = function(*args)
+    return time.perf_counter() - start_time, return_value
+
+
+# Put into the result queue to stop the result delivery thread.
+_STOP_DELIVERY = object()
+
+
 class Session:
     """
     Maintains a session for a coala execution. For each session, there are set
@@ -164,9 +249,24 @@ class Session:
     Dependencies of bears (provided via ``bear.BEAR_DEPS``) are automatically
     handled. If BearA requires BearB as dependency, then on running BearA,
     first BearB will be executed, followed by BearA.
+
+    Tasks are passed to the executor in the order of their priority (see
+    ``get_priorities``), so the bears on the critical path of the dependency
+    graph run first.
+
+    Tasks of ``DependencyBear``s with ``PIPELINED`` set are scheduled as soon
+    as the dependency results they analyze arrive, instead of after all
+    dependencies finished.
+
+    Results are passed to the result callback by a separate thread, so a slow
+    callback doesn't hold back the event loop. Only when the callback falls
+    behind by ``max_queued_results``, no new tasks are started until it
+    caught up.
     """
 
-    def __init__(self, bears, result_callback, cache=None, executor=None):
+    def __init__(self, bears, result_callback, cache=None, executor=None,
+                 max_subprocesses=None, bear_times=None,
+                 max_queued_results=1024):
         """
         :param bears:
             The bear instances to run.
@@ -180,6 +280,10 @@ class Session:
             Only those results are passed for bears that were explicitly
             requested via the ``bears`` parameter, implicit dependency results
             do not call the callback.
+
+            The callback is called from a separate result delivery thread,
+            not from the thread calling ``run()``, in the order the results
+            arrive.
         :param cache:
             A cache bears can use to speed up runs. If ``None``, no cache will
             be used.
@@ -192,7 +296,7 @@ class Session:
             The cache has to be a dictionary-like object, that maps bear types
             to respective cache-tables. The cache-tables itself are
             dictionary-like objects that map hash-values (generated by
-            ``PersistentHash.persistent_hash`` from the task objects) to actual
+            ``PersistentHash.fingerprint`` from the task objects) to actual
             bear results. When bears are about to be scheduled, the core
             performs a cache-lookup. If there's a hit, the results stored in
             the cache are returned and the task won't be scheduled. In case of
@@ -202,10 +306,33 @@ class Session:
             ``ProcessPoolExecutor`` is used using as many processes as cores
             available on the system. Note that a passed custom executor is
             closed after the core has finished.
+        :param max_subprocesses:
+            The maximum number of external programs run at the same time for
+            tasks of bears implementing ``create_command``. These programs run
+            asynchronously inside the event loop and don't occupy the
+            executor. If ``None``, as many as cores available on the system
+            are allowed.
+        :param bear_times:
+            A dictionary mapping bear types to the seconds all tasks of the
+            bear took in a previous run, used to prioritize bears. After the
+            run, it is updated with the times of the bears that ran. If
+            ``None``, bears are prioritized by the length of their dependency
+            chains only.
+        :param max_queued_results:
+            The maximum number of results waiting to be passed to the result
+            callback. If the callback falls behind that far, no new tasks are
+            started until it caught up. Tasks already running still finish,
+            their results wait inside the event loop.
         """
         self.bears = bears
         self.result_callback = result_callback
         self.cache = cache
+        self.result_queue = queue.Queue(max_queued_results)
+        self.delivery_thread = None
+        # Results that didn't fit into the result queue. They are put into it
+        # by ``forwarding_task`` without blocking the event loop.
+        self.overflowing_results = deque()
+        self.forwarding_task = None
 
         # Set up event loop and executor.
         self.event_loop = asyncio.SelectorEventLoop()
@@ -214,23 +341,173 @@ class Session:
                          executor)
         self.running_futures = {}
 
+        # Files are shared between the tasks of all bears, so their
+        # fingerprints are memoised for the whole session.
+        self.fingerprint_memo = {}
+
+        # Bears are pickled only once for worker processes, instead of
+        # transferring the bear with its file-dictionary for every task.
+        self.bear_registry = (
+            BearRegistry()
+            if isinstance(self.executor,
+                          concurrent.futures.ProcessPoolExecutor) else
+            None)
+
+        if max_subprocesses is None:
+            max_subprocesses = multiprocessing.cpu_count()
+        self.subprocess_semaphore = asyncio.Semaphore(max_subprocesses,
+                                                      loop=self.event_loop)
+        # Cleared while results overflow the result queue, new tasks wait for
+        # it.
+        self.result_queue_free = asyncio.Event(loop=self.event_loop)
+        self.result_queue_free.set()
+        # Decided on the first created command, see ``_attach_child_watcher``.
+        self.async_subprocesses = None
+
         # Initialize dependency tracking.
         self.dependency_tracker, self.bears_to_schedule = (
             initialize_dependencies(self.bears))
 
+        self.bear_times = bear_times
+        self.priorities = get_priorities(self.bears, self.dependency_tracker,
+                                         bear_times)
+        self.task_times = defaultdict(float)
+
+        # Only as many tasks as the executor has workers are passed to it, the
+        # others wait inside a heap ordered by priority. Tasks of bears that
+        # are resolved later can so still overtake tasks of bears with lower
+        # priority.
+        self.idle_workers = getattr(self.executor, '_max_workers',
+                                    multiprocessing.cpu_count())
+        self.waiting_tasks = []
+        self.task_counter = itertools.count()
+
     def run(self):
         """
         Runs the coala session.
         """
         try:
             if self.bears:
+                self.delivery_thread = threading.Thread(
+                    target=self._deliver_results, daemon=True)
+                self.delivery_thread.start()
+
                 self._schedule_bears(self.bears_to_schedule)
                 try:
                     self.event_loop.run_forever()
+                    if self.forwarding_task is not None:
+                        self.event_loop.run_until_complete(
+                            self.forwarding_task)
                 finally:
+                    if self.async_subprocesses:
+                        asyncio.get_child_watcher().attach_loop(None)
                     self.event_loop.close()
+                    self._put_result(_STOP_DELIVERY)
+                    self.delivery_thread.join()
         finally:
             self.executor.shutdown()
+            if self.bear_registry is not None:
+                self.bear_registry.close()
+            self.fingerprint_memo.clear()
+
+            if self.bear_times is not None:
+                self.bear_times.update(self.task_times)
+
+    def _put_result(self, result):
+        """
+        Puts a result into the result queue, waiting for free space as long as
+        the result delivery thread is running.
+
+        :param result:
+            The result to put.
+        :return:
+            True if the result was put into the queue.
+        """
+        while True:
+            try:
+                self.result_queue.put(result, timeout=0.1)
+                return True
+            except queue.Full:
+                if not self.delivery_thread.is_alive():
+                    return False
+
+    def _queue_results(self, results):
+        """
+        Queues results for the result delivery thread without blocking the
+        event loop. Results that don't fit into the result queue are put into
+        it by ``forwarding_task`` once there is space. Until then new tasks
+        wait for ``result_queue_free``.
+
+        :param results:
+            The results to queue.
+        """
+        for result in results:
+            if not self.overflowing_results:
+                try:
+                    self.result_queue.put_nowait(result)
+                    continue
+                except queue.Full:
+                    pass
+            self.overflowing_results.append(result)
+
+        if self.overflowing_results and (self.forwarding_task is None or
+                                         self.forwarding_task.done()):
+            self.result_queue_free.clear()
+            self.forwarding_task = self.event_loop.create_task(
+                self._forward_results())
+
+    @asyncio.coroutine
+    def _forward_results(self):
+        """
+        Puts the overflowing results into the result queue from a thread of
+        the default executor of the event loop.
+        """
+        while self.overflowing_results:
+            put = yield from self.event_loop.run_in_executor(
+                None, self._put_result, self.overflowing_results[0])
+            if not put:
+                self.overflowing_results.clear()
+                break
+            self.overflowing_results.popleft()
+        self.result_queue_free.set()
+
+    def _deliver_results(self):
+        """
+        Passes the results from the result queue to the result callback until
+        ``_STOP_DELIVERY`` is received. Runs inside its own thread.
+        """
+        while True:
+            result = self.result_queue.get()
+            if result is _STOP_DELIVERY:
+                break
+
+            try:
+                self.result_callback(result)
+            except Exception as ex:
+                # FIXME Try to display only the relevant traceback of the
+                # FIXME   result handler if error occurred there, not the
+                # FIXME   complete traceback.
+                logging.error(
+                    'An exception was thrown during result-handling.',
+                    exc_info=ex)
+
+    def _attach_child_watcher(self):
+        """
+        Attaches the asyncio child watcher to the event loop, so external
+        programs can be run asynchronously. This is only possible from the main
+        thread on Unix. Otherwise the programs are run in the default
+        ``ThreadPoolExecutor`` of the event loop.
+
+        The watcher is attached when the first command is created, so sessions
+        without bears implementing ``create_command`` leave it untouched. It's
+        detached again before the event loop is closed.
+        """
+        self.async_subprocesses = (
+            platform.system() != 'Windows' and
+            threading.current_thread() is threading.main_thread())
+
+        if self.async_subprocesses:
+            asyncio.get_child_watcher().attach_loop(self.event_loop)
 
     def _schedule_bears(self, bears):
         """
@@ -241,6 +518,10 @@ class Session:
         """
         bears_without_tasks = []
 
+        # Tasks are started in the order they are created.
+        bears = sorted(bears, key=lambda bear: self.priorities.get(bear, 0.0),
+                       reverse=True)
+
         for bear in bears:
             if self.dependency_tracker.get_dependencies(
                     bear):  # pragma: no cover
@@ -250,26 +531,13 @@ class Session:
                     'should be smarter. Please report this to the developers.'
                     .format(bear))
             else:
-                futures = set()
-
-                for task in bear.generate_tasks():
-                    bear_args, bear_kwargs = task
-
-                    if self.cache is None:
-                        future = self.event_loop.run_in_executor(
-                            self.executor, bear.execute_task,
-                            bear_args, bear_kwargs)
-                    else:
-                        # Execute the cache lookup in the default
-                        # ThreadPoolExecutor, so cache updates reflect properly
-                        # in the main process.
-                        future = self.event_loop.run_in_executor(
-                            None, self._execute_task_with_cache,
-                            bear, task)
-
-                    futures.add(future)
-
-                self.running_futures[bear] = futures
+                if self._is_pipelined(bear):
+                    # The tasks were already started as the dependency results
+                    # arrived.
+                    futures = self.running_futures.setdefault(bear, set())
+                else:
+                    futures = self._start_tasks(bear, bear.generate_tasks())
+                    self.running_futures[bear] = futures
 
                 # Cleanup bears without tasks after all bears had the chance to
                 # schedule their tasks. Not doing so might stop the run too
@@ -280,16 +548,45 @@ class Session:
                     bears_without_tasks.append(bear)
                     continue
 
-                for future in futures:
-                    future.add_done_callback(functools.partial(
-                        self._finish_task, bear))
-
                 logging.debug('Scheduled {!r} (tasks: {})'.format(
                     bear, len(futures)))
 
         for bear in bears_without_tasks:
             self._cleanup_bear(bear)
 
+    @staticmethod
+    def _is_pipelined(bear):
+        """
+        Returns whether the tasks of a bear are scheduled as the results of
+        its dependencies arrive.
+        """
+        return isinstance(bear, DependencyBear) and bear.PIPELINED
+
+    def _start_tasks(self, bear, tasks):
+        """
+        Starts tasks of a bear, looking up their results in the cache if
+        there's one.
+
+        :param bear:
+            The bear the tasks belong to.
+        :param tasks:
+            An iterable of tasks.
+        :return:
+            A set of futures, one for each task.
+        """
+        if self.cache is None:
+            futures = {self.event_loop.create_task(
+                           self._execute_task(bear, task))
+                       for task in tasks}
+        else:
+            futures = self._schedule_tasks_with_cache(bear, tasks)
+
+        for future in futures:
+            future.add_done_callback(functools.partial(
+                self._finish_task, bear))
+
+        return futures
+
     def _cleanup_bear(self, bear):
         """
         Cleans up state of an ongoing run for a bear.
@@ -305,10 +602,13 @@ class Session:
             The bear to clean up state for.
         """
         if not self.running_futures[bear]:
-            resolved_bears = self.dependency_tracker.resolve(bear)
+            # Pipelined bears can run out of tasks while their dependencies
+            # are still running. They are cleaned up again once scheduled.
+            if not self.dependency_tracker.get_dependencies(bear):
+                resolved_bears = self.dependency_tracker.resolve(bear)
 
-            if resolved_bears:
-                self._schedule_bears(resolved_bears)
+                if resolved_bears:
+                    self._schedule_bears(resolved_bears)
 
             del self.running_futures[bear]
 
@@ -326,33 +626,168 @@ class Session:
 
             self.event_loop.stop()
 
-    def _execute_task_with_cache(self, bear, task):
+    def _schedule_tasks_with_cache(self, bear, tasks):
+        """
+        Schedules the given tasks of a bear whose results aren't cached yet,
+        and stores their results in the cache when they complete.
+
+        The cache is looked up for all tasks of the bear at once, using the
+        ``get_many`` method of the cache-table if it provides one. Lookups and
+        stores happen inside the event loop, so they don't occupy threads.
+
+        :param bear:
+            The bear to schedule the tasks of.
+        :param tasks:
+            An iterable of tasks of the bear.
+        :return:
+            A set of futures, one for each task. Futures of cached tasks are
+            already done.
+        """
         if type(bear) not in self.cache:
             bear_cache = {}
             self.cache[type(bear)] = bear_cache
         else:
             bear_cache = self.cache[type(bear)]
 
-        fingerprint = persistent_hash(task)
+        tasks = list(tasks)
+        fingerprints = [fingerprint(task, self.fingerprint_memo)
+                        for task in tasks]
 
-        if fingerprint in bear_cache:
-            results = bear_cache[fingerprint]
+        get_many = getattr(bear_cache, 'get_many', None)
+        if get_many is None:
+            cached_results = {task_fingerprint: bear_cache[task_fingerprint]
+                              for task_fingerprint in fingerprints
+                              if task_fingerprint in bear_cache}
         else:
-            bear_args, bear_kwargs = task
+            cached_results = get_many(fingerprints)
 
-            future = run_coroutine_threadsafe(
-                asyncio.wait_for(
-                    self.event_loop.run_in_executor(
-                        self.executor, bear.execute_task,
-                        bear_args, bear_kwargs),
-                    None,
-                    loop=self.event_loop),
-                loop=self.event_loop)
+        futures = set()
+        for task, task_fingerprint in zip(tasks, fingerprints):
+            if task_fingerprint in cached_results:
+                future = asyncio.Future(loop=self.event_loop)
+                future.set_result(cached_results[task_fingerprint])
+            else:
+                future = self.event_loop.create_task(
+                    self._execute_task(bear, task))
+                future.add_done_callback(functools.partial(
+                    self._store_results, bear_cache, task_fingerprint))
+            futures.add(future)
 
-            results = future.result()
-            bear_cache[fingerprint] = results
+        logging.debug('{!r}: {} of {} tasks cached.'.format(
+            bear, len(cached_results), len(tasks)))
+
+        return futures
+
+    @staticmethod
+    def _store_results(bear_cache, fingerprint, future):
+        """
+        Stores the results of a completed task in the cache.
 
-        return results
+        :param bear_cache:
+            The cache-table of the bear the task belongs to.
+        :param fingerprint:
+            The fingerprint of the task.
+        :param future:
+            The future of the task.
+        """
+        if not future.cancelled() and future.exception() is None:
+            bear_cache[fingerprint] = future.result()
+
+    @asyncio.coroutine
+    def _acquire_worker(self, bear):
+        """
+        Waits until a worker of the executor is available for a task of the
+        given bear. Waiting tasks get the workers in the order of the priority
+        of their bears.
+
+        :param bear:
+            The bear the task belongs to.
+        """
+        if self.idle_workers > 0:
+            self.idle_workers -= 1
+        else:
+            waiter = asyncio.Future(loop=self.event_loop)
+            heapq.heappush(self.waiting_tasks,
+                           (-self.priorities.get(bear, 0.0),
+                            next(self.task_counter),
+                            waiter))
+            yield from waiter
+
+    def _release_worker(self):
+        """
+        Passes a worker of the executor to the waiting task with the highest
+        priority.
+        """
+        while self.waiting_tasks:
+            waiter = heapq.heappop(self.waiting_tasks)[2]
+            if not waiter.cancelled():
+                waiter.set_result(None)
+                return
+
+        self.idle_workers += 1
+
+    @asyncio.coroutine
+    def _execute_task(self, bear, task):
+        """
+        Executes a task of a bear.
+
+        If the bear creates a command for the task, the program is run
+        asynchronously (limited by ``max_subprocesses``) and its output is
+        processed inside the event loop. Otherwise the task is executed in the
+        executor once a worker is available. Worker processes receive only a
+        handle of the bear registered in ``bear_registry`` together with the
+        task arguments. The time the task took is added to ``task_times``.
+
+        :param bear:
+            The bear the task belongs to.
+        :param task:
+            The task, a tuple ``(args, kwargs)``.
+        :return:
+            The results of the task.
+        """
+        bear_args, bear_kwargs = task
+
+        # Don't produce new results while the callback can't keep up.
+        yield from self.result_queue_free.wait()
+
+        command = bear.create_command(*bear_args, **bear_kwargs)
+        if command is None:
+            if self.bear_registry is None:
+                call = (bear.execute_task, bear_args, bear_kwargs)
+            else:
+                call = (execute_registered_task,
+                        self.bear_registry.register(bear),
+                        bear_args,
+                        bear_kwargs)
+
+            yield from self._acquire_worker(bear)
+            try:
+                seconds, results = yield from self.event_loop.run_in_executor(
+                    self.executor, _timed_call, *call)
+            finally:
+                self._release_worker()
+
+            self.task_times[type(bear)] += seconds
+            return results
+
+        if self.async_subprocesses is None:
+            self._attach_child_watcher()
+
+        arguments, stdin = command
+        cwd = bear.get_config_dir()
+        with (yield from self.subprocess_semaphore):
+            start_time = time.perf_counter()
+            if self.async_subprocesses:
+                output = yield from run_shell_command_async(
+                    arguments, stdin, loop=self.event_loop, cwd=cwd)
+            else:
+                output = yield from self.event_loop.run_in_executor(
+                    None, functools.partial(run_shell_command, arguments,
+                                            stdin, cwd=cwd))
+            self.task_times[type(bear)] += time.perf_counter() - start_time
+
+        return list(bear.process_command_output(output, *bear_args,
+                                                **bear_kwargs))
 
     def _finish_task(self, bear, future):
         """
@@ -371,6 +806,13 @@ class Session:
 
             for dependant in self.dependency_tracker.get_dependants(bear):
                 dependant.dependency_results[type(bear)] += results
+
+                if self._is_pipelined(dependant):
+                    self.running_futures.setdefault(dependant, set()).update(
+                        self._start_tasks(
+                            dependant,
+                            dependant.generate_tasks_for_results(
+                                type(bear), results)))
         except Exception as ex:
             # FIXME Try to display only the relevant traceback of the bear if
             # FIXME   error occurred there, not the complete event-loop
@@ -394,23 +836,11 @@ class Session:
         # Only pass results to the callback for bears that were desired during
         # init.
         if results is not None and bear in self.bears:
-            for result in results:
-                try:
-                    # FIXME Long operations on the result-callback could block
-                    # FIXME   the scheduler significantly. It should be
-                    # FIXME   possible to schedule new Python Threads on the
-                    # FIXME   given event_loop and process the callback there.
-                    self.result_callback(result)
-                except Exception as ex:
-                    # FIXME Try to display only the relevant traceback of the
-                    # FIXME   result handler if error occurred there, not the
-                    # FIXME   complete event-loop traceback.
-                    logging.error(
-                        'An exception was thrown during result-handling.',
-                        exc_info=ex)
-
-
-def run(bears, result_callback, cache=None, executor=None):
+            self._queue_results(results)
+
+
+def run(bears, result_callback, cache=None, executor=None,
+        max_subprocesses=None, bear_times=None, max_queued_results=1024):
     """
     Initiates a session with the given parameters and runs it.
 
@@ -426,6 +856,9 @@ def run(bears, result_callback, cache=None, executor=None):
         Only those results are passed for bears that were explicitly requested
         via the ``bears`` parameter, implicit dependency results do not call
         the callback.
+
+        The callback is called from a separate result delivery thread, not
+        from the thread calling ``run()``, in the order the results arrive.
     :param cache:
         A cache bears can use to speed up runs. If ``None``, no cache will be
         used.
@@ -438,7 +871,7 @@ def run(bears, result_callback, cache=None, executor=None):
         The cache has to be a dictionary-like object, that maps bear types
         to respective cache-tables. The cache-tables itself are dictionary-like
         objects that map hash-values (generated by
-        ``PersistentHash.persistent_hash`` from the task objects) to actual
+        ``PersistentHash.fingerprint`` from the task objects) to actual
         bear results. When bears are about to be scheduled, the core performs
         a cache-lookup. If there's a hit, the results stored in the cache
         are returned and the task won't be scheduled. In case of a miss,
@@ -447,5 +880,19 @@ def run(bears, result_callback, cache=None, executor=None):
         Custom executor used to run the bears. If ``None``, a
         ``ProcessPoolExecutor`` is used using as many processes as cores
         available on the system.
+    :param max_subprocesses:
+        The maximum number of external programs run at the same time for tasks
+        of bears implementing ``create_command``. If ``None``, as many as
+        cores available on the system are allowed.
+    :param bear_times:
+        A dictionary mapping bear types to the seconds all tasks of the bear
+        took in a previous run, used to run the bears on the critical path of
+        the dependency graph first. After the run, it is updated with the
+        times of the bears that ran.
+    :param max_queued_results:
+        The maximum number of results waiting to be passed to the result
+        callback. If the callback falls behind that far, no new tasks are
+        started until it caught up.
     """
-    Session(bears, result_callback, cache, executor).run()
+    Session(bears, result_callback, cache, executor, max_subprocesses,
+            bear_times, max_queued_results).run()
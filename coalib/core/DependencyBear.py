@@ -7,8 +7,22 @@ class DependencyBear(Bear):
     This bear base class parallelizes tasks for each dependency result.
 
     You can specify dependency bears with the ``BEAR_DEPS`` field.
+
+    By default, the bear is scheduled once all of its dependencies finished.
+    Setting ``PIPELINED`` to ``True`` makes the core schedule a task for each
+    dependency result as soon as it arrives, so the bear runs alongside its
+    dependencies:
+
+    >>> class SomeBear(DependencyBear):
+    ...     PIPELINED = True
+
+    Pipelined bears may be transferred to worker processes before all
+    dependency results are available, so ``analyze`` must only use the
+    dependency result it is passed, not ``dependency_results``.
     """
 
+    PIPELINED = False
+
     def __init__(self, section, file_dict):
         """
         :param section:
@@ -33,7 +47,22 @@ class DependencyBear(Bear):
             cls.analyze,
             omit={'self', 'dependency_bear', 'dependency_result'})
 
-    def generate_tasks(self):
+    def generate_tasks_for_results(self, bear, dependency_results):
+        """
+        Generates the tasks for results of a dependency.
+
+        :param bear:
+            The type of the dependency bear.
+        :param dependency_results:
+            The results of the dependency bear.
+        :return:
+            An iterable of tasks, one for each result.
+        """
         return (((bear, dependency_result), self._kwargs)
-                for bear, dependency_results in self.dependency_results.items()
                 for dependency_result in dependency_results)
+
+    def generate_tasks(self):
+        return (task
+                for bear, dependency_results in self.dependency_results.items()
+                for task in self.generate_tasks_for_results(
+                    bear, dependency_results))
@@ -1,7 +1,10 @@
+from array import array
 from collections import Iterable
 from copy import deepcopy
 from hashlib import sha1
 import pickle
+import struct
+import sys
 
 
 def order(obj):
@@ -42,3 +45,144 @@ def persistent_hash(obj):
     fingerprint_generator = sha1()
     fingerprint_generator.update(pickle.dumps(obj, protocol=4))
     return fingerprint_generator.digest()
+
+
+try:
+    from hashlib import blake2b
+
+    def _new_hasher():
+        return blake2b(digest_size=20)
+except ImportError:  # pragma Python 3.6: no cover
+    # BLAKE2 is available since Python 3.6.
+    _new_hasher = sha1
+
+_HEADER = struct.Struct('<cQ')
+
+# Shorter sequences are cheaper to hash again than to memoise.
+MEMO_MIN_LENGTH = 32
+
+
+def _update_hash(hasher, obj, memo):
+    """
+    Feeds an object into a hasher, see ``fingerprint``.
+    """
+    typ = type(obj)
+
+    if typ is str:
+        data = obj.encode('utf-8', 'surrogatepass')
+        hasher.update(_HEADER.pack(b's', len(data)))
+        hasher.update(data)
+    elif typ is tuple or typ is list:
+        hasher.update(_HEADER.pack(b'l' if typ is list else b't', len(obj)))
+        hasher.update(_sequence_digest(obj, memo))
+    elif typ is dict:
+        hasher.update(_HEADER.pack(b'd', len(obj)))
+        for digest in sorted(_item_digest(key, value, memo)
+                             for key, value in obj.items()):
+            hasher.update(digest)
+    elif typ is set or typ is frozenset:
+        hasher.update(_HEADER.pack(b'f' if typ is frozenset else b'e',
+                                   len(obj)))
+        for digest in sorted(fingerprint(element, memo) for element in obj):
+            hasher.update(digest)
+    elif obj is None or typ is bool:
+        hasher.update(_HEADER.pack(b'c', 0))
+        hasher.update(repr(obj).encode('ascii'))
+    elif typ is int or typ is float:
+        data = repr(obj).encode('ascii')
+        hasher.update(_HEADER.pack(b'i' if typ is int else b'r', len(data)))
+        hasher.update(data)
+    elif typ is bytes:
+        hasher.update(_HEADER.pack(b'b', len(obj)))
+        hasher.update(obj)
+    else:
+        data = pickle.dumps(obj, protocol=4)
+        hasher.update(_HEADER.pack(b'p', len(data)))
+        hasher.update(data)
+
+
+def _item_digest(key, value, memo):
+    """
+    Returns the digest of a key-value pair of a dictionary.
+    """
+    hasher = _new_hasher()
+    _update_hash(hasher, key, memo)
+    _update_hash(hasher, value, memo)
+    return hasher.digest()
+
+
+def _sequence_digest(sequence, memo):
+    """
+    Returns the digest of the elements of a tuple or list. The digest of long
+    sequences is memoised by their identity, so the lines of a file are only
+    hashed once even if they are part of many tasks.
+    """
+    memoise = memo is not None and len(sequence) >= MEMO_MIN_LENGTH
+    if memoise:
+        entry = memo.get(id(sequence))
+        # The memo keeps a reference to the sequence, so its id can't be
+        # reused by another object.
+        if entry is not None and entry[0] is sequence:
+            return entry[1]
+
+    hasher = _new_hasher()
+    if set(map(type, sequence)) == {str}:
+        # Fast path for lines of files: hash all strings at once together
+        # with their lengths.
+        lengths = array('Q', map(len, sequence))
+        if sys.byteorder == 'big':  # pragma: no cover
+            lengths.byteswap()
+        hasher.update(b's')
+        hasher.update(lengths.tobytes())
+        hasher.update(''.join(sequence).encode('utf-8', 'surrogatepass'))
+    else:
+        for element in sequence:
+            _update_hash(hasher, element, memo)
+    digest = hasher.digest()
+
+    if memoise:
+        memo[id(sequence)] = sequence, digest
+    return digest
+
+
+def fingerprint(obj, memo=None):
+    """
+    Generates a fingerprint for an object, like a task of a bear. The
+    fingerprint is stable across Python runs.
+
+    Unlike ``persistent_hash``, strings, numbers and containers are fed into
+    the hash function directly instead of being copied and pickled first.
+    The order of dictionaries and sets doesn't matter:
+
+    >>> fingerprint({'a': {1, 2}, 'b': 3}) == fingerprint({'b': 3, 'a': {2, 1}})
+    True
+    >>> fingerprint(('file.py', ['line\\n'])) == fingerprint(('file.py',))
+    False
+
+    The contents of long tuples and lists (like the lines of a file) are
+    hashed only once when a memo is passed:
+
+    >>> memo = {}
+    >>> lines = ['line\\n'] * 100
+    >>> digest = fingerprint((('file.py', lines), {}), memo)
+    >>> len(memo)
+    1
+    >>> fingerprint((('file.py', lines), {'setting': 1}), memo) != digest
+    True
+    >>> len(memo)
+    1
+
+    As the memo is keyed by identity, the tuples and lists must not be
+    modified as long as the memo is used. Objects of other types are pickled.
+
+    :param obj:
+        The object to generate the fingerprint for.
+    :param memo:
+        A dictionary to memoise the digests of long tuples and lists in, or
+        ``None``.
+    :return:
+        The fingerprint as bytes.
+    """
+    hasher = _new_hasher()
+    _update_hash(hasher, obj, memo)
+    return hasher.digest()
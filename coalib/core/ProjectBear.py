@@ -6,6 +6,12 @@ class ProjectBear(Bear):
     """
     This bear base class does not parallelize tasks at all, it runs on the
     whole file base provided.
+
+    If the results for some files don't depend on other files, the bear can
+    split the file base into independent partitions by overriding
+    ``partition_files``. Each partition is analyzed in its own task and cached
+    separately, so a change to a file only reruns the analysis of the
+    partitions containing it.
     """
 
     def __init__(self, section, file_dict):
@@ -32,5 +38,38 @@ class ProjectBear(Bear):
             cls.analyze,
             omit={'self', 'files'})
 
+    def partition_files(self):
+        """
+        Splits the file base into partitions that are analyzed independently.
+        The results of the bear are the results of all partitions together.
+
+        By default, all files form a single partition. To analyze each
+        directory on its own for example, override it like this:
+
+        >>> from collections import defaultdict
+        >>> import os
+        >>> from coalib.settings.Section import Section
+        >>> class SomeBear(ProjectBear):
+        ...     def analyze(self, files):
+        ...         yield sorted(files)
+        ...
+        ...     def partition_files(self):
+        ...         partitions = defaultdict(dict)
+        ...         for filename, file in self.file_dict.items():
+        ...             directory = os.path.dirname(filename)
+        ...             partitions[directory][filename] = file
+        ...         return partitions.values()
+        >>> bear = SomeBear(Section('section'), {'a/1.py': [], 'a/2.py': [],
+        ...                                      'b/3.py': []})
+        >>> sorted(sorted(args[0]) for args, kwargs in bear.generate_tasks())
+        [['a/1.py', 'a/2.py'], ['b/3.py']]
+
+        :return:
+            An iterable of file-dictionaries, each containing a subset of
+            ``file_dict``.
+        """
+        return self.file_dict,
+
     def generate_tasks(self):
-        return ((self.file_dict,), self._kwargs),
+        return (((partition,), self._kwargs)
+                for partition in self.partition_files())
@@ -0,0 +1,364 @@
+from collections.abc import MutableMapping
+import logging
+import pickle
+import sqlite3
+import threading
+import time
+
+from coalib.misc.CachingUtilities import get_data_path
+
+
+def get_bear_key(bear_type):
+    """
+    Returns the key identifying the results of a bear type inside a
+    ``SQLiteCache``.
+
+    >>> from coalib.core.Bear import Bear
+    >>> class SomeBear(Bear):
+    ...     VERSION = '0.1'
+    >>> get_bear_key(SomeBear)
+    ('coalib.core.ResultCache.SomeBear', '0.1:...')
+
+    :param bear_type:
+        The bear class.
+    :return:
+        A tuple ``(name, version)``, where ``name`` is the fully qualified name
+        of the bear class and ``version`` combines the ``VERSION`` attribute
+        of the bear (an empty string if it has none) with its
+        ``version_fingerprint``.
+    """
+    return ('{}.{}'.format(bear_type.__module__, bear_type.__qualname__),
+            '{}:{}'.format(getattr(bear_type, 'VERSION', ''),
+                           bear_type.version_fingerprint))
+
+
+class SQLiteCache(MutableMapping):
+    """
+    A persistent cache for ``coalib.core.Core.Session`` storing bear results in
+    an SQLite database.
+
+    The cache maps bear types to ``SQLiteCacheTable`` objects, which map task
+    fingerprints (as generated by ``PersistentHash.fingerprint``) to the
+    results of the task:
+
+    >>> import os, tempfile
+    >>> from coalib.core.Bear import Bear
+    >>> class SomeBear(Bear):
+    ...     pass
+    >>> directory = tempfile.mkdtemp()
+    >>> cache = SQLiteCache(os.path.join(directory, 'results.db'))
+    >>> cache[SomeBear][b'fingerprint'] = [1, 2, 3]
+
+    The results are stored on disk, so they survive the cache instance:
+
+    >>> cache.close()
+    >>> cache = SQLiteCache(os.path.join(directory, 'results.db'))
+    >>> cache[SomeBear][b'fingerprint']
+    [1, 2, 3]
+
+    Results are partitioned by the name, the ``VERSION`` and the
+    ``version_fingerprint`` of a bear, so a new version of a bear doesn't hit
+    results of previous versions, even if its ``VERSION`` wasn't increased:
+
+    >>> SomeBear.VERSION = '2.0'
+    >>> b'fingerprint' in cache[SomeBear]
+    False
+    >>> cache.close()
+
+    The database is opened in write-ahead-logging mode, so multiple coala
+    processes can read from the same cache concurrently. Lookups don't write
+    to the database: the times results were used at are kept in memory and
+    written in a single transaction on ``evict`` and ``close``.
+    """
+
+    def __init__(self, path=None, max_size=None):
+        """
+        :param path:
+            The path of the database file. If ``None``, a database in the
+            coala user data directory is used.
+        :param max_size:
+            The maximum number of bytes the stored results may occupy. If
+            exceeded, the least recently used results are evicted. If ``None``,
+            the cache is unbounded.
+        """
+        if path is None:
+            path = get_data_path(None, 'core_result_cache') + '.db'
+
+        self.path = path
+        self.max_size = max_size
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+        self._tables = {}
+        self._unchecked_size = 0
+        # The times results were last used at, mapped by their
+        # ``(bear, version, fingerprint)`` keys, not yet written.
+        self._used = {}
+
+        with self.connection as connection:
+            connection.execute('CREATE TABLE IF NOT EXISTS results ('
+                               'bear TEXT NOT NULL, '
+                               'version TEXT NOT NULL, '
+                               'fingerprint BLOB NOT NULL, '
+                               'results BLOB NOT NULL, '
+                               'size INTEGER NOT NULL, '
+                               'used REAL NOT NULL, '
+                               'PRIMARY KEY (bear, version, fingerprint))')
+            connection.execute('CREATE INDEX IF NOT EXISTS results_used '
+                               'ON results (used)')
+
+    @property
+    def connection(self):
+        """
+        The database connection of the current thread. SQLite connections can't
+        be shared between threads, so each thread opens its own one.
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30,
+                                         check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def record_use(self, key, fingerprints):
+        """
+        Records that results were used now, see ``flush_used``.
+
+        :param key:
+            The ``(name, version)`` key of the bear the results belong to.
+        :param fingerprints:
+            The fingerprints of the results.
+        """
+        used = time.time()
+        with self._lock:
+            for fingerprint in fingerprints:
+                self._used[key + (fingerprint,)] = used
+
+    def flush_used(self):
+        """
+        Writes the recorded times results were used at in a single
+        transaction.
+        """
+        with self._lock:
+            used, self._used = self._used, {}
+
+        if used:
+            with self.connection as connection:
+                connection.executemany(
+                    'UPDATE results SET used = MAX(used, ?) '
+                    'WHERE bear = ? AND version = ? AND fingerprint = ?',
+                    ((used_at,) + key for key, used_at in used.items()))
+
+    def close(self):
+        """
+        Writes the recorded usage times, evicts results exceeding ``max_size``
+        and closes all connections.
+        """
+        self.flush_used()
+        self.evict()
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    def __getitem__(self, bear_type):
+        """
+        Returns the table of the given bear type. Tables are created on demand.
+        """
+        if bear_type not in self._tables:
+            self._tables[bear_type] = SQLiteCacheTable(self, bear_type)
+        return self._tables[bear_type]
+
+    def __setitem__(self, bear_type, table):
+        """
+        Replaces all results of the given bear type with the given mapping of
+        fingerprints to results.
+        """
+        own_table = self[bear_type]
+        if table is not own_table:
+            own_table.clear()
+            own_table.update(table)
+
+    def __delitem__(self, bear_type):
+        self[bear_type].clear()
+        del self._tables[bear_type]
+
+    def __iter__(self):
+        return iter(self._tables)
+
+    def __len__(self):
+        return len(self._tables)
+
+    def track_size(self, size):
+        """
+        Registers newly stored results and evicts old ones if the cache may
+        have grown beyond ``max_size``.
+
+        To avoid summing up the size of all results on every store, the check
+        is only performed after a tenth of ``max_size`` was stored.
+
+        :param size:
+            The number of bytes stored.
+        """
+        if self.max_size is None:
+            return
+
+        with self._lock:
+            self._unchecked_size += size
+            check = self._unchecked_size * 10 >= self.max_size
+            if check:
+                self._unchecked_size = 0
+
+        if check:
+            self.evict()
+
+    def evict(self):
+        """
+        Removes the least recently used results until the cache fits into
+        ``max_size``.
+        """
+        if self.max_size is None:
+            return
+
+        self.flush_used()
+        with self.connection as connection:
+            total_size, = connection.execute(
+                'SELECT COALESCE(SUM(size), 0) FROM results').fetchone()
+            excess = total_size - self.max_size
+            if excess <= 0:
+                return
+
+            evicted = []
+            for rowid, size in connection.execute(
+                    'SELECT rowid, size FROM results ORDER BY used'):
+                evicted.append((rowid,))
+                excess -= size
+                if excess <= 0:
+                    break
+
+            connection.executemany('DELETE FROM results WHERE rowid = ?',
+                                   evicted)
+
+        logging.debug('Evicted {} results from {!r}.'.format(len(evicted),
+                                                           self.path))
+
+
+class SQLiteCacheTable(MutableMapping):
+    """
+    The results of a single bear type inside a ``SQLiteCache``, mapping task
+    fingerprints to results.
+    """
+
+    def __init__(self, cache, bear_type):
+        """
+        :param cache:
+            The ``SQLiteCache`` this table belongs to.
+        :param bear_type:
+            The bear type whose results are stored.
+        """
+        self.cache = cache
+        self.bear_type = bear_type
+
+    @property
+    def key(self):
+        """
+        The ``(name, version)`` tuple the results are stored under.
+        """
+        return get_bear_key(self.bear_type)
+
+    def __getitem__(self, fingerprint):
+        key = self.key
+        row = self.cache.connection.execute(
+            'SELECT results FROM results '
+            'WHERE bear = ? AND version = ? AND fingerprint = ?',
+            key + (fingerprint,)).fetchone()
+        if row is None:
+            raise KeyError(fingerprint)
+
+        self.cache.record_use(key, (fingerprint,))
+        return pickle.loads(row[0])
+
+    def get_many(self, fingerprints):
+        """
+        Looks up the results of many fingerprints with a few queries.
+
+        :param fingerprints:
+            An iterable of fingerprints.
+        :return:
+            A dictionary mapping the fingerprints found to their results.
+        """
+        fingerprints = list(fingerprints)
+        found = {}
+        key = self.key
+        connection = self.cache.connection
+
+        # SQLite allows at most 999 parameters per query.
+        for start in range(0, len(fingerprints), 900):
+            chunk = tuple(fingerprints[start:start + 900])
+            rows = connection.execute(
+                'SELECT fingerprint, results FROM results '
+                'WHERE bear = ? AND version = ? AND fingerprint IN ({})'
+                .format(', '.join('?' * len(chunk))),
+                key + chunk).fetchall()
+
+            found.update((fingerprint, pickle.loads(results))
+                         for fingerprint, results in rows)
+
+        self.cache.record_use(key, found)
+        return found
+
+    def __contains__(self, fingerprint):
+        return self.cache.connection.execute(
+            'SELECT 1 FROM results '
+            'WHERE bear = ? AND version = ? AND fingerprint = ?',
+            self.key + (fingerprint,)).fetchone() is not None
+
+    def __setitem__(self, fingerprint, results):
+        data = pickle.dumps(results, protocol=4)
+
+        with self.cache.connection as connection:
+            connection.execute(
+                'INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)',
+                self.key + (fingerprint, data, len(data), time.time()))
+
+        self.cache.track_size(len(data))
+
+    def __delitem__(self, fingerprint):
+        with self.cache.connection as connection:
+            cursor = connection.execute(
+                'DELETE FROM results '
+                'WHERE bear = ? AND version = ? AND fingerprint = ?',
+                self.key + (fingerprint,))
+
+        if cursor.rowcount == 0:
+            raise KeyError(fingerprint)
+
+    def __iter__(self):
+        return (fingerprint for fingerprint, in
+                self.cache.connection.execute(
+                    'SELECT fingerprint FROM results '
+                    'WHERE bear = ? AND version = ?',
+                    self.key).fetchall())
+
+    def __len__(self):
+        count, = self.cache.connection.execute(
+            'SELECT COUNT(*) FROM results WHERE bear = ? AND version = ?',
+            self.key).fetchone()
+        return count
+
+    def clear(self):
+        with self.cache.connection as connection:
+            connection.execute(
+                'DELETE FROM results WHERE bear = ? AND version = ?',
+                self.key)
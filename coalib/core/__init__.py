@@ -17,5 +17,9 @@ graphs and raises ``CircularDependencyError`` if found.
 
 ``PersistentHash`` module generates a unique hash for every task object
 first by pickling them and then using the pickled object to generate a sha1
-hash. It can then be used for caching results.
+hash. It can then be used for caching results. ``ResultCache`` provides a
+persistent cache for those results backed by an SQLite database.
+
+``BearRegistry`` stores bears for worker processes, so tasks only need to
+transfer a small handle of their bear instead of the bear itself.
 """
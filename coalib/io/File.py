@@ -149,3 +149,16 @@ class File:
         DEPRECATED.
         """
         return self.lines[item]
+
+    def __getstate__(self):
+        """
+        Only the filename and timestamp are pickled, so sending a ``File`` to
+        another process doesn't copy its contents. They are read again from
+        disk when they are accessed.
+
+        :return:
+            The state of the object without the cached file contents.
+        """
+        return {'_filename': self._filename,
+                '_timestamp': self._timestamp,
+                '_newline': self._newline}
@@ -1,16 +1,29 @@
+from collections import namedtuple
 import logging
 import time
 import os
 
 from coala_utils.decorators import enforce_signature
 from coalib.misc.CachingUtilities import (
-    pickle_load, pickle_dump, delete_files)
+    pickle_load, pickle_dump, delete_files, file_digest)
 from coalib.misc.Exceptions import log_exception
-from coalib.processes.Processing import get_file_dict
+from coalib.processes.Processing import (
+    get_file_dict, yield_file_ignore_ranges, yield_ignore_ranges)
 from coalib.io.FileProxy import (
     FileDictGenerator, FileProxy, FileProxyMap)
 from coalib.output.printers.LOG_LEVEL import LOG_LEVEL
 
+# A cached snapshot of a file: its size, modification time in nanoseconds, a
+# digest of its contents and the time in nanoseconds it was taken at. Stamps
+# of older caches don't know when they were taken and are never trusted.
+FileStamp = namedtuple('FileStamp', 'size mtime_ns digest time_ns')
+FileStamp.__new__.__defaults__ = (0,)
+
+# Modification times closer than this to the time a file got stamped are
+# considered ambiguous, as a later change within the timestamp granularity of
+# the filesystem (2 seconds for FAT) would not alter the modification time.
+MTIME_GRANULARITY_NS = 2 * 10 ** 9
+
 
 class FileCache:
     """
@@ -66,6 +79,17 @@ class FileCache:
 
     >>> old_data["b.c"] < new_data["b.c"]
     True
+
+    Modification times are reset by many operations that don't change the
+    contents of a file, like checking out a branch or restoring a CI cache.
+    To keep files cached in such cases, the cache can track the contents of
+    files instead:
+
+    >>> cache = FileCache(None, "test", flush_cache=True, track_content=True)
+
+    For each file, its size, modification time and a digest of its contents
+    are recorded. The digest is only recomputed when the size and modification
+    time alone can't tell whether a file has changed.
     """
 
     @enforce_signature
@@ -73,16 +97,20 @@ class FileCache:
             self,
             log_printer,
             project_dir: str,
-            flush_cache: bool = False):
+            flush_cache: bool = False,
+            track_content: bool = False):
         """
         Initialize FileCache.
 
-        :param log_printer: An object to use for logging.
-        :param project_dir: The root directory of the project to be used
-                            as a key identifier.
-        :param flush_cache: Flush the cache and rebuild it.
+        :param log_printer:   An object to use for logging.
+        :param project_dir:   The root directory of the project to be used
+                              as a key identifier.
+        :param flush_cache:   Flush the cache and rebuild it.
+        :param track_content: Detect changed files by their contents instead
+                              of only their modification times.
         """
         self.project_dir = project_dir
+        self.track_content = track_content
         self.current_time = int(time.time())
 
         cache_data = pickle_load(None, project_dir, {})
@@ -94,8 +122,28 @@ class FileCache:
                             'time is behind the last recorded run time on this '
                             'project. The cache will be force flushed.')
             flush_cache = True
+        if (not flush_cache and cache_data and
+                cache_data.get('track_content', False) != track_content):
+            logging.debug('The file cache was built with a different change '
+                          'detection and will be flushed.')
+            flush_cache = True
+
+        # The stamps of the files taken in this run, recorded on ``write``.
+        self.stamps = {}
 
         self.data = cache_data.get('files', {})
+        # The seconds per byte each local bear took in the last run, used to
+        # schedule the longest running bears first.
+        self.bear_times = cache_data.get('bear_times', {})
+        # The total seconds and file sizes of the bears run in this run,
+        # recorded on ``write``.
+        self.new_bear_times = {}
+        # The ignore ranges of each file, together with the ``FileStamp`` of
+        # the file they were scanned from.
+        self.ignore_ranges = cache_data.get('ignore_ranges', {})
+        # The files ignore ranges were requested for in this run. Only their
+        # ranges are kept on ``write``.
+        self.ignore_range_files = set()
         if flush_cache:
             self.flush_cache()
 
@@ -110,6 +158,8 @@ class FileCache:
         Flushes the cache and deletes the relevant file.
         """
         self.data = {}
+        self.bear_times = {}
+        self.ignore_ranges = {}
         delete_files(None, [self.project_dir])
         logging.debug('The file cache was successfully flushed.')
 
@@ -126,11 +176,27 @@ class FileCache:
             if file in self.data:
                 del self.data[file]
         for file_name in self.data:
-            self.data[file_name] = self.current_time
+            if self.track_content:
+                stamp = self.stamps.get(file_name)
+                if stamp is None:
+                    stamp = self.get_stamp(file_name)
+                self.data[file_name] = -1 if stamp is None else stamp
+            else:
+                self.data[file_name] = self.current_time
+        for bear_name, (seconds, size) in self.new_bear_times.items():
+            self.bear_times[bear_name] = seconds / max(size, 1)
+        self.ignore_ranges = {
+            filename: value
+            for filename, value in self.ignore_ranges.items()
+            if filename in self.ignore_range_files}
         pickle_dump(
             None,
             self.project_dir,
-            {'time': self.current_time, 'files': self.data})
+            {'time': self.current_time,
+             'track_content': self.track_content,
+             'files': self.data,
+             'bear_times': self.bear_times,
+             'ignore_ranges': self.ignore_ranges})
 
     def __exit__(self, type, value, traceback):
         """
@@ -139,6 +205,52 @@ class FileCache:
         """
         self.write()
 
+    def add_bear_times(self, bear_times):
+        """
+        Records the time bears took to run in this run.
+
+        :param bear_times: A dict mapping bear names to tuples of the seconds
+                           the bear ran and the size of the files it ran on.
+        """
+        for bear_name, (seconds, size) in bear_times.items():
+            total_seconds, total_size = self.new_bear_times.get(bear_name,
+                                                                (0, 0))
+            self.new_bear_times[bear_name] = (total_seconds + seconds,
+                                              total_size + size)
+
+    def get_ignore_ranges(self, file_dict):
+        """
+        Yields the ignore ranges of the given files like
+        ``coalib.processes.Processing.yield_ignore_ranges``. The ranges are
+        cached by the contents of each file, so unchanged files are neither
+        read nor scanned again.
+
+        :param file_dict: The file dictionary.
+        """
+        for filename in file_dict:
+            self.ignore_range_files.add(filename)
+            old_stamp, ranges = self.ignore_ranges.get(filename, (None, []))
+            stamp = self.stamps.get(filename)
+            if stamp is None:
+                stamp = self.get_stamp(filename, old_stamp)
+
+            if (stamp is None or old_stamp is None or
+                    stamp.size != old_stamp.size or
+                    stamp.digest != old_stamp.digest):
+                try:
+                    file = file_dict[filename]
+                except KeyError:
+                    self.ignore_ranges.pop(filename, None)
+                    continue
+
+                ranges = list(yield_file_ignore_ranges(filename, file))
+                if stamp is None:
+                    self.ignore_ranges.pop(filename, None)
+                else:
+                    self.ignore_ranges[filename] = stamp, ranges
+
+            yield from ranges
+
     def untrack_files(self, files):
         """
         Removes the given files from the cache so that they are no longer
@@ -169,7 +281,9 @@ class FileCache:
         :param files: The list of collected files.
         :return:      A set of files that are uncached.
         """
-        if self.data == {}:
+        if self.track_content:
+            return {file for file in files if self._content_changed(file)}
+        elif self.data == {}:
             # The first run on this project. So all files are new
             # and must be returned irrespective of whether caching is turned on.
             return files
@@ -179,6 +293,63 @@ class FileCache:
                     if (file not in self.data or
                         int(os.path.getmtime(file)) > self.data[file])}
 
+    def get_stamp(self, file, old_stamp=None):
+        """
+        Takes a ``FileStamp`` of the given file.
+
+        :param file:      The file to stamp.
+        :param old_stamp: A previous ``FileStamp`` of the file. Its digest is
+                          reused if size and modification time are unchanged
+                          and the modification time is unambiguous.
+        :return:          The ``FileStamp`` of the file or ``None`` if the file
+                          can't be read.
+        """
+        # Taken before the file is examined, so changes made while stamping
+        # count as made after the stamp.
+        time_ns = int(time.time() * 10 ** 9)
+        try:
+            stat = os.stat(file)
+            if (old_stamp is not None and
+                    old_stamp.size == stat.st_size and
+                    old_stamp.mtime_ns == stat.st_mtime_ns and
+                    not self._is_ambiguous(old_stamp)):
+                digest = old_stamp.digest
+            else:
+                digest = file_digest(file)
+        except OSError:
+            return None
+
+        return FileStamp(stat.st_size, stat.st_mtime_ns, digest, time_ns)
+
+    @staticmethod
+    def _is_ambiguous(stamp):
+        """
+        Checks whether the file could have been changed after it was stamped
+        without changing its modification time.
+        """
+        return stamp.mtime_ns + MTIME_GRANULARITY_NS >= stamp.time_ns
+
+    def _content_changed(self, file):
+        """
+        Stamps the given file and compares it to the stamp of the last run.
+
+        :param file: The file to check.
+        :return:     True if the file is new, changed or can't be read.
+        """
+        old_stamp = self.data.get(file)
+        if not isinstance(old_stamp, FileStamp):
+            old_stamp = None
+
+        stamp = self.get_stamp(file, old_stamp)
+        if stamp is None:
+            self.stamps.pop(file, None)
+            return True
+
+        self.stamps[file] = stamp
+        return (old_stamp is None or
+                old_stamp.size != stamp.size or
+                old_stamp.digest != stamp.digest)
+
 
 class FileDictFileCache(FileCache, FileDictGenerator):
     """
@@ -266,6 +437,15 @@ class ProxyMapFileCache(FileCache, FileDictGenerator):
         """
         self.__proxymap = fileproxy_map
 
+    def get_ignore_ranges(self, file_dict):
+        """
+        Yields the ignore ranges of the given files. The files of a proxy map
+        may differ from the files on disk, so their ranges are not cached.
+
+        :param file_dict: The file dictionary.
+        """
+        return yield_ignore_ranges(file_dict)
+
     def get_file_dict(self, filename_list, allow_raw_files=False):
         """
         Builds a file dictionary from filename to lines of the file
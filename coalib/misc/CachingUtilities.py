@@ -122,6 +122,36 @@ def pickle_dump(log_printer, identifier, data):
     return True
 
 
+try:
+    from hashlib import blake2b
+
+    def _new_digest_generator():
+        return blake2b(digest_size=16)
+except ImportError:  # pragma Python 3.6: no cover
+    # BLAKE2 is available since Python 3.6.
+    _new_digest_generator = hashlib.sha1
+
+
+def file_digest(filename, chunk_size=1 << 20):
+    """
+    Computes a fast digest of the contents of the given file.
+
+    The file is read in chunks, so arbitrarily large files can be digested
+    without loading them into memory at once.
+
+    :param filename:   The path of the file to digest.
+    :param chunk_size: The number of bytes to read at once.
+    :return:           A 16 bytes long digest of the file contents, computed
+                       with BLAKE2b, or with SHA-1 before Python 3.6.
+    :raises OSError:   Raised if the file can't be read.
+    """
+    generator = _new_digest_generator()
+    with open(filename, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            generator.update(chunk)
+    return generator.digest()[:16]
+
+
 def hash_id(text):
     """
     Hashes the given text.
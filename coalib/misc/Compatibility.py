@@ -1,4 +1,6 @@
 import json
+import os
+
 try:
     # JSONDecodeError class is available since Python 3.5.x.
     JSONDecodeError = json.decoder.JSONDecodeError
@@ -10,7 +12,27 @@ try:
 except ImportError:  # pragma: no cover
     from coalib.misc.Asyncio import run_coroutine_threadsafe
 
+try:
+    # scandir is available since Python 3.5.
+    from os import scandir
+except ImportError:  # pragma Python 3.5,3.6: no cover
+    class _DirEntry:
+
+        def __init__(self, directory, name):
+            self.name = name
+            self.path = os.path.join(directory, name)
+
+        def is_dir(self):
+            return os.path.isdir(self.path)
+
+        def is_file(self):
+            return os.path.isfile(self.path)
+
+    def scandir(path='.'):
+        return iter([_DirEntry(path, name) for name in os.listdir(path)])
+
 __all__ = [
     'JSONDecodeError',
     'run_coroutine_threadsafe',
+    'scandir',
 ]
@@ -1,4 +1,6 @@
+import asyncio
 from contextlib import contextmanager
+import locale
 import platform
 import shlex
 from subprocess import PIPE, Popen
@@ -146,3 +148,59 @@ def run_shell_command(command, stdin=None, **kwargs):
     with run_interactive_shell_command(command, **kwargs) as p:
         ret = p.communicate(stdin)
     return ShellCommandResult(p.returncode, *ret)
+
+
+def _decode_output(data):
+    """
+    Decodes process output like ``subprocess.Popen`` does in
+    ``universal_newlines`` mode.
+    """
+    text = data.decode(locale.getpreferredencoding(False))
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+@asyncio.coroutine
+def run_shell_command_async(command, stdin=None, loop=None, **kwargs):
+    """
+    Runs a single command asynchronously using
+    ``asyncio.create_subprocess_exec()``, so the event loop can do other work
+    while the process is running.
+
+    >>> loop = asyncio.new_event_loop()
+    >>> asyncio.get_child_watcher().attach_loop(loop)
+    >>> result = loop.run_until_complete(
+    ...     run_shell_command_async(['echo', 'TEXT'], loop=loop))
+    >>> result
+    ('TEXT\\n', '')
+    >>> result.code
+    0
+    >>> loop.close()
+
+    On Unix, the child watcher of asyncio has to be attached to the given loop
+    beforehand. See also ``run_shell_command()``.
+
+    :param command: The command to run on shell. This parameter can either
+                    be a sequence of arguments that are directly passed to
+                    the process or a string. A string gets splitted beforehand
+                    using ``shlex.split()``.
+    :param stdin:   Initial input to send to the process.
+    :param loop:    The event loop to run the process in. If ``None``, the
+                    current event loop is used.
+    :param kwargs:  Additional keyword arguments to pass to
+                    ``asyncio.create_subprocess_exec`` that is used to spawn
+                    the process.
+    :return:        A ``ShellCommandResult`` with ``(stdoutstring,
+                    stderrstring)``.
+    """
+    if isinstance(command, str):
+        command = shlex.split(command)
+
+    process = yield from asyncio.create_subprocess_exec(
+        *command, stdin=PIPE, stdout=PIPE, stderr=PIPE, loop=loop, **kwargs)
+    stdout, stderr = yield from process.communicate(
+        None if stdin is None else
+        stdin.encode(locale.getpreferredencoding(False)))
+
+    return ShellCommandResult(process.returncode,
+                              _decode_output(stdout),
+                              _decode_output(stderr))
@@ -1,4 +1,5 @@
 import copy
+import json
 import logging
 import platform
 import os
@@ -402,6 +403,32 @@ def print_results_formatted(log_printer,
                 exception)
 
 
+def print_results_json_lines(stream,
+                             json_encoder,
+                             log_printer,
+                             section,
+                             result_list,
+                             *args):
+    """
+    Writes each result as a JSON object on its own line, together with the
+    name of its section. The stream is flushed for every batch of results, so
+    they can be consumed while coala is still running.
+
+    :param stream:       The stream to write the results to.
+    :param json_encoder: The JSON encoder class to serialize the results with,
+                         see ``coalib.output.JSONEncoder``.
+    :param log_printer:  Printer responsible for logging the messages.
+    :param section:      The section to which the results belong.
+    :param result_list:  List of Result objects containing the corresponding
+                         results.
+    """
+    for result in result_list:
+        stream.write(json.dumps({'section': section.name, 'result': result},
+                                cls=json_encoder,
+                                sort_keys=True) + '\n')
+    stream.flush()
+
+
 def print_bears_formatted(bears, format=None):
     format_str = format or ('name:{name}:can_detect:{can_detect}:'
                             'can_fix:{can_fix}:description:{description}')
@@ -78,12 +78,15 @@ def configure_logging(color=True):
     })
 
 
-def configure_json_logging():
+def configure_json_logging(stream=None):
     """
     Configures logging for JSON.
-    :return: Returns a ``StringIO`` that captures the logs as JSON.
+    :param stream: The stream to write the logs to, one JSON object per line.
+                   A new ``StringIO`` is used if not given.
+    :return: Returns the stream that captures the logs as JSON.
     """
-    stream = io.StringIO()
+    if stream is None:
+        stream = io.StringIO()
 
     # reset counter handler
     CounterHandler.reset()
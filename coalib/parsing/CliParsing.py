@@ -126,9 +126,11 @@ def check_conflicts(sections):
 
         if (
                 not section.get('json', False) and
+                not section.get('json_lines', False) and
                 (str(section.get('output', '')) or
                  section.get('relpath', False))):
             ArgumentParser().error(
-                "'output' or 'relpath' cannot be used without `--json`.")
+                "'output' or 'relpath' cannot be used without `--json` or "
+                '`--json-lines`.')
 
     return True
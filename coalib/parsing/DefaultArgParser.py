@@ -116,6 +116,11 @@ To run coala without user interaction, run the `coala --non-interactive`,
         '--json', const=True, action='store_const',
         help='mode in which coala will display output as json')
 
+    mode_group.add_argument(
+        '--json-lines', const=True, action='store_const',
+        help='mode in which coala will write each result as a line of json '
+             'as soon as it is available')
+
     mode_group.add_argument(
         '--format', const=True, nargs='?', metavar='STR',
         help='output results with a custom format string, e.g. '
@@ -151,6 +156,10 @@ To run coala without user interaction, run the `coala --non-interactive`,
     config_group.add_argument(
         '--flush-cache', const=True, action='store_const',
         help='rebuild the file cache')
+    config_group.add_argument(
+        '--content-cache', const=True, action='store_const',
+        help='detect changed files by their contents instead of their '
+             'modification times')
     config_group.add_argument(
         '--no-autoapply-warn', const=True, action='store_const',
         help='turn off warning about patches not being auto applicable')
@@ -233,15 +242,17 @@ To run coala without user interaction, run the `coala --non-interactive`,
     outputs_group.add_argument(
         '--log-json', const=True, action='store_const',
         help='output logs as json along with results'
-             ' (must be called with --json)')
+             ' (must be called with --json or --json-lines)')
 
     outputs_group.add_argument(
         '-o', '--output', type=PathArg, nargs=1, metavar='FILE',
-        help='write results to the given file (must be called with --json)')
+        help='write results to the given file (must be called with --json '
+             'or --json-lines)')
 
     outputs_group.add_argument(
         '-r', '--relpath', nargs='?', const=True,
-        help='return relative paths for files (must be called with --json)')
+        help='return relative paths for files (must be called with --json '
+             'or --json-lines)')
 
     devtool_exclusive_group = arg_parser.add_mutually_exclusive_group()
 
@@ -4,6 +4,7 @@ import re
 from functools import lru_cache
 
 from coala_utils.decorators import yield_once
+from coalib.misc.Compatibility import scandir
 from coalib.misc.Constants import GLOBBING_SPECIAL_CHARS
 
 
@@ -223,18 +224,156 @@ def fnmatch(name, globs):
     if len(globs) == 0:
         return True
 
-    name = os.path.normcase(name)
-
-    return any(compiled_pattern.match(name)
-               for glob in globs
-               for compiled_pattern in _compile_pattern(glob))
+    return _get_glob_set(globs).match(name)
 
 
 @lru_cache()
-def _compile_pattern(pattern):
-    return tuple(re.compile(translate(os.path.normcase(
-                     os.path.expanduser(pat))))
-                 for pat in _iter_alternatives(pattern))
+def _get_glob_set(globs):
+    return GlobSet(globs)
+
+
+def _literal_extension(pattern):
+    """
+    Returns the extension every name matched by the pattern ends with.
+
+    :param pattern: Glob pattern without alternatives
+    :return:        The extension including the dot, or ``None`` if the names
+                    matched by the pattern can have different extensions.
+    """
+    suffix = re.split('[' + re.escape(os.sep + '*?[]') + ']', pattern)[-1]
+    index = suffix.rfind('.')
+    return None if index == -1 else suffix[index:]
+
+
+def _get_extension(name):
+    """
+    Returns the extension of a normcased path, including the dot.
+    """
+    index = name.rfind('.')
+    return None if index <= name.rfind(os.sep) else name[index:]
+
+
+class GlobSet:
+    """
+    Matches names against many globs at once.
+
+    All globs (with their alternatives expanded) are compiled into combined
+    regular expressions, one for each extension the globs end with and one
+    for the globs ending with a wildcard. So a name is only matched against
+    the globs that can match its extension, and each of them in a single pass:
+
+    >>> globs = GlobSet(['**.py', 'src/*.(c|h)', 'Makefile'])
+    >>> globs.match('src/main.c')
+    True
+    >>> globs.match('src/main.cpp')
+    False
+
+    It also tells which globs matched a name:
+
+    >>> globs.matching_glob('src/main.h')
+    'src/*.(c|h)'
+    >>> list(GlobSet(['*.py', 'setup.*']).iter_matching_globs('setup.py'))
+    ['*.py', 'setup.*']
+
+    Syntax and path handling are equal to those of ``fnmatch``, except that an
+    empty ``GlobSet`` matches nothing.
+    """
+
+    # Python 3.4 supports at most 100 groups in a regular expression.
+    CHUNK_SIZE = 99
+
+    def __init__(self, globs):
+        """
+        :param globs: Glob string with wildcards or list of globs
+        """
+        self.globs = (globs,) if isinstance(globs, str) else tuple(globs)
+
+        buckets = {}
+        for index, glob in enumerate(self.globs):
+            for pattern in _iter_alternatives(glob):
+                pattern = os.path.normcase(os.path.expanduser(pattern))
+                # Strip the flags, they are set once for the combined regex.
+                regex = translate(pattern)[len('(?ms)'):]
+                buckets.setdefault(_literal_extension(pattern), []).append(
+                    (index, regex))
+
+        self._buckets = {}
+        for extension, entries in buckets.items():
+            self._buckets[extension] = [
+                self._compile_chunk(entries[start:start + self.CHUNK_SIZE])
+                for start in range(0, len(entries), self.CHUNK_SIZE)]
+
+    @staticmethod
+    def _compile_chunk(entries):
+        """
+        Compiles a regex matching any of the given patterns and a regex
+        capturing which of them match.
+
+        :param entries: List of tuples ``(glob_index, regex)``
+        :return:        A tuple ``(any_regex, all_regex, glob_indexes)``
+        """
+        indexes, regexes = zip(*entries)
+        any_regex = re.compile(
+            '(?ms)(?:' + '|'.join('(?:' + regex + ')' for regex in regexes) +
+            ')')
+        all_regex = re.compile(
+            '(?ms)' + ''.join('(?:(?=(' + regex + '))|)' for regex in regexes))
+        return any_regex, all_regex, indexes
+
+    def _get_chunks(self, name):
+        extension = _get_extension(name)
+        if extension is not None:
+            yield from self._buckets.get(extension, ())
+        yield from self._buckets.get(None, ())
+
+    def match(self, name):
+        """
+        Tests whether the name matches one of the globs.
+
+        :param name: File or directory name
+        :return:     Whether or not the name is matched by a glob
+        """
+        name = os.path.normcase(name)
+        return any(any_regex.match(name)
+                   for any_regex, _, _ in self._get_chunks(name))
+
+    def iter_matching_indexes(self, name):
+        """
+        Iterates the indexes of all globs matching the name.
+
+        :param name: File or directory name
+        :return:     Iterator that yields the indexes of the matching globs in
+                     ascending order, each once
+        """
+        name = os.path.normcase(name)
+        indexes = set()
+        for any_regex, all_regex, glob_indexes in self._get_chunks(name):
+            if any_regex.match(name):
+                groups = all_regex.match(name).groups()
+                indexes.update(index
+                               for index, group in zip(glob_indexes, groups)
+                               if group is not None)
+        return iter(sorted(indexes))
+
+    def iter_matching_globs(self, name):
+        """
+        Iterates all globs matching the name.
+
+        :param name: File or directory name
+        :return:     Iterator that yields the matching globs in the order they
+                     were given
+        """
+        return (self.globs[index]
+                for index in self.iter_matching_indexes(name))
+
+    def matching_glob(self, name):
+        """
+        Returns the first glob matching the name.
+
+        :param name: File or directory name
+        :return:     The glob or ``None`` if no glob matches
+        """
+        return next(self.iter_matching_globs(name), None)
 
 
 def _absolute_flat_glob(pattern):
@@ -408,3 +547,158 @@ def glob(pattern):
     :return:        List of all file names that match pattern
     """
     return list(iglob(pattern))
+
+
+@yield_once
+def _iter_globstar_variants(pattern):
+    """
+    Iterates the variants of a glob pattern in which each ``**`` followed by a
+    separator is either kept or removed, as ``iglob`` also lets ``**/`` match
+    no directory at all.
+
+    :param pattern: Glob pattern without alternatives
+    :return:        Iterator that yields all variants of the pattern.
+    """
+    index = pattern.find('**' + os.sep)
+    if index == -1:
+        yield pattern
+        return
+
+    head, tail = pattern[:index], pattern[index + len('**' + os.sep):]
+    for variant in _iter_globstar_variants(tail):
+        yield head + '**' + os.sep + variant
+        yield head + variant
+
+
+def _split_static_base(pattern):
+    """
+    Splits a glob pattern into the directory without wildcards it starts with
+    and the remaining pattern.
+
+    :param pattern: Glob pattern without alternatives
+    :return:        A tuple ``(base, remainder)``.
+    """
+    parts = pattern.split(os.sep)
+    index = 0
+    while index < len(parts) and not has_wildcard(parts[index]):
+        index += 1
+
+    if index == len(parts):
+        return pattern, ''
+
+    base = os.sep.join(parts[:index])
+    # Keep the separator of root directories like '/' or 'C:\'.
+    if index == 1 and (not base or base.endswith(':')):
+        base += os.sep
+    return base, os.sep.join(parts[index:])
+
+
+def _is_walked_below(base, other_base):
+    """
+    Checks whether walking ``other_base`` reaches the directory ``base``
+    under that very path, so the files below ``base`` are found by that walk.
+
+    :param base:       The directory to check
+    :param other_base: The directory walked from
+    :return:           True if ``base`` is a subdirectory of ``other_base``
+                       and written relative to it without ``.`` or ``..``
+    """
+    prefix = os.path.join(other_base, '')
+    return (base.startswith(prefix) and
+            os.path.isabs(base) == os.path.isabs(other_base) and
+            os.path.normpath(os.path.abspath(base)) ==
+            os.path.join(os.path.normpath(os.path.abspath(other_base)),
+                         base[len(prefix):]))
+
+
+@yield_once
+def iglob_files(patterns, ignored_patterns=None):
+    """
+    Iterates all files matched by the given glob patterns. Unlike ``iglob``,
+    the filesystem is walked only once for all patterns and directories
+    matched by one of the ignored patterns are not descended into.
+
+    A directory is ignored if an ignored pattern matches its path with or
+    without a trailing separator, so ``dir``, ``dir/`` and ``dir/**`` all
+    ignore the directory ``dir`` with all its contents.
+
+    :param patterns:         Glob pattern or list of such to collect files for
+    :param ignored_patterns: List of glob patterns matching files and
+                             directories to ignore
+    :return:                 Iterator that yields tuples of the path of a
+                             matching file and the pattern matching it
+    """
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    ignored_patterns = tuple(ignored_patterns or ())
+
+    def is_ignored_dir(path):
+        return ignored_patterns and (
+            fnmatch(path, ignored_patterns) or
+            fnmatch(path.rstrip(os.sep) + os.sep, ignored_patterns))
+
+    def is_ignored_file(path):
+        return ignored_patterns and fnmatch(path, ignored_patterns)
+
+    def has_ignored_parent(path):
+        parent = os.path.dirname(path)
+        while parent and parent != path:
+            if is_ignored_dir(parent):
+                return True
+            path, parent = parent, os.path.dirname(parent)
+        return False
+
+    variants = []
+    variant_patterns = []
+    walk_depths = {}
+    for pattern in patterns:
+        for pat in _iter_alternatives(pattern):
+            pat = os.path.normcase(os.path.expanduser(pat))
+            for variant in _iter_globstar_variants(pat):
+                base, remainder = _split_static_base(variant)
+                if not remainder:
+                    if (os.path.isfile(variant) and
+                            not is_ignored_file(variant) and
+                            not has_ignored_parent(variant)):
+                        yield variant, pattern
+                    continue
+
+                variants.append(variant)
+                variant_patterns.append(pattern)
+                depth = (None if '**' in remainder else
+                         remainder.count(os.sep))
+                if base in walk_depths:
+                    old_depth = walk_depths[base]
+                    depth = (None if None in (old_depth, depth) else
+                             max(old_depth, depth))
+                walk_depths[base] = depth
+
+    glob_set = GlobSet(variants)
+
+    def walk(directory, depth):
+        try:
+            entries = list(scandir(directory or os.curdir))
+        except OSError:
+            return
+
+        for entry in entries:
+            path = os.path.join(directory, entry.name)
+            if entry.is_dir():
+                if depth != 0 and not is_ignored_dir(path):
+                    yield from walk(path, None if depth is None else depth - 1)
+            elif entry.is_file() and not is_ignored_file(path):
+                for index in glob_set.iter_matching_indexes(path):
+                    yield path, variant_patterns[index]
+
+    for base, depth in sorted(walk_depths.items()):
+        # Directories below another walked one with unlimited depth are
+        # already covered by it.
+        if any(other_depth is None and _is_walked_below(base, other_base)
+               for other_base, other_depth in walk_depths.items()
+               if other_base != base):
+            continue
+
+        if base and (is_ignored_dir(base) or has_ignored_parent(base)):
+            continue
+
+        yield from walk(base, depth)
@@ -1,4 +1,5 @@
-import queue
+import os
+import time
 import traceback
 
 from coalib.bears.BEAR_KIND import BEAR_KIND
@@ -256,30 +257,30 @@ def run_local_bears_on_file(message_queue,
                             timeout,
                             file_dict,
                             local_bear_list,
-                            local_result_dict,
                             control_queue,
                             filename,
-                            debug=False):
+                            debug=False,
+                            bear_times=None):
     """
     This method runs a list of local bears on one file.
 
-    :param message_queue:     A queue that contains messages of type
-                              errors/warnings/debug statements to be printed
-                              in the Log.
-    :param timeout:           The queue blocks at most timeout seconds for a
-                              free slot to execute the put operation on. After
-                              the timeout it returns queue Full exception.
-    :param file_dict:         Dictionary that contains contents of files.
-    :param local_bear_list:   List of local bears to run on file.
-    :param local_result_dict: A Manager.dict that will be used to store local
-                              bear results. A list of all local bear results
-                              will be stored with the filename as key.
-    :param control_queue:     If any result gets written to the result_dict a
-                              tuple containing a CONTROL_ELEMENT (to indicate
-                              what kind of event happened) and either a bear
-                              name(for global results) or a file name to
-                              indicate the result will be put to the queue.
-    :param filename:          The name of file on which to run the bears.
+    :param message_queue:   A queue that contains messages of type
+                            errors/warnings/debug statements to be printed
+                            in the Log.
+    :param timeout:         The queue blocks at most timeout seconds for a
+                            free slot to execute the put operation on. After
+                            the timeout it returns queue Full exception.
+    :param file_dict:       Dictionary that contains contents of files.
+    :param local_bear_list: List of local bears to run on file.
+    :param control_queue:   A tuple containing ``CONTROL_ELEMENT.LOCAL`` and a
+                            tuple of the file name and the list of all local
+                            bear results for that file will be put to the
+                            queue.
+    :param filename:        The name of file on which to run the bears.
+    :param bear_times:      A dict the run time of each bear is added to. It
+                            maps bear names to tuples of the total seconds
+                            the bear ran and the total size of the files it
+                            ran on.
     """
     if filename not in file_dict:
         send_msg(message_queue,
@@ -295,8 +296,16 @@ def run_local_bears_on_file(message_queue,
 
         return
 
+    try:
+        file_dict[filename]
+    except KeyError:
+        # The file can't be read, it's reported by the process which created
+        # the file dictionary.
+        return
+
     local_result_list = []
     for bear_instance in local_bear_list:
+        start_time = time.perf_counter()
         result = run_local_bear(message_queue,
                                 timeout,
                                 local_result_list,
@@ -304,11 +313,15 @@ def run_local_bears_on_file(message_queue,
                                 bear_instance,
                                 filename,
                                 debug=debug)
+        if bear_times is not None:
+            add_bear_time(bear_times,
+                          bear_instance.__class__.__name__,
+                          time.perf_counter() - start_time,
+                          filename)
         if result is not None:
             local_result_list.extend(result)
 
-    local_result_dict[filename] = local_result_list
-    control_queue.put((CONTROL_ELEMENT.LOCAL, filename))
+    control_queue.put((CONTROL_ELEMENT.LOCAL, (filename, local_result_list)))
 
 
 def get_global_dependency_results(global_result_dict, bear_instance):
@@ -316,8 +329,8 @@ def get_global_dependency_results(global_result_dict, bear_instance):
     This method gets all the results originating from the dependencies of a
     bear_instance. Each bear_instance may or may not have dependencies.
 
-    :param global_result_dict: The list of results out of which the dependency
-                               results are picked.
+    :param global_result_dict: The dict of results of the already executed
+                               global bears, with the bear names as keys.
     :return:                   None if bear has no dependencies, False if
                                dependencies are not met, the dependency dict
                                otherwise.
@@ -342,48 +355,100 @@ def get_global_dependency_results(global_result_dict, bear_instance):
     return dependency_results
 
 
-def get_next_global_bear(timeout,
-                         global_bear_queue,
-                         global_bear_list,
-                         global_result_dict):
+def task_done(obj):
     """
-    Retrieves the next global bear.
+    Invokes task_done if the given queue provides this operation. Otherwise
+    passes silently.
 
-    :param timeout:            The queue blocks at most timeout seconds for a
-                               free slot to execute the put operation on. After
-                               the timeout it returns queue Full exception.
-    :param global_bear_queue:  queue (read, write) of indexes of global bear
-                               instances in the global_bear_list.
-    :param global_bear_list:   A list containing all global bears to be
-                               executed.
-    :param global_result_dict: A Manager.dict that will be used to store global
-                               results. The list of results of one global bear
-                               will be stored with the bear name as key.
-    :return:                   (bear, bearname, dependency_results)
+    :param obj: Any object.
     """
-    dependency_results = False
+    if hasattr(obj, 'task_done'):
+        obj.task_done()
 
-    while dependency_results is False:
-        bear_id = global_bear_queue.get(timeout=timeout)
-        bear = global_bear_list[bear_id]
 
-        dependency_results = (
-            get_global_dependency_results(global_result_dict, bear))
-        if dependency_results is False:
-            global_bear_queue.put(bear_id)
+def add_bear_time(bear_times, bear_name, seconds, filename):
+    """
+    Adds the time a bear ran on a file to the given ``bear_times``.
+
+    >>> bear_times = {}
+    >>> add_bear_time(bear_times, 'SomeBear', 0.5, 'non_existent_file')
+    >>> add_bear_time(bear_times, 'SomeBear', 0.25, 'non_existent_file')
+    >>> bear_times
+    {'SomeBear': (0.75, 0)}
+
+    :param bear_times: A dict mapping bear names to tuples of the total
+                       seconds the bear ran and the total size of the files
+                       it ran on.
+    :param bear_name:  The name of the bear.
+    :param seconds:    The number of seconds the bear ran.
+    :param filename:   The name of the file the bear ran on.
+    """
+    try:
+        size = os.path.getsize(filename)
+    except OSError:
+        size = 0
 
-    return bear, dependency_results
+    total_seconds, total_size = bear_times.get(bear_name, (0, 0))
+    bear_times[bear_name] = (total_seconds + seconds, total_size + size)
 
 
-def task_done(obj):
+def prepare_batch(message_queue,
+                  timeout,
+                  file_dict,
+                  local_bear_list,
+                  filenames,
+                  debug=False,
+                  bear_times=None):
     """
-    Invokes task_done if the given queue provides this operation. Otherwise
-    passes silently.
-
-    :param obj: Any object.
+    Lets the local bears prepare running on a batch of files. If a bear fails
+    to do so, it runs on each file on its own.
+
+    :param message_queue:   A queue that contains messages of type
+                            errors/warnings/debug statements to be printed
+                            in the Log.
+    :param timeout:         The queue blocks at most timeout seconds for a
+                            free slot to execute the put operation on. After
+                            the timeout it returns queue Full exception.
+    :param file_dict:       Dictionary that contains contents of files.
+    :param local_bear_list: List of local bears to prepare.
+    :param filenames:       The names of the files of the batch.
+    :param bear_times:      A dict the preparation time of each bear is added
+                            to, see ``run_local_bears_on_file``.
     """
-    if hasattr(obj, 'task_done'):
-        obj.task_done()
+    files = {}
+    for filename in filenames:
+        try:
+            files[filename] = file_dict[filename]
+        except KeyError:
+            # Unreadable files are skipped by ``run_local_bears_on_file``.
+            pass
+
+    for bear_instance in local_bear_list:
+        if not isinstance(bear_instance, LocalBear):
+            continue
+
+        start_time = time.perf_counter()
+        try:
+            bear_instance.prepare_batch(list(files), list(files.values()))
+        except Exception:
+            if debug:
+                raise
+
+            send_msg(message_queue,
+                     timeout,
+                     LOG_LEVEL.DEBUG,
+                     'The bear {} failed to prepare running on multiple '
+                     'files:'.format(bear_instance.name),
+                     traceback.format_exc(),
+                     delimiter='\n')
+
+        if bear_times is not None:
+            seconds = time.perf_counter() - start_time
+            for filename in files:
+                add_bear_time(bear_times,
+                              bear_instance.__class__.__name__,
+                              seconds / len(files),
+                              filename)
 
 
 def run_local_bears(filename_queue,
@@ -391,93 +456,120 @@ def run_local_bears(filename_queue,
                     timeout,
                     file_dict,
                     local_bear_list,
-                    local_result_dict,
                     control_queue,
                     debug=False):
     """
     Run local bears on all the files given.
 
-    :param filename_queue:    queue (read) of file names to check with
-                              local bears.
-    :param message_queue:     A queue that contains messages of type
-                              errors/warnings/debug statements to be printed
-                              in the Log.
-    :param timeout:           The queue blocks at most timeout seconds for a
-                              free slot to execute the put operation on. After
-                              the timeout it returns queue Full exception.
-    :param file_dict:         Dictionary that contains contents of files.
-    :param local_bear_list:   List of local bears to run.
-    :param local_result_dict: A Manager.dict that will be used to store local
-                              bear results. A list of all local bear results
-                              will be stored with the filename as key.
-    :param control_queue:     If any result gets written to the result_dict a
-                              tuple containing a CONTROL_ELEMENT (to indicate
-                              what kind of event happened) and either a bear
-                              name(for global results) or a file name to
-                              indicate the result will be put to the queue.
+    :param filename_queue:  queue (read) of tasks, terminated by ``None``.
+                            Each task is a tuple of a list of file names and a
+                            list of indexes of the local bears to run on these
+                            files.
+    :param message_queue:   A queue that contains messages of type
+                            errors/warnings/debug statements to be printed
+                            in the Log.
+    :param timeout:         The queue blocks at most timeout seconds for a
+                            free slot to execute the put operation on. After
+                            the timeout it returns queue Full exception.
+    :param file_dict:       Dictionary that contains contents of files.
+    :param local_bear_list: List of local bears to run.
+    :param control_queue:   For each task a tuple containing
+                            ``CONTROL_ELEMENT.LOCAL`` and a tuple of the file
+                            name and its results will be put to the queue.
+    :return:                A dict mapping the names of the bears that ran to
+                            tuples of the total seconds they ran and the total
+                            size of the files they ran on.
     """
-    try:
-        while True:
-            filename = filename_queue.get(timeout=timeout)
+    bear_times = {}
+    while True:
+        task = filename_queue.get()
+        if task is None:
+            task_done(filename_queue)
+            return bear_times
+
+        filenames, bear_indexes = task
+        bears = [local_bear_list[index] for index in bear_indexes]
+        if len(filenames) > 1:
+            prepare_batch(message_queue,
+                          timeout,
+                          file_dict,
+                          bears,
+                          filenames,
+                          debug=debug,
+                          bear_times=bear_times)
+
+        for filename in filenames:
             run_local_bears_on_file(message_queue,
                                     timeout,
                                     file_dict,
-                                    local_bear_list,
-                                    local_result_dict,
+                                    bears,
                                     control_queue,
                                     filename,
-                                    debug=debug)
-            task_done(filename_queue)
-    except queue.Empty:
-        return
+                                    debug=debug,
+                                    bear_times=bear_times)
+        task_done(filename_queue)
 
 
 def run_global_bears(message_queue,
                      timeout,
                      global_bear_queue,
                      global_bear_list,
-                     global_result_dict,
                      control_queue,
                      debug=False):
     """
     Run all global bears.
 
-    :param message_queue:      A queue that contains messages of type
-                               errors/warnings/debug statements to be printed
-                               in the Log.
-    :param timeout:            The queue blocks at most timeout seconds for a
-                               free slot to execute the put operation on. After
-                               the timeout it returns queue Full exception.
-    :param global_bear_queue:  queue (read, write) of indexes of global bear
-                               instances in the global_bear_list.
-    :param global_bear_list:   list of global bear instances
-    :param global_result_dict: A Manager.dict that will be used to store global
-                               results. The list of results of one global bear
-                               will be stored with the bear name as key.
-    :param control_queue:      If any result gets written to the result_dict a
-                               tuple containing a CONTROL_ELEMENT (to indicate
-                               what kind of event happened) and either a bear
-                               name(for global results) or a file name to
-                               indicate the result will be put to the queue.
+    Global bears depending on each other are always put to the
+    ``global_bear_queue`` as one group, so their dependency results are
+    available inside the process running them.
+
+    :param message_queue:     A queue that contains messages of type
+                              errors/warnings/debug statements to be printed
+                              in the Log.
+    :param timeout:           The queue blocks at most timeout seconds for a
+                              free slot to execute the put operation on. After
+                              the timeout it returns queue Full exception.
+    :param global_bear_queue: queue (read) of lists of indexes of global bear
+                              instances in the global_bear_list, terminated by
+                              ``None``. Each list contains bears depending on
+                              each other, ordered so that dependencies come
+                              first.
+    :param global_bear_list:  list of global bear instances
+    :param control_queue:     For each global bear yielding results, a tuple
+                              containing ``CONTROL_ELEMENT.GLOBAL`` and a tuple
+                              of the bear name and its results will be put to
+                              the queue.
     """
-    try:
-        while True:
-            bear, dep_results = (
-                get_next_global_bear(timeout,
-                                     global_bear_queue,
-                                     global_bear_list,
-                                     global_result_dict))
+    while True:
+        bear_ids = global_bear_queue.get()
+        if bear_ids is None:
+            task_done(global_bear_queue)
+            return
+
+        global_result_dict = {}
+        for bear_id in bear_ids:
+            bear = global_bear_list[bear_id]
             bearname = bear.__class__.__name__
-            result = run_global_bear(message_queue, timeout, bear, dep_results,
-                                     debug=debug)
+            dep_results = get_global_dependency_results(
+                global_result_dict, bear)
+            if dep_results is False:
+                send_msg(message_queue,
+                         timeout,
+                         LOG_LEVEL.WARNING,
+                         'The dependencies of the bear {} could not be '
+                         'resolved. Skipping bear...'.format(bearname),
+                         Constants.THIS_IS_A_BUG)
+                result = None
+            else:
+                result = run_global_bear(message_queue, timeout, bear,
+                                         dep_results, debug=debug)
+
             if result:
                 global_result_dict[bearname] = result
-                control_queue.put((CONTROL_ELEMENT.GLOBAL, bearname))
+                control_queue.put((CONTROL_ELEMENT.GLOBAL, (bearname, result)))
             else:
                 global_result_dict[bearname] = None
-            task_done(global_bear_queue)
-    except queue.Empty:
-        return
+        task_done(global_bear_queue)
 
 
 def run(file_name_queue,
@@ -485,8 +577,6 @@ def run(file_name_queue,
         global_bear_list,
         global_bear_queue,
         file_dict,
-        local_result_dict,
-        global_result_dict,
         message_queue,
         control_queue,
         timeout=0,
@@ -495,10 +585,10 @@ def run(file_name_queue,
     This is the method that is actually runs by processes.
 
     If parameters type is 'queue (read)' this means it has to implement the
-    get(timeout=TIMEOUT) method and it shall raise queue.Empty if the queue
-    is empty up until the end of the timeout. If the queue has the
-    (optional!) task_done() attribute, the run method will call it after
-    processing each item.
+    blocking get() method. Every invocation of the run method reads items
+    until it gets ``None``, so one ``None`` per process has to be put after
+    the last item. If the queue has the (optional!) task_done() attribute,
+    the run method will call it after processing each item.
 
     If parameters type is 'queue (write)' it shall implement the
     put(object, timeout=TIMEOUT) method.
@@ -506,34 +596,33 @@ def run(file_name_queue,
     If the queues raise any exception not specified here the user will get
     an 'unknown error' message. So beware of that.
 
-    :param file_name_queue:    queue (read) of file names to check with local
-                               bears. Each invocation of the run method needs
-                               one such queue which it checks with all the
-                               local bears. The queue could be empty.
-                               (Repeat until queue empty.)
+    :param file_name_queue:    queue (read) of tuples of a list of file names
+                               and a list of indexes of local bear instances
+                               in the local_bear_list to run on these files.
+                               Each list of indexes is a group of bears
+                               depending on each other. (Repeat until ``None``
+                               is read.)
     :param local_bear_list:    List of local bear instances.
     :param global_bear_list:   List of global bear instances.
-    :param global_bear_queue:  queue (read, write) of indexes of global bear
-                               instances in the global_bear_list.
+    :param global_bear_queue:  queue (read) of lists of indexes of global bear
+                               instances in the global_bear_list. Each list
+                               is a group of bears depending on each other.
     :param file_dict:          dict of all files as {filename:file}, file as in
                                file.readlines().
-    :param local_result_dict:  A Manager.dict that will be used to store local
-                               results. A list of all local results.
-                               will be stored with the filename as key.
-    :param global_result_dict: A Manager.dict that will be used to store global
-                               results. The list of results of one global bear
-                               will be stored with the bear name as key.
     :param message_queue:      queue (write) for debug/warning/error
                                messages (type LogMessage)
-    :param control_queue:      queue (write). If any result gets written to the
-                               result_dict a tuple containing a CONTROL_ELEMENT
-                               (to indicate what kind of event happened) and
-                               either a bear name (for global results) or a
-                               file name to indicate the result will be put to
-                               the queue. If the run method finished all its
-                               local bears it will put
-                               (CONTROL_ELEMENT.LOCAL_FINISHED, None) to the
-                               queue, if it finished all global ones,
+    :param control_queue:      queue (write). Results are streamed through this
+                               queue as tuples containing a CONTROL_ELEMENT (to
+                               indicate what kind of event happened) and a
+                               tuple of either a bear name (for global results)
+                               or a file name and the list of results. If the
+                               run method finished all its local bears it will
+                               put (CONTROL_ELEMENT.LOCAL_FINISHED, bear_times)
+                               to the queue, where bear_times maps the names
+                               of the local bears that ran to tuples of the
+                               total seconds they ran and the total size of
+                               the files they ran on. If it finished all global
+                               ones,
                                (CONTROL_ELEMENT.GLOBAL_FINISHED, None) will
                                be put there.
     :param timeout:            The queue blocks at most timeout seconds for a
@@ -541,21 +630,19 @@ def run(file_name_queue,
                                the timeout it returns queue Full exception.
     """
     try:
-        run_local_bears(file_name_queue,
-                        message_queue,
-                        timeout,
-                        file_dict,
-                        local_bear_list,
-                        local_result_dict,
-                        control_queue,
-                        debug=debug)
-        control_queue.put((CONTROL_ELEMENT.LOCAL_FINISHED, None))
+        bear_times = run_local_bears(file_name_queue,
+                                     message_queue,
+                                     timeout,
+                                     file_dict,
+                                     local_bear_list,
+                                     control_queue,
+                                     debug=debug)
+        control_queue.put((CONTROL_ELEMENT.LOCAL_FINISHED, bear_times))
 
         run_global_bears(message_queue,
                          timeout,
                          global_bear_queue,
                          global_bear_list,
-                         global_result_dict,
                          control_queue,
                          debug=debug)
         control_queue.put((CONTROL_ELEMENT.GLOBAL_FINISHED, None))
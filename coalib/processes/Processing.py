@@ -1,5 +1,8 @@
+from bisect import bisect_right
+from collections import defaultdict
 from itertools import chain
 import logging
+import math
 import os
 import platform
 import queue
@@ -27,11 +30,15 @@ from coalib.results.result_actions.ShowPatchAction import ShowPatchAction
 from coalib.results.RESULT_SEVERITY import RESULT_SEVERITY
 from coalib.results.SourceRange import SourceRange
 from coalib.settings.Setting import glob_list, typed_list
-from coalib.parsing.Globbing import fnmatch
+from coalib.parsing.Globbing import fnmatch, GlobSet
 from coalib.io.FileProxy import FileDictGenerator
 from coalib.io.File import File
 
 
+# The number of seconds to wait for control elements before checking whether
+# the processes running bears are still alive.
+PROCESS_WATCHDOG_TIMEOUT = 1
+
 ACTIONS = [DoNothingAction,
            ApplyPatchAction,
            PrintDebugMessageAction,
@@ -61,6 +68,32 @@ def get_running_processes(processes):
     return sum((1 if process.is_alive() else 0) for process in processes)
 
 
+def join_processes(processes, control_queue, timeout=0.1):
+    """
+    Joins the given processes, discarding what they still put into the
+    control queue.
+
+    A process only exits after the elements it put into a queue were flushed
+    into the underlying pipe. If nobody reads them anymore, e.g. because
+    ``process_queues`` was left through an exception, joining it without
+    draining the queue could deadlock.
+
+    :param processes:     The processes to join.
+    :param control_queue: The control queue the processes put elements into.
+    :param timeout:       The seconds to wait for a process before draining
+                          the queue again.
+    """
+    for process in processes:
+        process.join(timeout)
+        while process.is_alive():
+            try:
+                while True:
+                    control_queue.get_nowait()
+            except queue.Empty:
+                pass
+            process.join(timeout)
+
+
 def create_process_group(command_array, **kwargs):
     if platform.system() == 'Windows':  # pragma posix: no cover
         proc = subprocess.Popen(
@@ -173,6 +206,121 @@ def autoapply_actions(results,
     return not_processed_results
 
 
+def _get_bear_matcher(bears):
+    """
+    Creates a function testing whether a lower cased bear name is matched by
+    the given bear names or globs. Results are memoised per bear name.
+
+    >>> matcher = _get_bear_matcher(['pep8bear', '(line*|space*)'])
+    >>> matcher('linelengthbear'), matcher('pep8bear'), matcher('xmlbear')
+    (True, True, False)
+    >>> _get_bear_matcher([])('xmlbear')
+    True
+
+    :param bears: A list of lower cased bear names or globs. An empty list
+                  matches all bears.
+    :return:      The matching function.
+    """
+    if not bears:
+        return lambda name: True
+
+    names = set(bears)
+    glob_set = GlobSet(bears)
+    matches = {}
+
+    def matcher(name):
+        match = matches.get(name)
+        if match is None:
+            match = name in names or glob_set.match(name)
+            matches[name] = match
+        return match
+
+    return matcher
+
+
+class IgnoreRangeIndex:
+    """
+    Indexes ignore ranges by file and line, so looking up the ranges that
+    apply to a result doesn't need to check every ignore range of a project.
+
+    >>> index = IgnoreRangeIndex([
+    ...     (['pep8bear'], SourceRange.from_values('a.py', 3, 1, 4, 10)),
+    ...     ([], SourceRange.from_values('b.py', 1, 1, 20, 1))])
+    >>> index.ignores(Result.from_values('PEP8Bear', 'msg', 'a.py', 4))
+    True
+    >>> index.ignores(Result.from_values('PEP8Bear', 'msg', 'a.py', 5))
+    False
+    >>> index.ignores(Result.from_values('OtherBear', 'msg', 'a.py', 4))
+    False
+    >>> index.ignores(Result.from_values('OtherBear', 'msg', 'b.py', 7))
+    True
+    """
+
+    def __init__(self, ignore_ranges):
+        """
+        :param ignore_ranges: An iterable of tuples, each containing a list of
+                              lower cased affected bearnames and a SourceRange
+                              to ignore, like ``yield_ignore_ranges`` yields.
+                              An empty bearname list ignores all bears. The
+                              bearnames may also be globs.
+        """
+        matchers = {}
+        ranges_by_file = defaultdict(list)
+        for bears, range in ignore_ranges:
+            key = tuple(bears)
+            if key not in matchers:
+                matchers[key] = _get_bear_matcher(bears)
+
+            start_line = range.start.line or 0
+            end_line = math.inf if range.end.line is None else range.end.line
+            ranges_by_file[range.file].append(
+                (start_line, end_line, matchers[key], range))
+
+        # For each file, ranges are sorted by their start line. The highest end
+        # line of all ranges up to an index allows to stop searching early.
+        self._files = {}
+        for filename, ranges in ranges_by_file.items():
+            ranges.sort(key=lambda entry: entry[0])
+            max_end_lines = []
+            max_end_line = 0
+            for entry in ranges:
+                max_end_line = max(max_end_line, entry[1])
+                max_end_lines.append(max_end_line)
+            self._files[filename] = ([entry[0] for entry in ranges],
+                                     max_end_lines,
+                                     ranges)
+
+    def ignores(self, result):
+        """
+        Determines whether the result is inside an ignore range for its
+        origin. See ``check_result_ignore``.
+
+        :param result: The result to check.
+        :return:       True if the result has to be ignored.
+        """
+        origin = None
+        for code in result.affected_code:
+            index = self._files.get(code.file)
+            if index is None:
+                continue
+
+            start_lines, max_end_lines, ranges = index
+            start_line = code.start.line or 0
+            end_line = math.inf if code.end.line is None else code.end.line
+
+            i = bisect_right(start_lines, end_line) - 1
+            while i >= 0 and max_end_lines[i] >= start_line:
+                _, range_end_line, matcher, range = ranges[i]
+                if range_end_line >= start_line and range.overlaps(code):
+                    if origin is None:
+                        origin = result.origin.lower().split(' ')[0]
+                    if matcher(origin):
+                        return True
+                i -= 1
+
+        return False
+
+
 def check_result_ignore(result, ignore_ranges):
     """
     Determines if the result has to be ignored.
@@ -185,20 +333,19 @@ def check_result_ignore(result, ignore_ranges):
     just `# Ignore CSecurityBear`.
 
     :param result:        The result that needs to be checked.
-    :param ignore_ranges: A list of tuples, each containing a list of lower
-                          cased affected bearnames and a SourceRange to
-                          ignore. If any of the bearname lists is empty, it
-                          is considered an ignore range for all bears.
-                          This may be a list of globbed bear wildcards.
+    :param ignore_ranges: An ``IgnoreRangeIndex``, or a list of tuples, each
+                          containing a list of lower cased affected bearnames
+                          and a SourceRange to ignore. If any of the bearname
+                          lists is empty, it is considered an ignore range for
+                          all bears. This may be a list of globbed bear
+                          wildcards. Pass an ``IgnoreRangeIndex`` when
+                          checking many results.
     :return:              True if the result has to be ignored.
     """
-    for bears, range in ignore_ranges:
-        orig = result.origin.lower().split(' ')[0]
-        if (result.overlaps(range) and
-                (len(bears) == 0 or orig in bears or fnmatch(orig, bears))):
-            return True
+    if not isinstance(ignore_ranges, IgnoreRangeIndex):
+        ignore_ranges = IgnoreRangeIndex(ignore_ranges)
 
-    return False
+    return ignore_ranges.ignores(result)
 
 
 def print_result(results,
@@ -226,8 +373,10 @@ def print_result(results,
                            to the output medium.
     :param file_diff_dict: A dictionary that contains filenames as keys and
                            diff objects as values.
-    :param ignore_ranges:  A list of SourceRanges. Results that affect code in
-                           any of those ranges will be ignored.
+    :param ignore_ranges:  An ``IgnoreRangeIndex`` or a list of ignore ranges
+                           as accepted by ``check_result_ignore``. Results
+                           that affect code in any of those ranges will be
+                           ignored.
     :param apply_single:   The action that should be applied for all results,
                            If it's not selected, has a value of False.
     :param console_printer: Object to print messages on the console.
@@ -259,35 +408,20 @@ def print_result(results,
 
 def get_file_dict(filename_list, log_printer=None, allow_raw_files=False):
     """
-    Reads all files into a dictionary.
+    Creates a dictionary of all files. The files are read lazily when their
+    contents are accessed, see ``FileDict``.
 
     :param filename_list:   List of names of paths to files to get contents of.
     :param log_printer:     The logger which logs errors.
     :param allow_raw_files: Allow the usage of raw files (non text files),
                             disabled by default
-    :return:                Reads the content of each file into a dictionary
+    :return:                A ``FileDict`` providing the content of each file
                             with filenames as keys.
     """
-    file_dict = FileDict()
+    file_dict = FileDict(allow_raw_files=allow_raw_files)
     for filename in filename_list:
         try:
             file_dict[filename] = File(filename)
-            # This is a workaround to purposely raise a
-            # ``UnicodeDecodeError`` to move into the
-            # except clause.
-            File(filename).string
-        except UnicodeDecodeError:
-            if allow_raw_files:
-                file_dict[filename] = None
-                continue
-            else:
-                # In case raw files are not allowed the
-                # ``File`` object created for it
-                # needs to be evicted from the dictionary.
-                del file_dict[filename]
-            logging.warning("Failed to read file '{}'. It seems to contain "
-                            'non-unicode characters. Leaving it out.'
-                            .format(filename))
         except OSError as exception:
             log_exception("Failed to read file '{}' because of an unknown "
                           'error. Leaving it out.'.format(filename),
@@ -343,6 +477,120 @@ def instantiate_bears(section,
     return instantiated_local_bear_list, instantiated_global_bear_list
 
 
+def get_bear_groups(bear_list):
+    """
+    Groups bears that depend on each other, so each group can be run in a
+    single process without sharing results between processes.
+
+    >>> class Bear1: BEAR_DEPS = set()
+    >>> class Bear2: BEAR_DEPS = set()
+    >>> class Bear3: BEAR_DEPS = {Bear1}
+    >>> get_bear_groups([Bear1(), Bear2(), Bear3()])
+    [[0, 2], [1]]
+
+    :param bear_list: The list of bear instances, sorted so that dependencies
+                      come before their dependants.
+    :return:          A list of lists of indexes into ``bear_list``. The
+                      indexes of each group are in the order of
+                      ``bear_list``.
+    """
+    # Maps each bear index to the index of the first bear of its group.
+    group_of = list(range(len(bear_list)))
+    names = {bear.__class__.__name__: index
+             for index, bear in enumerate(bear_list)}
+
+    def find(index):
+        while group_of[index] != index:
+            index = group_of[index]
+        return index
+
+    for index, bear in enumerate(bear_list):
+        for dep in getattr(bear, 'BEAR_DEPS', ()):
+            if dep.__name__ in names:
+                first, second = sorted((find(index),
+                                        find(names[dep.__name__])))
+                group_of[second] = first
+
+    groups = {}
+    for index in range(len(bear_list)):
+        groups.setdefault(find(index), []).append(index)
+
+    return list(groups.values())
+
+
+def get_local_bear_tasks(local_bear_list,
+                         filename_list,
+                         bear_times=None,
+                         job_count=1):
+    """
+    Splits running the local bears into tasks of a group of bears depending
+    on each other and a file, so the bears of a big file can run in parallel.
+    A single bear with a ``BATCH_SIZE`` greater than one gets up to that many
+    files per task, but smaller batches are made if there are not enough files
+    to give a batch to each of the ``job_count`` processes.
+
+    The tasks are sorted by their estimated run time, the file size multiplied
+    by the seconds per byte the bears of the task took in previous runs, so
+    the longest tasks start first and don't delay the end of the section.
+
+    >>> class Bear1: BEAR_DEPS = set()
+    >>> class Bear2: BEAR_DEPS = set()
+    >>> get_local_bear_tasks([Bear1(), Bear2()], ['non_existent_file'],
+    ...                      {'Bear2': 2.0, 'Bear1': 1.0})
+    [(['non_existent_file'], [1]), (['non_existent_file'], [0])]
+
+    :param local_bear_list: The list of local bear instances.
+    :param filename_list:   The files to run the local bears on.
+    :param bear_times:      A dict mapping bear names to the seconds per byte
+                            they took in previous runs. Bears without a time
+                            are assumed to take the average time of the
+                            others.
+    :param job_count:       The number of processes running the tasks.
+    :return:                A list of tuples of a list of file names and a
+                            list of indexes into ``local_bear_list``, longest
+                            tasks first.
+    """
+    bear_times = bear_times or {}
+    default_time = (sum(bear_times.values()) / len(bear_times)
+                    if bear_times else 1)
+    group_times = [(group,
+                    sum(bear_times.get(local_bear_list[index].__class__
+                                       .__name__,
+                                       default_time)
+                        for index in group))
+                   # Without local bears, the files are still dispatched so
+                   # each of them gets an (empty) list of local results.
+                   for group in get_bear_groups(local_bear_list) or [[]]]
+
+    sizes = {}
+    for filename in filename_list:
+        try:
+            # Account for a constant overhead for empty files.
+            sizes[filename] = os.path.getsize(filename) + 1
+        except OSError:
+            sizes[filename] = 1
+    # Batch files of similar sizes, so the batches are of similar length.
+    filenames = sorted(sizes, key=sizes.get, reverse=True)
+
+    tasks = []
+    for group, group_time in group_times:
+        batch_size = 1
+        if len(group) == 1:
+            batch_size = getattr(local_bear_list[group[0]], 'BATCH_SIZE', 1)
+        batch_size = max(1, min(batch_size,
+                                math.ceil(len(filenames) / job_count)))
+
+        for start in range(0, len(filenames), batch_size):
+            batch = filenames[start:start + batch_size]
+            tasks.append((sum(sizes[filename] for filename in batch) *
+                          group_time,
+                          batch,
+                          group))
+
+    tasks.sort(key=lambda task: task[0], reverse=True)
+    return [(batch, group) for _, batch, group in tasks]
+
+
 def instantiate_processes(section,
                           local_bear_list,
                           global_bear_list,
@@ -391,18 +639,17 @@ def instantiate_processes(section,
     complete_file_dict = file_dict_generator(complete_filename_list,
                                              allow_raw_files=use_raw_files)
 
-    logging.debug('Files that will be checked:\n' +
-                  '\n'.join(complete_file_dict.keys()))
+    # The files are not read here, files which turn out to be unreadable are
+    # reported and left out once they are accessed.
+    logging.debug('Files that will be checked unless they are unreadable:\n' +
+                  '\n'.join(complete_file_dict))
 
     if debug or debug_bears:
         from . import DebugProcessing as processing
     else:
         import multiprocessing as processing
-    manager = processing.Manager()
     global_bear_queue = processing.Queue()
     filename_queue = processing.Queue()
-    local_result_dict = manager.dict()
-    global_result_dict = manager.dict()
     message_queue = processing.Queue()
     control_queue = processing.Queue()
 
@@ -437,24 +684,34 @@ def instantiate_processes(section,
     # Note: the complete file dict is given as the file dict to bears and
     # the whole project is accessible to every bear. However, local bears are
     # run only for the changed files if caching is enabled.
-    file_dict = {filename: complete_file_dict[filename]
-                 for filename in filename_list
-                 if filename in complete_file_dict}
+    # The files are not read here, so the bear processes can start right
+    # away and read their files in parallel.
+    if isinstance(complete_file_dict, FileDict):
+        file_dict = complete_file_dict.subset(filename_list)
+    else:
+        file_dict = {filename: complete_file_dict[filename]
+                     for filename in filename_list
+                     if filename in complete_file_dict}
 
     bear_runner_args = {'file_name_queue': filename_queue,
                         'local_bear_list': local_bear_list,
                         'global_bear_list': global_bear_list,
                         'global_bear_queue': global_bear_queue,
                         'file_dict': file_dict,
-                        'local_result_dict': local_result_dict,
-                        'global_result_dict': global_result_dict,
                         'message_queue': message_queue,
                         'control_queue': control_queue,
                         'timeout': 0.1,
                         'debug': debug}
 
-    fill_queue(filename_queue, file_dict.keys())
-    fill_queue(global_bear_queue, range(len(global_bear_list)))
+    fill_queue(filename_queue,
+               get_local_bear_tasks(local_bear_list,
+                                    list(file_dict),
+                                    cache.bear_times if cache else None,
+                                    job_count))
+    fill_queue(global_bear_queue, get_bear_groups(global_bear_list))
+    # Each process stops reading from the queues on its ``None``.
+    fill_queue(filename_queue, [None] * job_count)
+    fill_queue(global_bear_queue, [None] * job_count)
 
     return ([processing.Process(target=run, kwargs=bear_runner_args)
              for i in range(job_count)],
@@ -485,52 +742,63 @@ def yield_ignore_ranges(file_dict):
     :param file_dict: The file dictionary.
     """
     for filename, file in file_dict.items():
-        start = None
-        bears = []
-        stop_ignoring = False
+        yield from yield_file_ignore_ranges(filename, file)
 
-        # Do not process raw files
-        if file is None:
-            continue
 
-        for line_number, line in enumerate(file, start=1):
-            # Before lowering all lines ever read, first look for the biggest
-            # common substring, case sensitive: I*gnor*e, start i*gnor*ing,
-            # N*oqa*.
-            if 'gnor' in line or 'oqa' in line:
-                line = line.lower()
-                if 'start ignoring ' in line:
-                    start = line_number
-                    bears = get_ignore_scope(line, 'start ignoring ')
-                elif 'stop ignoring' in line:
-                    stop_ignoring = True
-                    if start:
-                        yield (bears,
+def yield_file_ignore_ranges(filename, file):
+    """
+    Yields the ignore ranges of a single file, see ``yield_ignore_ranges``.
+
+    :param filename: The name of the file.
+    :param file:     The lines of the file, or ``None`` for raw files which
+                     are not processed.
+    """
+    start = None
+    bears = []
+    stop_ignoring = False
+
+    # Do not process raw files
+    if file is None:
+        return
+
+    for line_number, line in enumerate(file, start=1):
+        # Before lowering all lines ever read, first look for the biggest
+        # common substring, case sensitive: I*gnor*e, start i*gnor*ing,
+        # N*oqa*.
+        if 'gnor' in line or 'oqa' in line:
+            line = line.lower()
+            if 'start ignoring ' in line:
+                start = line_number
+                bears = get_ignore_scope(line, 'start ignoring ')
+            elif 'stop ignoring' in line:
+                stop_ignoring = True
+                if start:
+                    yield (bears,
+                           SourceRange.from_values(
+                               filename,
+                               start,
+                               1,
+                               line_number,
+                               len(file[line_number-1])))
+
+            else:
+                for ignore_stmt in ['ignore ', 'noqa ', 'noqa']:
+                    if ignore_stmt in line:
+                        end_line = min(line_number + 1, len(file))
+                        yield (get_ignore_scope(line, ignore_stmt),
                                SourceRange.from_values(
                                    filename,
-                                   start,
-                                   1,
-                                   line_number,
-                                   len(file[line_number-1])))
-
-                else:
-                    for ignore_stmt in ['ignore ', 'noqa ', 'noqa']:
-                        if ignore_stmt in line:
-                            end_line = min(line_number + 1, len(file))
-                            yield (get_ignore_scope(line, ignore_stmt),
-                                   SourceRange.from_values(
-                                       filename,
-                                       line_number, 1,
-                                       end_line, len(file[end_line-1])))
-                            break
-
-        if stop_ignoring is False and start is not None:
-            yield (bears,
-                   SourceRange.from_values(filename,
-                                           start,
-                                           1,
-                                           len(file),
-                                           len(file[-1])))
+                                   line_number, 1,
+                                   end_line, len(file[end_line-1])))
+                        break
+
+    if stop_ignoring is False and start is not None:
+        yield (bears,
+               SourceRange.from_values(filename,
+                                       start,
+                                       1,
+                                       len(file),
+                                       len(file[-1])))
 
 
 def get_file_list(results):
@@ -565,16 +833,15 @@ def process_queues(processes,
     :param processes:          List of processes which can be used to run
                                Bears.
     :param control_queue:      Containing control elements that indicate
-                               whether there is a result available and which
-                               bear it belongs to.
-    :param local_result_dict:  Dictionary containing results respective to
-                               local bears. It is modified by the processes
-                               i.e. results are added to it by multiple
-                               processes.
-    :param global_result_dict: Dictionary containing results respective to
-                               global bears. It is modified by the processes
-                               i.e. results are added to it by multiple
-                               processes.
+                               whether there is a result available together
+                               with the results and the file name or bear
+                               name they belong to.
+    :param local_result_dict:  Dictionary the processed results of local
+                               bears are stored in, with the file names as
+                               keys.
+    :param global_result_dict: Dictionary the processed results of global
+                               bears are stored in, with the bear names as
+                               keys.
     :param file_dict:          Dictionary containing file contents with
                                filename as keys.
     :param print_results:      Prints all given results appropriate to the
@@ -598,21 +865,31 @@ def process_queues(processes,
     global_processes = len(processes)
     global_result_buffer = []
     result_files = set()
-    ignore_ranges = list(yield_ignore_ranges(file_dict))
+    # The cache keeps the ignore ranges of unchanged files, so they don't
+    # need to be read and scanned again.
+    if cache:
+        ignore_ranges = cache.get_ignore_ranges(file_dict)
+    else:
+        ignore_ranges = yield_ignore_ranges(file_dict)
+    ignore_ranges = IgnoreRangeIndex(ignore_ranges)
 
     # One process is the logger thread (if not in debug mode)
     while local_processes > (1 if not (debug or debug_bears) else 0):
         try:
-            control_elem, index = control_queue.get(timeout=0.1)
+            control_elem, payload = control_queue.get(
+                timeout=PROCESS_WATCHDOG_TIMEOUT)
 
             if control_elem == CONTROL_ELEMENT.LOCAL_FINISHED:
                 local_processes -= 1
+                if cache and payload:
+                    cache.add_bear_times(payload)
             elif control_elem == CONTROL_ELEMENT.GLOBAL_FINISHED:
                 global_processes -= 1
             elif control_elem == CONTROL_ELEMENT.LOCAL:
                 assert local_processes != 0
-                result_files.update(get_file_list(local_result_dict[index]))
-                retval, res = print_result(local_result_dict[index],
+                index, results = payload
+                result_files.update(get_file_list(results))
+                retval, res = print_result(results,
                                            file_dict,
                                            retval,
                                            print_results,
@@ -623,10 +900,11 @@ def process_queues(processes,
                                            console_printer=console_printer,
                                            apply_single=apply_single
                                            )
-                local_result_dict[index] = res
+                # The bears of a file may run in several tasks.
+                local_result_dict.setdefault(index, []).extend(res)
             else:
                 assert control_elem == CONTROL_ELEMENT.GLOBAL
-                global_result_buffer.append(index)
+                global_result_buffer.append(payload)
         except queue.Empty:
             if get_running_processes(processes) < 2:  # pragma: no cover
                 # Recover silently, those branches are only
@@ -634,9 +912,9 @@ def process_queues(processes,
                 break
 
     # Flush global result buffer
-    for elem in global_result_buffer:
-        result_files.update(get_file_list(global_result_dict[elem]))
-        retval, res = print_result(global_result_dict[elem],
+    for elem, results in global_result_buffer:
+        result_files.update(get_file_list(results))
+        retval, res = print_result(results,
                                    file_dict,
                                    retval,
                                    print_results,
@@ -651,11 +929,13 @@ def process_queues(processes,
     # One process is the logger thread
     while global_processes > 1:
         try:
-            control_elem, index = control_queue.get(timeout=0.1)
+            control_elem, payload = control_queue.get(
+                timeout=PROCESS_WATCHDOG_TIMEOUT)
 
             if control_elem == CONTROL_ELEMENT.GLOBAL:
-                result_files.update(get_file_list(global_result_dict[index]))
-                retval, res = print_result(global_result_dict[index],
+                index, results = payload
+                result_files.update(get_file_list(results))
+                retval, res = print_result(results,
                                            file_dict,
                                            retval,
                                            print_results,
@@ -747,11 +1027,10 @@ def execute_section(section,
     :param apply_single:     The action that should be applied for all results.
                              If it's not selected, has a value of False.
     :return:                 Tuple containing a bool (True if results were
-                             yielded, False otherwise), a Manager.dict
-                             containing all local results(filenames are key)
-                             and a Manager.dict containing all global bear
-                             results (bear names are key) as well as the
-                             file dictionary.
+                             yielded, False otherwise), a dict containing all
+                             local results (filenames are key) and a dict
+                             containing all global bear results (bear names
+                             are key) as well as the file dictionary.
     """
     debug_bears = (False
                    if 'debug_bears' not in section or (
@@ -807,11 +1086,14 @@ def execute_section(section,
     for runner in processes:
         runner.start()
 
+    local_result_dict = {}
+    global_result_dict = {}
+
     try:
         return (process_queues(processes,
                                arg_dict['control_queue'],
-                               arg_dict['local_result_dict'],
-                               arg_dict['global_result_dict'],
+                               local_result_dict,
+                               global_result_dict,
                                arg_dict['file_dict'],
                                print_results,
                                section,
@@ -821,17 +1103,19 @@ def execute_section(section,
                                debug=debug,
                                apply_single=apply_single,
                                debug_bears=debug_bears),
-                arg_dict['local_result_dict'],
-                arg_dict['global_result_dict'],
+                local_result_dict,
+                global_result_dict,
                 arg_dict['file_dict'])
     finally:
         if not (debug or debug_bears):
             # in debug mode multiprocessing and logger_thread are disabled
             # ==> no need for following actions
-            logger_thread.running = False
+            join_processes([runner for runner in processes
+                            if runner is not logger_thread],
+                           arg_dict['control_queue'])
 
-            for runner in processes:
-                runner.join()
+            logger_thread.stop()
+            logger_thread.join()
 
 
 class FileDict(dict):
@@ -839,11 +1123,95 @@ class FileDict(dict):
     Acts as a middleware to provide the bears with the
     actual file contents instead of the `File`
     objects.
+
+    Files are only read and decoded when their contents are accessed for the
+    first time, so bears can start running before every file was read and
+    each process only reads the files it actually uses. Files that can't be
+    decoded are mapped to ``None`` if raw files are allowed. Otherwise they
+    stay keys of the dictionary, but accessing them raises a ``KeyError`` and
+    ``items`` and ``values`` leave them out.
+
+    Problems with reading a file are only reported by the process that
+    created the dictionary. Forked bear processes drop those files silently,
+    as the main process reads every dispatched file for ignore comments
+    anyway, unless it was read before and didn't change since.
     """
 
+    def __init__(self, *args, allow_raw_files=False, **kwargs):
+        """
+        :param allow_raw_files: Map files which can't be decoded to ``None``
+                                instead of leaving them out.
+        """
+        super().__init__(*args, **kwargs)
+        self.allow_raw_files = allow_raw_files
+        self._owner_pid = os.getpid()
+        self._unreadable = set()
+
     def __getitem__(self, key):
         val = super().__getitem__(key)
         if val is None:
             return val
-        else:
+        if key in self._unreadable:
+            raise KeyError(key)
+
+        try:
             return val.lines
+        except UnicodeDecodeError:
+            if self.allow_raw_files:
+                super().__setitem__(key, None)
+                return None
+
+            self._unreadable.add(key)
+            if os.getpid() == self._owner_pid:
+                logging.warning("Failed to read file '{}'. It seems to "
+                                'contain non-unicode characters. Leaving it '
+                                'out.'.format(key))
+        except OSError as exception:
+            self._unreadable.add(key)
+            if os.getpid() == self._owner_pid:
+                log_exception("Failed to read file '{}' because of an "
+                              'unknown error. Leaving it out.'.format(key),
+                              exception,
+                              log_level=LOG_LEVEL.WARNING)
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def items(self):
+        """
+        Yields the filenames and contents of all files which can be read.
+        """
+        for key in self:
+            try:
+                yield key, self[key]
+            except KeyError:
+                pass
+
+    def values(self):
+        """
+        Yields the contents of all files which can be read.
+        """
+        return (value for _, value in self.items())
+
+    def subset(self, filenames):
+        """
+        Returns a ``FileDict`` of the given files without reading them.
+        Filenames that aren't part of this dictionary are ignored.
+
+        :param filenames: The names of the files to include.
+        """
+        return FileDict(((filename, super(FileDict, self).__getitem__(filename))
+                         for filename in filenames
+                         if filename in self),
+                        allow_raw_files=self.allow_raw_files)
+
+    def __reduce__(self):
+        # Pickle the ``File`` objects instead of the file contents, so bear
+        # processes started with ``spawn`` don't receive a copy of the whole
+        # project but read the files they need on their own.
+        return (self.__class__, (), self.__dict__, None,
+                iter(dict.items(self)))
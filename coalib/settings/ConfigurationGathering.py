@@ -409,12 +409,15 @@ def get_config_directory(section):
 def get_all_bears(log_printer=None,
                   arg_parser=None,
                   silent=True,
-                  bear_globs=('**',)):
+                  bear_globs=('**',),
+                  bear_filter=None):
     """
     :param log_printer: The log_printer to handle logging.
     :param arg_parser:  An ``ArgParser`` object.
     :param silent:      Whether or not to display warnings.
     :param bear_globs:  List of glob patterns.
+    :param bear_filter: A function taking a ``BearInfo`` and returning whether
+                        to collect the bear, or ``None`` to collect all bears.
     :return:            Tuple containing dictionaries of unsorted local
                         and global bears.
     """
@@ -422,7 +425,7 @@ def get_all_bears(log_printer=None,
                                      arg_parser=arg_parser,
                                      silent=silent)
     local_bears, global_bears = collect_all_bears_from_sections(
-        sections, bear_globs=bear_globs)
+        sections, bear_globs=bear_globs, bear_filter=bear_filter)
     return local_bears, global_bears
 
 
@@ -438,8 +441,20 @@ def get_filtered_bears(languages,
     :return:            Tuple containing dictionaries of unsorted local
                         and global bears.
     """
+    bear_filter = None
+    if languages:
+        wanted_languages = ({language.lower() for language in languages} |
+                            {'all'})
+
+        # Bears of other languages don't need to be imported.
+        def bear_filter(bear_info):
+            return bool({language.lower()
+                         for language in bear_info.languages} &
+                        wanted_languages)
+
     local_bears, global_bears = get_all_bears(arg_parser=arg_parser,
-                                              silent=silent)
+                                              silent=silent,
+                                              bear_filter=bear_filter)
     if languages:
         local_bears = filter_section_bears_by_languages(
             local_bears, languages)
@@ -0,0 +1,100 @@
+import io
+import os
+import pickle
+import sys
+import unittest
+
+from coalib.bearlib.abstractions.LinterDaemon import (
+    LinterDaemon, read_message, write_message)
+
+
+def get_testfile_name(name):
+    return os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                        'linter_test_files',
+                        name)
+
+
+class MessageTest(unittest.TestCase):
+
+    def test_roundtrip(self):
+        stream = io.BytesIO()
+        write_message(stream, {'stdout': 'ä\n', 'code': 1})
+        write_message(stream, {})
+        stream.seek(0)
+
+        self.assertEqual(read_message(stream), {'stdout': 'ä\n', 'code': 1})
+        self.assertEqual(read_message(stream), {})
+        self.assertIsNone(read_message(stream))
+
+    def test_truncated(self):
+        self.assertIsNone(read_message(io.BytesIO(
+            b'Content-Length: 10\r\n\r\n{}')))
+
+    def test_missing_header(self):
+        with self.assertRaisesRegex(ValueError, 'Content-Length'):
+            read_message(io.BytesIO(b'Other: 1\r\n\r\n{}'))
+
+
+class LinterDaemonTest(unittest.TestCase):
+
+    def setUp(self):
+        self.daemon = LinterDaemon(
+            (sys.executable, get_testfile_name('test_linter_daemon.py')),
+            timeout=5)
+        self.testfile_path = get_testfile_name('test_file.txt')
+
+    def tearDown(self):
+        self.daemon.stop()
+
+    def test_run(self):
+        self.assertFalse(self.daemon.running)
+
+        result = self.daemon.run(['--use_stdin'], stdin='a\n+\n')
+        self.assertEqual(result.code, 0)
+        self.assertEqual(result[0],
+                         "L1C1-L1C2: Invalid char ('a') | MAJOR SEVERITY\n")
+        self.assertTrue(self.daemon.running)
+        pid = result[1]
+
+        result = self.daemon.run([self.testfile_path])
+        self.assertEqual(result[1], pid)
+        self.assertIn('Invalid char', result[0])
+
+        self.daemon.stop()
+        self.assertFalse(self.daemon.running)
+        self.assertNotEqual(self.daemon.run([self.testfile_path])[1], pid)
+
+    def test_cwd(self):
+        result = self.daemon.run([os.path.basename(self.testfile_path)],
+                                 cwd=os.path.dirname(self.testfile_path))
+        self.assertIn('Invalid char', result[0])
+
+    def test_crash(self):
+        pid = self.daemon.run(['--use_stdin'], stdin='')[1]
+
+        with self.assertLogs(level='DEBUG') as cm:
+            with self.assertRaisesRegex(OSError, 'crashed'):
+                self.daemon.run(['--crash'])
+        self.assertRegex(cm.output[0], 'crashed, restarting')
+        self.assertFalse(self.daemon.running)
+
+        # The daemon is restarted on the next request.
+        self.assertNotEqual(self.daemon.run(['--use_stdin'], stdin='')[1],
+                            pid)
+
+    def test_timeout(self):
+        self.daemon.timeout = 0.5
+        with self.assertRaisesRegex(TimeoutError, 'did not respond'):
+            self.daemon.run(['--sleep'])
+        self.assertFalse(self.daemon.running)
+
+        self.daemon.timeout = 5
+        self.assertEqual(self.daemon.run(['--use_stdin'], stdin='+').code, 0)
+
+    def test_pickle(self):
+        self.daemon.run(['--use_stdin'], stdin='')
+        daemon = pickle.loads(pickle.dumps(self.daemon))
+        self.assertEqual(daemon.command, self.daemon.command)
+        self.assertEqual(daemon.timeout, 5)
+        self.assertFalse(daemon.running)
+        self.assertTrue(self.daemon.running)
@@ -12,6 +12,7 @@ from coalib.results.Result import Result
 from coalib.results.RESULT_SEVERITY import RESULT_SEVERITY
 from coalib.results.SourceRange import SourceRange
 from coalib.settings.Section import Section
+from coalib.settings.Setting import Setting
 
 WINDOWS = platform.system() == 'Windows'
 
@@ -164,6 +165,62 @@ class LinterDecoratorTest(LinterTestBase):
             (linter('some-executable', output_format='regex', output_regex='')
              (self.ManualProcessingTestLinter))
 
+        with self.assertRaisesRegex(ValueError,
+                                    'Invalid value for `batch_size`: 0'):
+            linter('some-executable', batch_size=0)(self.EmptyTestLinter)
+
+        with self.assertRaisesRegex(ValueError,
+                                    "'batch_size' can't be used together "
+                                    "with 'global_bear' or 'use_stdin'."):
+            linter('some-executable',
+                   batch_size=10,
+                   use_stdin=True,
+                   output_format='regex',
+                   output_regex='(?P<filename>.*)')(self.EmptyTestLinter)
+
+        with self.assertRaisesRegex(ValueError,
+                                    "'batch_size' needs output-format 'regex' "
+                                    'with the named group `filename` in '
+                                    '`output_regex`.'):
+            linter('some-executable',
+                   batch_size=10,
+                   output_format='regex',
+                   output_regex='(?P<line>.*)')(self.EmptyTestLinter)
+
+        with self.assertRaisesRegex(ValueError,
+                                    "'batch_size' needs output-format"):
+            linter('some-executable',
+                   batch_size=10)(self.ManualProcessingTestLinter)
+
+        with self.assertRaisesRegex(ValueError,
+                                    'Invalid keyword arguments provided: '
+                                    "'daemon_arguments', 'daemon_timeout'"):
+            linter('some-executable',
+                   daemon_arguments=('--daemon',),
+                   daemon_timeout=5)(self.EmptyTestLinter)
+
+        with self.assertRaisesRegex(TypeError, self.PARAM_TYPE_ERROR_RE):
+            linter('some-executable',
+                   use_daemon=True,
+                   daemon_arguments='--daemon')(self.EmptyTestLinter)
+
+        with self.assertRaisesRegex(TypeError, self.PARAM_TYPE_ERROR_RE):
+            linter('some-executable',
+                   use_daemon=True,
+                   daemon_timeout='5')(self.EmptyTestLinter)
+
+        for timeout in (0, -2.5):
+            with self.assertRaisesRegex(ValueError,
+                                        'Invalid value for `daemon_timeout`'):
+                linter('some-executable',
+                       use_daemon=True,
+                       daemon_timeout=timeout)(self.EmptyTestLinter)
+
+        uut = linter(sys.executable,
+                     use_daemon=True,
+                     daemon_timeout=2.5)(self.ManualProcessingTestLinter)
+        self.assertEqual(uut(self.section, None)._get_daemon().timeout, 2.5)
+
     def test_decorator_generated_default_interface(self):
         uut = linter('some-executable')(self.ManualProcessingTestLinter)
         with self.assertRaisesRegex(NotImplementedError, ''):
@@ -1374,6 +1431,156 @@ class LocalLinterReallifeTest(unittest.TestCase):
         generate_config_mock.assert_called_once_with(
             self.testfile2_path, self.testfile2_content, 124)
 
+    def test_batch(self):
+        create_arguments_mock = Mock()
+        unknown_file = get_testfile_name('unknown_file.txt')
+
+        class Handler:
+
+            @staticmethod
+            def create_arguments(filenames, files, config_file):
+                create_arguments_mock(filenames, files, config_file)
+                return (('-c', 'import sys\n'
+                               'for name in sys.argv[1:]:\n'
+                               '    print(name + ":1: Found")') +
+                        filenames + (unknown_file,))
+
+        uut = (linter(sys.executable,
+                      batch_size=10,
+                      output_format='regex',
+                      output_regex=r'(?P<filename>.+):(?P<line>\d+): '
+                                   r'(?P<message>.*)')
+               (Handler)
+               (self.section, None))
+        self.assertEqual(uut.BATCH_SIZE, 10)
+        self.assertEqual(uut.get_metadata().non_optional_params, {})
+
+        uut.prepare_batch([self.testfile_path, self.testfile2_path],
+                          [self.testfile_content, self.testfile2_content])
+        create_arguments_mock.assert_called_once_with(
+            (self.testfile_path, self.testfile2_path),
+            (self.testfile_content, self.testfile2_content),
+            None)
+
+        # Results of unknown files are dropped.
+        self.assertEqual(
+            list(uut.run(self.testfile_path, self.testfile_content)),
+            [Result.from_values(uut, 'Found', self.testfile_path, 1)])
+        self.assertEqual(
+            list(uut.run(self.testfile2_path, self.testfile2_content)),
+            [Result.from_values(uut, 'Found', self.testfile2_path, 1)])
+        self.assertEqual(create_arguments_mock.call_count, 1)
+
+        # Files without prepared results are linted on their own.
+        self.assertEqual(
+            list(uut.run(self.testfile2_path, self.testfile2_content)),
+            [Result.from_values(uut, 'Found', self.testfile2_path, 1)])
+        create_arguments_mock.assert_called_with(
+            (self.testfile2_path,), (self.testfile2_content,), None)
+
+        # Results of files which were never run on don't outlive the next
+        # batch.
+        uut.prepare_batch([self.testfile_path, self.testfile2_path],
+                          [self.testfile_content, self.testfile2_content])
+        uut.prepare_batch([self.testfile2_path], [self.testfile2_content])
+        self.assertEqual(list(uut._batch_results), [self.testfile2_path])
+
+    def test_batch_results_without_file(self):
+        class Handler:
+
+            @staticmethod
+            def create_arguments(filenames, files, config_file):
+                return ('-c', 'print("1: Found")')
+
+        uut = (linter(sys.executable,
+                      batch_size=10,
+                      output_format='regex',
+                      output_regex=r'(?:(?P<filename>.+):)?(?P<line>\d+): '
+                                   r'(?P<message>.*)')
+               (Handler)
+               (self.section, None))
+
+        with self.assertLogs(level='WARNING') as cm:
+            uut.prepare_batch([self.testfile_path, self.testfile2_path],
+                              [self.testfile_content, self.testfile2_content])
+        self.assertIn('Dropping result not belonging to any linted file: '
+                      'Found', '\n'.join(cm.output))
+        self.assertEqual(list(uut.run(self.testfile_path,
+                                      self.testfile_content)), [])
+        self.assertEqual(list(uut.run(self.testfile2_path,
+                                      self.testfile2_content)), [])
+
+    def test_batch_relative_filenames(self):
+        class Handler:
+
+            @staticmethod
+            def create_arguments(filenames, files, config_file):
+                return ('-c', 'import os, sys\n'
+                              'for name in sys.argv[1:]:\n'
+                              '    print(os.path.relpath(name) + ":1: Found")'
+                        ) + filenames
+
+        # The executable runs in the config directory, not in the current
+        # directory of coala.
+        self.section.append(Setting('project_dir',
+                                    get_testfile_name('')))
+        self.assertNotEqual(os.getcwd(), self.section['project_dir'].value)
+
+        uut = (linter(sys.executable,
+                      batch_size=10,
+                      output_format='regex',
+                      output_regex=r'(?P<filename>.+):(?P<line>\d+): '
+                                   r'(?P<message>.*)')
+               (Handler)
+               (self.section, None))
+
+        uut.prepare_batch([self.testfile_path, self.testfile2_path],
+                          [self.testfile_content, self.testfile2_content])
+        self.assertEqual(
+            list(uut.run(self.testfile_path, self.testfile_content)),
+            [Result.from_values(uut, 'Found', self.testfile_path, 1)])
+        self.assertEqual(
+            list(uut.run(self.testfile2_path, self.testfile2_content)),
+            [Result.from_values(uut, 'Found', self.testfile2_path, 1)])
+
+    def test_daemon(self):
+        class Handler:
+
+            @staticmethod
+            def create_arguments(filename, file, config_file):
+                return '--use_stdin', filename
+
+        uut = (linter(sys.executable,
+                      use_stdin=True,
+                      use_daemon=True,
+                      daemon_arguments=(
+                          get_testfile_name('test_linter_daemon.py'),),
+                      daemon_timeout=10,
+                      output_format='regex',
+                      output_regex=self.test_program_regex,
+                      severity_map=self.test_program_severity_map)
+               (Handler)
+               (self.section, None))
+
+        results = list(uut.run(self.testfile_path, self.testfile_content))
+        self.assertEqual(
+            [result.message for result in results],
+            ["Invalid char ('0')", "Invalid char ('.')", "Invalid char ('p')"])
+
+        daemon = uut._get_daemon()
+        self.addCleanup(daemon.stop)
+        self.assertTrue(daemon.running)
+        self.assertEqual(daemon.timeout, 10)
+        self.assertEqual(daemon.command,
+                         (sys.executable,
+                          get_testfile_name('test_linter_daemon.py')))
+
+        # The daemon is reused for further runs.
+        results = list(uut.run(self.testfile2_path, self.testfile2_content))
+        self.assertEqual([result.message for result in results],
+                         ["Invalid char ('X')", "Invalid char ('i')"])
+        self.assertIs(uut._get_daemon(), daemon)
+
     def test_capture_groups_warnings(self):
         logger = logging.getLogger()
         with self.assertLogs(logger, 'WARNING') as cm:
@@ -0,0 +1,88 @@
+# This little program is the daemon version of ``test_linter.py``. It reads
+# requests from stdin and writes responses to stdout, both framed like in
+# ``coalib.bearlib.abstractions.LinterDaemon``.
+#
+# Invocation
+# ==========
+#
+# python3 test_linter_daemon.py
+#
+# Requests
+# ========
+#
+# The arguments of a request are the ones of ``test_linter.py`` without
+# ``--config``. Additionally, these arguments are supported:
+#
+# --crash       Exit without responding.
+# --sleep       Sleep for a minute before responding.
+#
+# The stderr of each response contains the process id of the daemon.
+
+import json
+import os
+import sys
+import time
+
+
+def read_message(stream):
+    length = None
+    while True:
+        line = stream.readline()
+        if not line:
+            return None
+
+        line = line.strip()
+        if not line:
+            break
+
+        name, _, value = line.decode('ascii').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+
+    return json.loads(stream.read(length).decode('utf-8'))
+
+
+def write_message(stream, message):
+    body = json.dumps(message).encode('utf-8')
+    stream.write('Content-Length: {}\r\n\r\n'.format(len(body)).encode('ascii')
+                 + body)
+    stream.flush()
+
+
+def lint(arguments, stdin, cwd):
+    if '--crash' in arguments:
+        sys.exit(1)
+    if '--sleep' in arguments:
+        time.sleep(60)
+
+    if '--use_stdin' in arguments:
+        content = stdin
+    else:
+        with open(os.path.join(cwd or '', arguments[-1]), mode='r') as fl:
+            content = fl.read()
+
+    output = []
+    for i, line in enumerate(content.splitlines()):
+        if line[0] not in ('+', '-', '*', '/'):
+            if '--correct' not in arguments:
+                output.append("L{}C{}-L{}C{}: Invalid char ('{}') | "
+                              'MAJOR SEVERITY\n'.format(i + 1, 1, i + 1, 2,
+                                                        line[0]))
+        elif '--correct' in arguments:
+            output.append(line + '\n')
+
+    return ''.join(output)
+
+
+if __name__ == '__main__':
+    while True:
+        request = read_message(sys.stdin.buffer)
+        if request is None:
+            break
+
+        output = lint(request['arguments'], request['stdin'], request['cwd'])
+        if '--use_stderr' in request['arguments']:
+            response = {'stdout': '', 'stderr': output}
+        else:
+            response = {'stdout': output, 'stderr': str(os.getpid())}
+        write_message(sys.stdout.buffer, response)
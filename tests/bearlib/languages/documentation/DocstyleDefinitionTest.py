@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 from unittest.mock import patch
 
@@ -138,6 +140,27 @@ class DocstyleDefinitionTest(unittest.TestCase):
 
         self.assertEqual(result.metadata, self.dummy_metadata)
 
+    def test_load_cached(self):
+        self.assertIs(DocstyleDefinition.load('python3', 'default'),
+                      DocstyleDefinition.load('PYTHON3', 'DEFAULT'))
+
+        with tempfile.TemporaryDirectory() as coalang_dir:
+            coalang_file = os.path.join(coalang_dir, 'custom.coalang')
+            with open(coalang_file, 'w') as fl:
+                fl.write('[x]\ndoc-marker = /**, *, */\n')
+
+            result = DocstyleDefinition.load('x', 'custom', coalang_dir)
+            self.assertEqual(result.markers, (('/**', '*', '*/'),))
+            self.assertIs(DocstyleDefinition.load('x', 'custom', coalang_dir),
+                          result)
+
+            # Changed definition files are parsed again.
+            with open(coalang_file, 'w') as fl:
+                fl.write('[x]\ndoc-marker = ///, ///, ///\n')
+            os.utime(coalang_file, ns=(0, 0))
+            result = DocstyleDefinition.load('x', 'custom', coalang_dir)
+            self.assertEqual(result.markers, (('///', '///', '///'),))
+
     def test_get_available_definitions(self):
         # Test if the basic supported docstyle-language pairs exist.
         expected = {('default', 'python'),
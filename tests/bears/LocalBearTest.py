@@ -12,6 +12,8 @@ class LocalBearTest(unittest.TestCase):
                           test_object.run,
                           'filename',
                           ['file\n'])
+        self.assertEqual(test_object.BATCH_SIZE, 1)
+        test_object.prepare_batch(['filename'], [['file\n']])
 
     def test_kind(self):
         self.assertEqual(LocalBear.kind(), BEAR_KIND.LOCAL)
@@ -58,6 +58,48 @@ class coalaJSONTest(unittest.TestCase):
                                     'results found')
                 self.assertFalse(stderr)
 
+    def test_json_lines(self):
+        with bear_test_module():
+            with prepare_file(['#fixme'], None) as (lines, filename):
+                retval, stdout, stderr = execute_coala(coala.main, 'coala',
+                                                       '--json-lines', '-c',
+                                                       os.devnull, '-b',
+                                                       'LineCountTestBear',
+                                                       '-f', filename)
+                output = [json.loads(line) for line in stdout.splitlines()]
+                self.assertEqual(len(output), 1)
+                self.assertEqual(output[0]['section'], 'cli')
+                self.assertEqual(output[0]['result']['origin'],
+                                 'LineCountTestBear')
+                self.assertEqual(output[0]['result']['message'],
+                                 'This file has 1 lines.')
+                self.assertNotEqual(retval, 0,
+                                    'coala must return nonzero when results '
+                                    'found')
+                self.assertFalse(stderr)
+
+    def test_json_lines_output_file(self):
+        with bear_test_module():
+            with prepare_file(['#fixme'], None) as (lines, filename):
+                retval, stdout, stderr = execute_coala(coala.main, 'coala',
+                                                       '--json-lines', '-c',
+                                                       os.devnull, '-b',
+                                                       'LineCountTestBear',
+                                                       '-f', filename,
+                                                       '--log-json',
+                                                       '-o', 'file.jsonl')
+        with open('file.jsonl') as fp:
+            output = [json.loads(line) for line in fp]
+        os.remove('file.jsonl')
+
+        self.assertFalse(stdout)
+        self.assertFalse(stderr)
+        results = [line['result'] for line in output if 'result' in line]
+        self.assertEqual([result['message'] for result in results],
+                         ['This file has 1 lines.'])
+        self.assertTrue(all('level' in line
+                            for line in output if 'result' not in line))
+
     def test_fail_acquire_settings(self):
         with bear_test_module():
             retval, stdout, stderr = execute_coala(coala.main, 'coala',
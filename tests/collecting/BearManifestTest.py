@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+import unittest.mock
+
+from coalib.bearlib.aspects.Metadata import CommitMessage
+from coalib.bears.BEAR_KIND import BEAR_KIND
+from coalib.bears.GlobalBear import GlobalBear
+from coalib.collecting.BearManifest import (
+    BearInfo, BearManifest, get_bear_info)
+from coalib.misc.CachingUtilities import delete_files
+
+
+class AspectsBear(GlobalBear, aspects={
+        'detect': [CommitMessage.Shortlog.ColonExistence],
+        'fix': [CommitMessage.Shortlog.TrailingPeriod]}):
+    LANGUAGES = {'Python', 'C'}
+    CAN_FIX = {'Formatting'}
+
+
+class BearManifestTest(unittest.TestCase):
+
+    def setUp(self):
+        self.identifier = 'bear_manifest_test'
+        self.directory = tempfile.TemporaryDirectory()
+        self.bear_file = os.path.join(self.directory.name, 'SomeBear.py')
+        with open(self.bear_file, 'w') as fl:
+            fl.write('# Bear\n')
+
+        self.info = BearInfo('SomeBear', BEAR_KIND.LOCAL, frozenset(),
+                             frozenset(), frozenset(), frozenset())
+
+    def tearDown(self):
+        delete_files(None, [self.identifier])
+        self.directory.cleanup()
+
+    def test_get_bear_info(self):
+        info = get_bear_info(AspectsBear, BEAR_KIND.GLOBAL)
+
+        self.assertEqual(info.name, 'AspectsBear')
+        self.assertEqual(info.kind, BEAR_KIND.GLOBAL)
+        self.assertEqual(info.languages, {'Python', 'C'})
+        self.assertEqual(info.can_detect, {'Formatting'})
+        self.assertEqual(info.can_fix, {'Formatting'})
+        self.assertEqual(info.aspects, {
+            'Root.Metadata.CommitMessage.Shortlog.ColonExistence',
+            'Root.Metadata.CommitMessage.Shortlog.TrailingPeriod'})
+
+    def test_persistence(self):
+        manifest = BearManifest(self.identifier)
+        manifest.update(self.bear_file, [self.info])
+        self.assertIsNone(BearManifest(self.identifier).get(self.bear_file))
+
+        manifest.save()
+        self.assertFalse(manifest.changed)
+        self.assertEqual(BearManifest(self.identifier).get(self.bear_file),
+                         [self.info])
+
+        with unittest.mock.patch('coalib.collecting.BearManifest.VERSION',
+                                 'other-version'):
+            self.assertIsNone(
+                BearManifest(self.identifier).get(self.bear_file))
+
+    def test_file_changed(self):
+        manifest = BearManifest(self.identifier)
+        manifest.update(self.bear_file, [self.info])
+
+        with open(self.bear_file, 'a') as fl:
+            fl.write('# Changed\n')
+        self.assertIsNone(manifest.get(self.bear_file))
+
+        os.remove(self.bear_file)
+        self.assertIsNone(manifest.get(self.bear_file))
@@ -2,6 +2,7 @@ import logging
 import os
 import pkg_resources
 import unittest
+import unittest.mock
 
 from functools import partial
 from pyprint.ConsolePrinter import ConsolePrinter
@@ -11,12 +12,15 @@ from testfixtures import LogCapture
 from coalib.bearlib.aspects import AspectList, get as get_aspect
 from coalib.bears.BEAR_KIND import BEAR_KIND
 from coalib.bears.Bear import Bear
+from coalib.collecting import Collectors
+from coalib.collecting.BearManifest import BearManifest
 from coalib.collecting.Collectors import (
     collect_all_bears_from_sections, collect_bears, collect_dirs, collect_files,
     collect_registered_bears_dirs, filter_section_bears_by_languages,
     get_all_bears, get_all_bears_names, collect_bears_by_aspects,
     get_all_languages,
     )
+from coalib.misc.CachingUtilities import delete_files
 from coalib.output.printers.LogPrinter import LogPrinter
 from coalib.output.printers.ListLogPrinter import ListLogPrinter
 from coalib.settings.Section import Section
@@ -90,6 +94,20 @@ class CollectFilesTest(unittest.TestCase):
                                            'file2.py')]),
                          [])
 
+    def test_overlapping_globs(self):
+        with LogCapture() as capture:
+            self.assertEqual(
+                collect_files([os.path.join(self.collectors_test_dir,
+                                            'others', '*', '*2.py'),
+                               os.path.join(self.collectors_test_dir,
+                                            '**', 'file2.py')],
+                              self.log_printer),
+                [os.path.normcase(os.path.join(self.collectors_test_dir,
+                                               'others',
+                                               'py_files',
+                                               'file2.py'))])
+        capture.check()
+
     def test_ignored_dirs(self):
         def dir_base(*args):
             return os.path.normcase(os.path.join(self.collectors_test_dir,
@@ -331,6 +349,50 @@ class CollectBearsTest(unittest.TestCase):
                               ['name'], ['kind'],
                               self.log_printer)[0]), 1)
 
+    def test_manifest(self):
+        identifier = 'collectors_test_bear_manifest'
+        delete_files(None, [identifier])
+        self.addCleanup(delete_files, None, [identifier])
+        manifest = BearManifest(identifier)
+        bear_dirs = [os.path.join(self.collectors_test_dir, 'bears')]
+
+        with unittest.mock.patch.object(
+                Collectors, 'get_bear_manifest', return_value=manifest), \
+                unittest.mock.patch.object(
+                    Collectors, '_import_bears',
+                    wraps=Collectors._import_bears) as mock:
+            self.assertEqual(
+                collect_bears(bear_dirs, ['bear1'], ['other_kind'],
+                              warn_if_unused_glob=False),
+                ([],))
+            self.assertEqual(mock.call_count, 1)
+            self.assertEqual(
+                [info.name for info in manifest.get(os.path.join(
+                    self.collectors_test_dir, 'bears', 'bear1.py'))],
+                ['TestBear'])
+
+            # The manifest knows that there are no bears of this kind.
+            mock.reset_mock()
+            self.assertEqual(
+                collect_bears(bear_dirs, ['bear1'], ['other_kind'],
+                              warn_if_unused_glob=False),
+                ([],))
+            self.assertFalse(mock.called)
+
+            self.assertEqual(
+                len(collect_bears(bear_dirs, ['bear1'], ['kind'])[0]), 1)
+            self.assertEqual(mock.call_count, 1)
+
+    def test_bear_filter(self):
+        bear_dirs = [os.path.join(self.collectors_test_dir, 'bears')]
+
+        self.assertEqual(len(collect_bears(
+            bear_dirs, ['bear1'], ['kind'],
+            bear_filter=lambda info: info.name == 'TestBear')[0]), 1)
+        self.assertEqual(len(collect_bears(
+            bear_dirs, ['bear1'], ['kind'], warn_if_unused_glob=False,
+            bear_filter=lambda info: info.name == 'OtherBear')[0]), 0)
+
     def test_all_bears_from_sections(self):
         test_section = Section('test_section')
         test_section.bear_dirs = lambda: os.path.join(self.collectors_test_dir,
@@ -0,0 +1,67 @@
+import os
+import unittest
+
+from coalib.core.BearRegistry import (
+    BearRegistry, execute_registered_task, get_registered_bear)
+from coalib.settings.Section import Section
+
+from tests.core.CoreTestBase import CoreTestBase
+from tests.core.CoreTest import CustomTasksBear
+
+
+class PickleCountingBear(CustomTasksBear):
+    pickle_count = 0
+
+    def __getstate__(self):
+        type(self).pickle_count += 1
+        return self.__dict__
+
+
+class BearRegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = BearRegistry()
+        self.addCleanup(self.registry.close)
+
+    def test_register(self):
+        bear1 = CustomTasksBear(Section('section1'), {'f': ['1']})
+        bear2 = CustomTasksBear(Section('section2'), {})
+
+        handle1 = self.registry.register(bear1)
+        handle2 = self.registry.register(bear2)
+        self.assertNotEqual(handle1, handle2)
+        self.assertEqual(self.registry.register(bear1), handle1)
+
+        self.assertEqual(get_registered_bear(handle1).file_dict, {'f': ['1']})
+        self.assertEqual(get_registered_bear(handle2).section.name,
+                         'section2')
+        self.assertEqual(execute_registered_task(handle1, (1, 2), {}),
+                         [1, 2])
+
+    def test_close(self):
+        self.assertIsNone(self.registry.directory)
+
+        handle = self.registry.register(
+            CustomTasksBear(Section('section'), {}))
+        get_registered_bear(handle)
+        directory = self.registry.directory
+        self.assertTrue(os.path.isdir(directory))
+
+        self.registry.close()
+        self.assertFalse(os.path.exists(directory))
+        self.assertEqual(self.registry.handles, {})
+        with self.assertRaises(OSError):
+            get_registered_bear(handle)
+
+
+class BearRegistryCoreTest(CoreTestBase):
+
+    def test_bear_pickled_once(self):
+        PickleCountingBear.pickle_count = 0
+        bear = PickleCountingBear(Section('section'), {},
+                                  tasks=[(i,) for i in range(20)])
+
+        results = self.execute_run({bear})
+
+        self.assertEqual(sorted(results), list(range(20)))
+        self.assertEqual(PickleCountingBear.pickle_count, 1)
@@ -1,9 +1,14 @@
 import datetime
+import importlib.util
 from itertools import permutations
 from os.path import abspath, exists, isfile, join, getmtime
 import shutil
+import tempfile
 import unittest
+import unittest.mock
 
+from dependency_management.requirements.ExecutableRequirement import (
+    ExecutableRequirement)
 from dependency_management.requirements.PipRequirement import PipRequirement
 
 from freezegun import freeze_time
@@ -277,3 +282,58 @@ class BearTest(unittest.TestCase):
 
         self.assertEqual(BearWithDependencies.BEAR_DEPS, {Bear1})
         self.assertEqual(uut.BEAR_DEPS, {Bear1, Bear2})
+
+
+class BearVersionFingerprintTest(unittest.TestCase):
+
+    def get_fingerprint(self, directory, source):
+        path = join(directory, 'VersionedBear.py')
+        with open(path, 'w') as fl:
+            fl.write('from coalib.core.Bear import Bear\n'
+                     '\n'
+                     'class VersionedBear(Bear):\n' + source)
+
+        spec = importlib.util.spec_from_file_location('VersionedBear', path)
+        module = importlib.util.module_from_spec(spec)
+        with unittest.mock.patch.dict('sys.modules', VersionedBear=module):
+            spec.loader.exec_module(module)
+            return module.VersionedBear.version_fingerprint
+
+    def test_source_changed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            fingerprint1 = self.get_fingerprint(directory, '    pass\n')
+            fingerprint2 = self.get_fingerprint(directory, '    pass\n')
+            fingerprint3 = self.get_fingerprint(directory, '    X = 1\n')
+
+            self.assertEqual(fingerprint1, fingerprint2)
+            self.assertNotEqual(fingerprint1, fingerprint3)
+
+    def test_subclass(self):
+        class SubBear(Bear1):
+            pass
+
+        self.assertNotEqual(Bear1.version_fingerprint,
+                            Bear.version_fingerprint)
+        self.assertEqual(SubBear.version_fingerprint,
+                         Bear1.version_fingerprint)
+        self.assertNotIn('_version_fingerprint', Bear2.__dict__)
+
+    def test_requirements(self):
+        class PipBear(Bear):
+            REQUIREMENTS = {PipRequirement('pip')}
+
+        class ExecutableBear(Bear):
+            REQUIREMENTS = {ExecutableRequirement('python3')}
+
+        fingerprints = {Bear.version_fingerprint,
+                        PipBear.version_fingerprint,
+                        ExecutableBear.version_fingerprint}
+        self.assertEqual(len(fingerprints), 3)
+
+        class UpgradedPipBear(Bear):
+            REQUIREMENTS = {PipRequirement('pip')}
+
+        with unittest.mock.patch('pkg_resources.get_distribution') as mock:
+            mock.return_value.version = '0.0.1'
+            self.assertNotEqual(UpgradedPipBear.version_fingerprint,
+                                PipBear.version_fingerprint)
@@ -1,12 +1,15 @@
+import asyncio
 from concurrent.futures import ThreadPoolExecutor
 import logging
 import sys
+import threading
+import time
 import unittest
 import unittest.mock
 
 from coalib.settings.Section import Section
 from coalib.core.Bear import Bear
-from coalib.core.Core import initialize_dependencies, run
+from coalib.core.Core import initialize_dependencies, run, Session
 
 from coala_utils.decorators import generate_eq
 
@@ -137,6 +140,17 @@ class DynamicTaskBear(TestBearBase):
         return (((i,), {}) for i in range(tasks_count))
 
 
+class CommandBear(CustomTasksBear):
+
+    def create_command(self, text):
+        return ((sys.executable, '-c',
+                 'import sys; print(sys.stdin.read().upper())'),
+                text)
+
+    def process_command_output(self, output, text):
+        return [output[0].strip()]
+
+
 # Define those classes at module level to make them picklable.
 for i in range(100):
     classname = 'NoTasksBear{}'.format(i)
@@ -908,6 +922,42 @@ class CoreCacheTest(CoreTestBase):
             self.assertIn(CustomTasksBear, cache)
             self.assertEqual(len(next(iter(cache.values()))), 2)
 
+    def test_cache_batched_lookup(self):
+        class BatchedTable(dict):
+            get_many_calls = []
+
+            def get_many(self, fingerprints):
+                fingerprints = list(fingerprints)
+                self.get_many_calls.append(len(fingerprints))
+                return {fingerprint: self[fingerprint]
+                        for fingerprint in fingerprints if fingerprint in self}
+
+        section = Section('test-section')
+        cache = {CustomTasksBear: BatchedTable()}
+        bear = CustomTasksBear(section, {}, tasks=[(i,) for i in range(10)])
+
+        self.assertEqual(sorted(self.execute_run({bear}, cache)),
+                         list(range(10)))
+        self.assertEqual(len(cache[CustomTasksBear]), 10)
+
+        bear = CustomTasksBear(section, {}, tasks=[(i,) for i in range(15)])
+        with unittest.mock.patch.object(bear, 'analyze',
+                                        wraps=bear.analyze) as mock:
+            self.assertEqual(sorted(self.execute_run({bear}, cache)),
+                             list(range(15)))
+            self.assertEqual(mock.call_count, 5)
+
+        self.assertEqual(BatchedTable.get_many_calls, [10, 15])
+        self.assertEqual(len(cache[CustomTasksBear]), 15)
+
+    def test_cache_failing_task(self):
+        cache = {}
+        bear = FailingBear(Section('test-section'), {})
+
+        with self.assertLogs(logging.getLogger()):
+            self.assertEqual(self.execute_run({bear}, cache), [])
+        self.assertEqual(len(cache[FailingBear]), 0)
+
     def test_existing_cache_with_unrelated_data(self):
         section = Section('test-section')
         filedict = {}
@@ -933,3 +983,238 @@ class CoreCacheTest(CoreTestBase):
             # The unrelated data is left untouched.
             self.assertIn(b'123456', cache_values)
             self.assertEqual(cache_values[b'123456'], [100, 101, 102])
+
+
+class CoreCommandTest(CoreTestBase):
+
+    def setUp(self):
+        self.executor = ThreadPoolExecutor, tuple(), dict(max_workers=1)
+        self.bear = CommandBear(Section('test-section'), {},
+                                tasks=[('a',), ('b',), ('c',)])
+
+    def test_run(self):
+        with unittest.mock.patch.object(self.bear, 'execute_task') as mock:
+            results = self.execute_run({self.bear})
+
+        self.assertFalse(mock.called)
+        self.assertEqual(sorted(results), ['A', 'B', 'C'])
+
+    def test_run_cache(self):
+        cache = {}
+        self.assertEqual(sorted(self.execute_run({self.bear}, cache)),
+                         ['A', 'B', 'C'])
+        self.assertEqual(len(cache[CommandBear]), 3)
+
+        with unittest.mock.patch.object(self.bear, 'create_command') as mock:
+            results = self.execute_run({self.bear}, cache)
+
+        self.assertFalse(mock.called)
+        self.assertEqual(sorted(results), ['A', 'B', 'C'])
+
+    def test_child_watcher(self):
+        watcher = asyncio.get_child_watcher()
+        with unittest.mock.patch.object(watcher, 'attach_loop',
+                                        wraps=watcher.attach_loop) as mock:
+            results = self.execute_run({self.bear})
+
+        self.assertEqual(sorted(results), ['A', 'B', 'C'])
+        self.assertEqual(len(mock.call_args_list), 2)
+        self.assertIsNotNone(mock.call_args_list[0][0][0])
+        # The watcher is detached before the event loop is closed.
+        mock.assert_called_with(None)
+
+    def test_child_watcher_without_commands(self):
+        bear = CustomTasksBear(Section('test-section'), {}, tasks=[(1,)])
+        watcher = asyncio.get_child_watcher()
+        with unittest.mock.patch.object(watcher, 'attach_loop') as mock:
+            self.assertEqual(self.execute_run({bear}), [1])
+
+        self.assertFalse(mock.called)
+
+    def test_run_in_thread(self):
+        # Without the child watcher, programs are run in a thread-pool.
+        results = []
+        thread = threading.Thread(
+            target=lambda: results.extend(self.execute_run({self.bear})))
+        thread.start()
+        thread.join()
+
+        self.assertEqual(sorted(results), ['A', 'B', 'C'])
+
+    def test_max_subprocesses(self):
+        running = []
+        max_running = []
+
+        @asyncio.coroutine
+        def run_shell_command_async(command, stdin, loop, cwd):
+            running.append(stdin)
+            max_running.append(len(running))
+            yield from asyncio.sleep(0.01, loop=loop)
+            running.remove(stdin)
+            return stdin, ''
+
+        results = []
+        with unittest.mock.patch('coalib.core.Core.run_shell_command_async',
+                                 run_shell_command_async):
+            run({self.bear}, results.append, max_subprocesses=2)
+
+        self.assertEqual(sorted(results), ['a', 'b', 'c'])
+        self.assertEqual(max(max_running), 2)
+
+    def test_process_command_output_exception(self):
+        with unittest.mock.patch.object(self.bear, 'process_command_output',
+                                        side_effect=ValueError):
+            with self.assertLogs(logging.getLogger()) as cm:
+                results = self.execute_run({self.bear})
+
+        self.assertEqual(results, [])
+        self.assertEqual(len(cm.output), 3)
+        self.assertRegex(cm.output[0],
+                         'An exception was thrown during bear execution.')
+
+
+class PriorityTestBear(Bear):
+    executed = []
+    task_count = 2
+
+    def analyze(self, number):
+        self.executed.append((self.name, number))
+        return [number]
+
+    def generate_tasks(self):
+        return (((number,), {}) for number in range(self.task_count))
+
+
+class ParserBear(PriorityTestBear):
+    pass
+
+
+class AnalysisBear(PriorityTestBear):
+    BEAR_DEPS = {ParserBear}
+
+
+class IndependentBear(PriorityTestBear):
+    task_count = 3
+
+
+class CorePriorityTest(CoreTestBase):
+
+    def setUp(self):
+        PriorityTestBear.executed.clear()
+        section = Section('test-section')
+        self.bears = {AnalysisBear(section, {}), IndependentBear(section, {})}
+
+    def execute_priority_run(self, bear_times=None):
+        results = []
+        run(self.bears, results.append,
+            executor=ThreadPoolExecutor(max_workers=1),
+            bear_times=bear_times)
+        self.assertEqual(sorted(results), [0, 0, 1, 1, 2])
+        return PriorityTestBear.executed
+
+    def test_dependency_chain_first(self):
+        self.assertEqual(self.execute_priority_run()[:2],
+                         [('ParserBear', 0), ('ParserBear', 1)])
+
+    def test_bear_times(self):
+        bear_times = {ParserBear: 1.0, AnalysisBear: 5.0,
+                      IndependentBear: 0.1}
+
+        executed = self.execute_priority_run(bear_times)
+
+        # The tasks of AnalysisBear overtake the ones of IndependentBear that
+        # are still waiting when ParserBear finishes.
+        self.assertEqual(executed, [('ParserBear', 0),
+                                    ('ParserBear', 1),
+                                    ('IndependentBear', 0),
+                                    ('AnalysisBear', 0),
+                                    ('AnalysisBear', 1),
+                                    ('IndependentBear', 1),
+                                    ('IndependentBear', 2)])
+        self.assertEqual(set(bear_times),
+                         {ParserBear, AnalysisBear, IndependentBear})
+        self.assertLess(bear_times[AnalysisBear], 1.0)
+
+
+class EventSettingBear(CustomTasksBear):
+    last_task_executed = threading.Event()
+
+    def analyze(self, number):
+        if number == len(self.tasks) - 1:
+            self.last_task_executed.set()
+        return [number]
+
+
+class CoreResultDeliveryTest(CoreTestBase):
+
+    def setUp(self):
+        EventSettingBear.last_task_executed.clear()
+        self.bear = EventSettingBear(Section('test-section'), {},
+                                     tasks=[(x,) for x in range(5)])
+
+    def test_slow_result_callback(self):
+        waited = []
+
+        def on_result(result):
+            # Blocks until all tasks were executed, which only happens if the
+            # scheduler doesn't wait for the callback.
+            waited.append(EventSettingBear.last_task_executed.wait(10))
+
+        run({self.bear}, on_result,
+            executor=ThreadPoolExecutor(max_workers=1))
+
+        self.assertEqual(waited, [True] * 5)
+
+    def test_max_queued_results(self):
+        results = []
+
+        def on_result(result):
+            time.sleep(0.01)
+            results.append(result)
+
+        run({self.bear}, on_result,
+            executor=ThreadPoolExecutor(max_workers=1),
+            max_queued_results=1)
+
+        self.assertEqual(results, list(range(5)))
+
+    def test_full_result_queue_doesnt_block_event_loop(self):
+        results = []
+        pending_results = []
+
+        def on_result(result):
+            if not results:
+                # Results of all tasks are processed by the event loop while
+                # the callback is stuck, although they don't fit into the
+                # result queue.
+                deadline = time.monotonic() + 10
+                while (session.result_queue.qsize() +
+                       len(session.overflowing_results) < 4 and
+                       time.monotonic() < deadline):
+                    time.sleep(0.01)
+                pending_results.append(session.result_queue.qsize() +
+                                       len(session.overflowing_results))
+            results.append(result)
+
+        session = Session({self.bear}, on_result,
+                          executor=ThreadPoolExecutor(max_workers=5),
+                          max_queued_results=1)
+        session.run()
+
+        self.assertEqual(pending_results, [4])
+        self.assertEqual(sorted(results), list(range(5)))
+        self.assertFalse(session.overflowing_results)
+        self.assertFalse(session.delivery_thread.is_alive())
+
+    def test_put_result_without_delivery_thread(self):
+        session = Session({self.bear}, lambda result: None,
+                          executor=ThreadPoolExecutor(max_workers=1),
+                          max_queued_results=1)
+        session.delivery_thread = threading.Thread(target=lambda: None)
+        session.delivery_thread.start()
+        session.delivery_thread.join()
+
+        self.assertTrue(session._put_result(1))
+        # Doesn't wait forever for free space in the full queue.
+        self.assertFalse(session._put_result(2))
+        session.executor.shutdown()
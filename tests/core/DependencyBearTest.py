@@ -1,6 +1,9 @@
 from concurrent.futures import ThreadPoolExecutor
+import logging
+import threading
 from unittest.mock import ANY, patch
 
+from coalib.core.Bear import Bear
 from coalib.core.DependencyBear import DependencyBear
 from coalib.core.FileBear import FileBear
 from coalib.core.ProjectBear import ProjectBear
@@ -44,6 +47,46 @@ class TestBearDependentOnMultipleBears(DependencyBear):
             dependency_bear.name, a_number, dependency_result)
 
 
+class TestPipelinedBearDependentOnFileBear(TestBearDependentOnFileBear):
+    PIPELINED = True
+
+
+class TestBearWaitingForDependant(Bear):
+    dependant_started = threading.Event()
+
+    def analyze(self, number):
+        if number == 1:
+            # Raises if the dependant doesn't start before this task finishes.
+            assert self.dependant_started.wait(timeout=10)
+        return [number]
+
+    def generate_tasks(self):
+        return (((number,), {}) for number in range(2))
+
+
+class TestFailingBearWaitingForDependant(TestBearWaitingForDependant):
+
+    def analyze(self, number):
+        super().analyze(number)
+        if number == 1:
+            raise ValueError
+        return [number]
+
+
+class TestPipelinedBearDependentOnWaitingBear(DependencyBear):
+    BEAR_DEPS = {TestBearWaitingForDependant}
+    PIPELINED = True
+
+    def analyze(self, dependency_bear, dependency_result):
+        TestBearWaitingForDependant.dependant_started.set()
+        yield '{} - {}'.format(dependency_bear.name, dependency_result)
+
+
+class TestPipelinedBearDependentOnFailingBear(
+        TestPipelinedBearDependentOnWaitingBear):
+    BEAR_DEPS = {TestFailingBearWaitingForDependant}
+
+
 class DependencyBearTest(CoreTestBase):
 
     def assertResultsEqual(self, bear_type, expected,
@@ -180,6 +223,18 @@ class DependencyBearTest(CoreTestBase):
                       'TestFileBear (500) - fileY:1',
                       'TestFileBear (500) - fileZ:2'])
 
+    def test_pipelined(self):
+        self.assertResultsEqual(
+            TestPipelinedBearDependentOnFileBear,
+            file_dict={'f1': [], 'f2': [1, 2, 3]},
+            expected=['TestFileBear - f1:0',
+                      'TestFileBear - f2:3'])
+
+        self.assertResultsEqual(
+            TestPipelinedBearDependentOnFileBear,
+            file_dict={},
+            expected=[])
+
 
 # Execute the same tests from DependencyBearTest, but use a ThreadPoolExecutor
 # instead. It shall also seamlessly work with Python threads. Also there are
@@ -302,3 +357,22 @@ class DependencyBearOnThreadPoolExecutorTest(DependencyBearTest):
             self.assertIn(TestBearDependentOnFileBear, cache)
             self.assertEqual(len(cache[TestFileBear]), 4)
             self.assertEqual(len(cache[TestBearDependentOnFileBear]), 4)
+
+    def test_pipelined_tasks_overlap(self):
+        TestBearWaitingForDependant.dependant_started.clear()
+
+        self.assertResultsEqual(
+            TestPipelinedBearDependentOnWaitingBear,
+            expected=['TestBearWaitingForDependant - 0',
+                      'TestBearWaitingForDependant - 1'])
+
+    def test_pipelined_dependency_failing(self):
+        TestBearWaitingForDependant.dependant_started.clear()
+
+        with self.assertLogs(logging.getLogger()) as cm:
+            # The results arrived before the failure are still analyzed.
+            self.assertResultsEqual(
+                TestPipelinedBearDependentOnFailingBear,
+                expected=['TestFailingBearWaitingForDependant - 0'])
+
+        self.assertIn('ValueError', cm.output[0])
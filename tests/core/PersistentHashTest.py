@@ -1,6 +1,13 @@
+import os
+import subprocess
+import sys
 import unittest
+import unittest.mock
 
-from coalib.core.PersistentHash import persistent_hash
+import coalib
+from coalib.core.PersistentHash import (
+    _update_hash, fingerprint, persistent_hash)
+from coalib.settings.Section import Section
 
 
 class PersistentHashTest(unittest.TestCase):
@@ -48,3 +55,50 @@ class PersistentHashTest(unittest.TestCase):
                              {'q': {'g': '1', 'a': '1'}, 'a': {},
                               'g': {'z', 'd'}, 'b': '8'})),
             b'\xa9z[U\xfa\xd1x\x95\x00\xf1,h%Y\xa2u\x87\xb0\xb2\x13')
+
+
+class FingerprintTest(unittest.TestCase):
+
+    def test_types(self):
+        objects = [None, True, False, 0, 1, 1.0, '1', b'1', (1,), [1], {1},
+                   frozenset({1}), {1: 1}, ('1', '1'), ('11',), Section('1')]
+        fingerprints = [fingerprint(obj) for obj in objects]
+        self.assertEqual(len(set(fingerprints)), len(objects))
+        self.assertEqual([fingerprint(obj) for obj in objects], fingerprints)
+
+    def test_unordered(self):
+        self.assertEqual(fingerprint({'a': '1', 'g': '9'}),
+                         fingerprint({'g': '9', 'a': '1'}))
+        self.assertEqual(fingerprint((('x',), {'a': {'z', 'c', 'd'}})),
+                         fingerprint((('x',), {'a': {'d', 'c', 'z'}})))
+        self.assertNotEqual(fingerprint({'a': '1', 'g': '9'}),
+                            fingerprint({'a': '9', 'g': '1'}))
+
+    def test_stable_across_runs(self):
+        code = ('from coalib.core.PersistentHash import fingerprint\n'
+                "print(fingerprint(({'a', 'b', 'c'}, {'x': 1, 'y': 2})))")
+        outputs = set()
+        for seed in ('1', '2'):
+            outputs.add(subprocess.check_output(
+                [sys.executable, '-c', code],
+                env=dict(os.environ, PYTHONHASHSEED=seed),
+                cwd=os.path.dirname(os.path.dirname(coalib.__file__))))
+        self.assertEqual(len(outputs), 1)
+
+    def test_memo(self):
+        memo = {}
+        lines = ['line {}\n'.format(i) for i in range(100)]
+        task = (('file.py', lines), {})
+        digest = fingerprint(task, memo)
+        self.assertEqual(digest, fingerprint(task))
+        self.assertEqual(list(memo), [id(lines)])
+
+        with unittest.mock.patch('coalib.core.PersistentHash._update_hash',
+                                 wraps=_update_hash) as mock:
+            self.assertEqual(fingerprint(task, memo), digest)
+            # The lines aren't hashed again.
+            self.assertLess(mock.call_count, 10)
+
+        # Equal but distinct lists have the same fingerprint.
+        self.assertEqual(fingerprint((('file.py', list(lines)), {}), memo),
+                         digest)
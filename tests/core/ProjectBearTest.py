@@ -21,6 +21,12 @@ class TestProjectBearWithParameters(ProjectBear):
                         for filename in sorted(files))
 
 
+class PartitionedProjectBear(TestProjectBear):
+
+    def partition_files(self):
+        return ({filename: file} for filename, file in self.file_dict.items())
+
+
 class ProjectBearTest(CoreTestBase):
 
     def assertResultsEqual(self, bear_type, expected,
@@ -134,6 +140,18 @@ class ProjectBearTest(CoreTestBase):
                       "___fileY:['hello']\n"
                       "___fileZ:['x\\ny']"])
 
+    def test_partitions(self):
+        self.assertResultsEqual(
+            PartitionedProjectBear,
+            file_dict={},
+            expected=[])
+        self.assertResultsEqual(
+            PartitionedProjectBear,
+            file_dict={'fileX': [],
+                       'fileY': ['hello']},
+            expected=['fileX:[]',
+                      "fileY:['hello']"])
+
 
 # Execute the same tests from ProjectBearTest, but use a ThreadPoolExecutor
 # instead. It shall also seamlessly work with Python threads. Also there are
@@ -192,3 +210,32 @@ class ProjectBearOnThreadPoolExecutorTest(ProjectBearTest):
             mock.assert_called_once_with(ANY, filedict2)
             self.assertEqual(len(cache), 1)
             self.assertEqual(len(next(iter(cache.values()))), 2)
+
+    def test_cache_partitions(self):
+        section = Section('test-section')
+        filedict1 = {'fileX': [], 'fileY': ['hello']}
+        filedict2 = {'fileX': [], 'fileY': ['hello\n', 'world']}
+        cache = {}
+
+        with patch.object(PartitionedProjectBear, 'analyze',
+                          autospec=True,
+                          side_effect=PartitionedProjectBear.analyze) as mock:
+            self.assertResultsEqual(PartitionedProjectBear,
+                                    section=section,
+                                    file_dict=filedict1,
+                                    cache=cache,
+                                    expected=['fileX:[]',
+                                              "fileY:['hello']"])
+            self.assertEqual(mock.call_count, 2)
+
+            mock.reset_mock()
+
+            # Only the partition of the changed file is analyzed again.
+            self.assertResultsEqual(PartitionedProjectBear,
+                                    section=section,
+                                    file_dict=filedict2,
+                                    cache=cache,
+                                    expected=['fileX:[]',
+                                              "fileY:['hello\\n', 'world']"])
+            mock.assert_called_once_with(ANY, {'fileY': ['hello\n', 'world']})
+            self.assertEqual(len(next(iter(cache.values()))), 3)
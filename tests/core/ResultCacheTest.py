@@ -0,0 +1,224 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+import pickle
+import sqlite3
+import tempfile
+import unittest
+import unittest.mock
+
+from coalib.core.ResultCache import get_bear_key, SQLiteCache
+from coalib.settings.Section import Section
+
+from tests.core.CoreTestBase import CoreTestBase
+from tests.core.CoreTest import CustomTasksBear
+
+
+class VersionedBear(CustomTasksBear):
+    VERSION = '1.0'
+
+
+class SQLiteCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'results.db')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_get_bear_key(self):
+        self.assertEqual(
+            get_bear_key(CustomTasksBear),
+            ('tests.core.CoreTest.CustomTasksBear',
+             ':' + CustomTasksBear.version_fingerprint))
+        self.assertEqual(
+            get_bear_key(VersionedBear),
+            ('tests.core.ResultCacheTest.VersionedBear',
+             '1.0:' + VersionedBear.version_fingerprint))
+
+    def test_bear_changed(self):
+        with SQLiteCache(self.path) as cache:
+            cache[VersionedBear][b'a'] = [1]
+
+        with unittest.mock.patch.object(VersionedBear, '_version_fingerprint',
+                                        'changed', create=True):
+            with SQLiteCache(self.path) as cache:
+                self.assertNotIn(b'a', cache[VersionedBear])
+                self.assertNotIn(b'a', cache[CustomTasksBear])
+
+        with SQLiteCache(self.path) as cache:
+            self.assertEqual(cache[VersionedBear][b'a'], [1])
+
+    def test_default_path(self):
+        with unittest.mock.patch(
+                'coalib.core.ResultCache.get_data_path',
+                return_value=os.path.join(self.directory.name, 'default')):
+            with SQLiteCache() as cache:
+                self.assertEqual(
+                    cache.path,
+                    os.path.join(self.directory.name, 'default.db'))
+
+    def test_table(self):
+        with SQLiteCache(self.path) as cache:
+            table = cache[CustomTasksBear]
+            self.assertIs(cache[CustomTasksBear], table)
+            self.assertIn(CustomTasksBear, cache)
+            self.assertEqual(list(cache), [CustomTasksBear])
+            self.assertEqual(len(cache), 1)
+
+            self.assertEqual(len(table), 0)
+            self.assertNotIn(b'a', table)
+            with self.assertRaises(KeyError):
+                table[b'a']
+
+            table[b'a'] = [1, 2]
+            table[b'b'] = []
+            self.assertIn(b'a', table)
+            self.assertEqual(table[b'a'], [1, 2])
+            self.assertEqual(sorted(table), [b'a', b'b'])
+            self.assertEqual(len(table), 2)
+
+            table[b'a'] = [3]
+            self.assertEqual(table[b'a'], [3])
+
+            del table[b'a']
+            self.assertNotIn(b'a', table)
+            with self.assertRaises(KeyError):
+                del table[b'a']
+
+            # Tables of other bears are independent.
+            self.assertEqual(len(cache[VersionedBear]), 0)
+
+    def test_get_many(self):
+        with SQLiteCache(self.path) as cache:
+            table = cache[CustomTasksBear]
+            for i in range(1000):
+                table[i.to_bytes(2, 'big')] = [i]
+
+            fingerprints = [i.to_bytes(2, 'big') for i in range(0, 2000, 2)]
+            found = table.get_many(fingerprints)
+            self.assertEqual(found, {i.to_bytes(2, 'big'): [i]
+                                     for i in range(0, 1000, 2)})
+            self.assertEqual(table.get_many([]), {})
+            self.assertEqual(cache[VersionedBear].get_many(fingerprints), {})
+
+    def test_persistence(self):
+        with SQLiteCache(self.path) as cache:
+            cache[CustomTasksBear][b'a'] = [1, 2]
+
+        with SQLiteCache(self.path) as cache:
+            self.assertEqual(cache[CustomTasksBear][b'a'], [1, 2])
+
+    def test_set_and_delete_table(self):
+        with SQLiteCache(self.path) as cache:
+            cache[CustomTasksBear][b'a'] = [1]
+            cache[CustomTasksBear] = {b'b': [2], b'c': [3]}
+            self.assertEqual(dict(cache[CustomTasksBear]),
+                             {b'b': [2], b'c': [3]})
+
+            # Assigning the table itself doesn't clear it.
+            cache[CustomTasksBear] = cache[CustomTasksBear]
+            self.assertEqual(len(cache[CustomTasksBear]), 2)
+
+            del cache[CustomTasksBear]
+            self.assertEqual(len(cache), 0)
+            self.assertEqual(len(cache[CustomTasksBear]), 0)
+
+    def test_version_partitioning(self):
+        with SQLiteCache(self.path) as cache:
+            cache[VersionedBear][b'a'] = [1]
+
+            with unittest.mock.patch.object(VersionedBear, 'VERSION', '2.0'):
+                self.assertNotIn(b'a', cache[VersionedBear])
+                cache[VersionedBear][b'a'] = [2]
+
+            self.assertEqual(cache[VersionedBear][b'a'], [1])
+
+    def test_eviction(self):
+        size = len(pickle.dumps([0] * 20, protocol=4))
+        with SQLiteCache(self.path, max_size=3 * size) as cache:
+            table = cache[CustomTasksBear]
+            for i in range(3):
+                table[bytes([i])] = [i] * 20
+
+            # Using a result keeps it from being evicted.
+            table[bytes([0])]
+            table[bytes([3])] = [3] * 20
+
+            self.assertEqual(sorted(table), [bytes([0]), bytes([2]),
+                                             bytes([3])])
+
+    def test_eviction_on_close(self):
+        cache = SQLiteCache(self.path)
+        for i in range(10):
+            cache[CustomTasksBear][bytes([i])] = [i] * 20
+        cache.max_size = 1
+        cache.close()
+
+        with SQLiteCache(self.path) as cache:
+            self.assertEqual(len(cache[CustomTasksBear]), 0)
+
+    def test_lookups_dont_write(self):
+        def used(fingerprint):
+            with sqlite3.connect(self.path) as connection:
+                return connection.execute(
+                    'SELECT used FROM results WHERE fingerprint = ?',
+                    (fingerprint,)).fetchone()[0]
+
+        with unittest.mock.patch('time.time', return_value=1.0):
+            cache = SQLiteCache(self.path)
+            cache[CustomTasksBear][b'a'] = [1]
+            cache[CustomTasksBear][b'b'] = [2]
+
+        with unittest.mock.patch('time.time', return_value=2.0):
+            self.assertEqual(cache[CustomTasksBear][b'a'], [1])
+            self.assertEqual(cache[CustomTasksBear].get_many([b'b', b'c']),
+                             {b'b': [2]})
+
+        self.assertEqual(used(b'a'), 1.0)
+        self.assertEqual(used(b'b'), 1.0)
+
+        cache.close()
+        self.assertEqual(used(b'a'), 2.0)
+        self.assertEqual(used(b'b'), 2.0)
+
+    def test_threads(self):
+        with SQLiteCache(self.path) as cache:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(
+                    lambda i: cache[CustomTasksBear].__setitem__(
+                        bytes([i]), [i]),
+                    range(20)))
+
+            self.assertEqual(len(cache[CustomTasksBear]), 20)
+
+
+class SQLiteCacheCoreTest(CoreTestBase):
+
+    def setUp(self):
+        self.executor = ThreadPoolExecutor, tuple(), dict(max_workers=1)
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'results.db')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_cache(self):
+        task_args = 10, 11, 12
+        bear = CustomTasksBear(Section('test-section'), {},
+                               tasks=[task_args])
+
+        with unittest.mock.patch.object(bear, 'analyze',
+                                        wraps=bear.analyze) as mock:
+            with SQLiteCache(self.path) as cache:
+                results = self.execute_run({bear}, cache)
+                mock.assert_called_once_with(*task_args)
+                self.assertEqual(results, list(task_args))
+
+            mock.reset_mock()
+
+            with SQLiteCache(self.path) as cache:
+                results = self.execute_run({bear}, cache)
+                self.assertFalse(mock.called)
+                self.assertEqual(results, list(task_args))
+                self.assertEqual(len(cache[CustomTasksBear]), 1)
@@ -1,4 +1,5 @@
 import os
+import pickle
 import unittest
 
 from coalib.io.File import File
@@ -56,3 +57,12 @@ class FileTest(unittest.TestCase):
     def test_name(self):
         self.assertEqual(get_path_components(self.uut.name)[-4:],
                          ['tests', 'io', 'file_test_files', 'test1.txt'])
+
+    def test_pickle(self):
+        self.uut.lines
+        pickled = pickle.dumps(self.uut)
+        self.assertNotIn(b'This is a test file.', pickled)
+
+        unpickled = pickle.loads(pickled)
+        self.assertEqual(unpickled, self.uut)
+        self.assertEqual(unpickled.lines, ('This is a test file.\n',))
@@ -1,12 +1,14 @@
 import unittest
 import os
+import unittest.mock
 from unittest.mock import patch
 
 from pyprint.NullPrinter import NullPrinter
 from pyprint.ConsolePrinter import ConsolePrinter
 
 from coalib.misc.Caching import (
-    FileCache, FileDictFileCache, ProxyMapFileCache)
+    FileCache, FileDictFileCache, FileStamp, MTIME_GRANULARITY_NS,
+    ProxyMapFileCache)
 from coalib.processes.Processing import get_file_dict
 from coalib.io.FileProxy import (FileProxy, FileProxyMap)
 from coalib.misc.CachingUtilities import pickle_load, pickle_dump
@@ -78,6 +80,91 @@ class CachingTest(unittest.TestCase):
         cache.current_time = 2
         self.assertEqual(cache.get_uncached_files({file_path}), set())
 
+    def test_get_uncached_files_track_content(self):
+        with make_temp() as filename:
+            with open(filename, 'w') as file:
+                file.write('coala')
+            # The file is stamped long after the modification.
+            os.utime(filename, (1, 1))
+
+            cache = FileCache(self.log_printer, 'coala_test4',
+                              flush_cache=True, track_content=True)
+            cache.track_files({filename})
+            self.assertEqual(cache.get_uncached_files({filename}),
+                             {filename})
+            cache.write()
+            self.assertIsInstance(cache.data[filename], FileStamp)
+
+            cache = FileCache(self.log_printer, 'coala_test4',
+                              track_content=True)
+            self.assertEqual(cache.get_uncached_files({filename}), set())
+
+            # Resetting the modification time alone doesn't uncache the file.
+            os.utime(filename, (0, 0))
+            self.assertEqual(cache.get_uncached_files({filename}), set())
+            cache.write()
+
+            cache = FileCache(self.log_printer, 'coala_test4',
+                              track_content=True)
+            with open(filename, 'w') as file:
+                file.write('bears')
+            os.utime(filename, (0, 0))
+            # Size and modification time are unchanged, but the file was
+            # stamped right before the change so the digest is checked.
+            cache.data[filename] = cache.data[filename]._replace(
+                time_ns=MTIME_GRANULARITY_NS)
+            self.assertEqual(cache.get_uncached_files({filename}),
+                             {filename})
+
+            with open(filename, 'w') as file:
+                file.write('coala bears')
+            self.assertEqual(cache.get_uncached_files({filename}),
+                             {filename})
+
+        self.assertEqual(cache.get_uncached_files({filename}), {filename})
+        cache.write()
+        self.assertEqual(cache.data[filename], -1)
+
+    def test_change_after_stamp(self):
+        with make_temp() as filename:
+            with open(filename, 'w') as file:
+                file.write('coala')
+            mtime_ns = os.stat(filename).st_mtime_ns
+
+            cache = FileCache(self.log_printer, 'coala_test7',
+                              flush_cache=True, track_content=True)
+            cache.track_files({filename})
+            cache.get_uncached_files({filename})
+
+            # Changed within the same modification time tick after it was
+            # stamped, in a run taking longer than that tick.
+            with open(filename, 'w') as file:
+                file.write('bears')
+            os.utime(filename, ns=(mtime_ns, mtime_ns))
+            with unittest.mock.patch(
+                    'time.time',
+                    return_value=mtime_ns / 10 ** 9 + 60):
+                cache.write()
+
+            cache = FileCache(self.log_printer, 'coala_test7',
+                              track_content=True)
+            self.assertEqual(cache.get_uncached_files({filename}),
+                             {filename})
+
+    def test_old_stamps(self):
+        # Stamps of caches not recording when they were taken are not trusted.
+        stamp = FileStamp(5, 0, b'digest')
+        self.assertEqual(stamp.time_ns, 0)
+        self.assertTrue(FileCache._is_ambiguous(stamp))
+
+    def test_track_content_mismatch(self):
+        cache = FileCache(self.log_printer, 'coala_test5', flush_cache=True)
+        cache.track_files({'file.c'})
+        cache.write()
+
+        cache = FileCache(self.log_printer, 'coala_test5', track_content=True)
+        self.assertEqual(cache.data, {})
+
     def test_persistence(self):
         with FileCache(self.log_printer, 'test3', flush_cache=True) as cache:
             cache.track_files({'file.c'})
@@ -86,6 +173,69 @@ class CachingTest(unittest.TestCase):
         with FileCache(self.log_printer, 'test3', flush_cache=False) as cache:
             self.assertTrue('file.c' in cache.data)
 
+    def test_bear_times(self):
+        with FileCache(self.log_printer, 'test4', flush_cache=True) as cache:
+            self.assertEqual(cache.bear_times, {})
+            cache.add_bear_times({'ABear': (1.0, 10), 'BBear': (4.0, 0)})
+            cache.add_bear_times({'ABear': (2.0, 20)})
+        self.assertEqual(cache.bear_times, {'ABear': 0.1, 'BBear': 4.0})
+
+        with FileCache(self.log_printer, 'test4') as cache:
+            self.assertEqual(cache.bear_times, {'ABear': 0.1, 'BBear': 4.0})
+            # Times of bears that ran are replaced by the new ones.
+            cache.add_bear_times({'ABear': (1.0, 5)})
+        self.assertEqual(cache.bear_times, {'ABear': 0.2, 'BBear': 4.0})
+
+        cache = FileCache(self.log_printer, 'test4', flush_cache=True)
+        self.assertEqual(cache.bear_times, {})
+
+    def test_ignore_ranges(self):
+        with make_temp() as filename:
+            with open(filename, 'w') as file:
+                file.write('a = 1  # noqa\nb = 2\n')
+            # The file is stamped long after the modification.
+            os.utime(filename, (1, 1))
+
+            file_dict = get_file_dict([filename])
+            with FileCache(self.log_printer, 'test6',
+                           flush_cache=True) as cache:
+                ranges = list(cache.get_ignore_ranges(file_dict))
+            self.assertEqual([range.start.line for _, range in ranges], [1])
+
+            cache = FileCache(self.log_printer, 'test6')
+            # Unchanged files are not read again.
+            file_dict = unittest.mock.MagicMock()
+            file_dict.__iter__.return_value = iter([filename])
+            self.assertEqual(list(cache.get_ignore_ranges(file_dict)), ranges)
+            file_dict.__getitem__.assert_not_called()
+
+            with open(filename, 'w') as file:
+                file.write('a = 1\nb = 2  # Ignore ABear\n')
+            file_dict = get_file_dict([filename])
+            ranges = list(cache.get_ignore_ranges(file_dict))
+            self.assertEqual([(bears, range.start.line)
+                              for bears, range in ranges],
+                             [(['abear'], 2)])
+
+        # Files which don't exist anymore are left out.
+        file_dict = get_file_dict([filename])
+        self.assertEqual(list(cache.get_ignore_ranges(file_dict)), [])
+
+        # Ranges of files not checked in a run are dropped.
+        with make_temp() as filename:
+            with open(filename, 'w') as file:
+                file.write('a = 1  # noqa\n')
+            with FileCache(self.log_printer, 'test6') as cache:
+                list(cache.get_ignore_ranges(get_file_dict([filename])))
+            self.assertIn(filename, cache.ignore_ranges)
+
+            with FileCache(self.log_printer, 'test6') as cache:
+                self.assertIn(filename, cache.ignore_ranges)
+            self.assertEqual(cache.ignore_ranges, {})
+
+        cache = FileCache(self.log_printer, 'test6', flush_cache=True)
+        self.assertEqual(cache.ignore_ranges, {})
+
     def test_time_travel(self):
         cache = FileCache(self.log_printer, 'coala_test2', flush_cache=True)
         cache.track_files({'file.c'})
@@ -1,11 +1,13 @@
+import hashlib
 import os
 import unittest
+import unittest.mock
 
 from pyprint.NullPrinter import NullPrinter
 
 from coalib.misc.CachingUtilities import (
     get_settings_hash, settings_changed, update_settings_db,
-    get_data_path, pickle_load, pickle_dump, delete_files)
+    get_data_path, pickle_load, pickle_dump, delete_files, file_digest)
 from coalib.output.printers.LogPrinter import LogPrinter
 from coalib.settings.Section import Section
 
@@ -24,6 +26,30 @@ class CachingUtilitiesTest(unittest.TestCase):
         self.assertEqual(pickle_load(
             self.log_printer, 'corrupt_file', fallback=42), 42)
 
+    def test_file_digest(self):
+        file_path = get_data_path(self.log_printer, 'digest_file')
+        with open(file_path, 'wb') as f:
+            f.write(b'coala' * 100)
+
+        digest = file_digest(file_path)
+        self.assertEqual(len(digest), 16)
+        self.assertEqual(file_digest(file_path, chunk_size=7), digest)
+
+        with open(file_path, 'wb') as f:
+            f.write(b'coala')
+        self.assertNotEqual(file_digest(file_path), digest)
+
+    def test_file_digest_without_blake2b(self):
+        file_path = get_data_path(self.log_printer, 'digest_file')
+        with open(file_path, 'wb') as f:
+            f.write(b'coala' * 100)
+
+        with unittest.mock.patch(
+                'coalib.misc.CachingUtilities._new_digest_generator',
+                hashlib.sha1):
+            digest = file_digest(file_path)
+        self.assertEqual(digest, hashlib.sha1(b'coala' * 100).digest()[:16])
+
     def test_delete_files(self):
         pickle_dump(self.log_printer, 'coala_test', {'answer': 42})
         self.assertTrue(delete_files(
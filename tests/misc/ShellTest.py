@@ -1,10 +1,12 @@
+import asyncio
 from contextlib import ExitStack
 import os
 import sys
 from tempfile import NamedTemporaryFile
 import unittest
 
-from coalib.misc.Shell import run_interactive_shell_command, run_shell_command
+from coalib.misc.Shell import (
+    run_interactive_shell_command, run_shell_command, run_shell_command_async)
 
 
 class RunShellCommandTest(unittest.TestCase):
@@ -91,3 +93,20 @@ class RunShellCommandTest(unittest.TestCase):
     def test_run_shell_command_kwargs_delegation(self):
         with self.assertRaises(TypeError):
             run_shell_command('super-cool-command', weird_parameter2='abc')
+
+    def test_run_shell_command_async(self):
+        command = RunShellCommandTest.construct_testscript_command(
+            'test_input_program.py')
+
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        asyncio.get_child_watcher().attach_loop(loop)
+
+        result = loop.run_until_complete(
+            run_shell_command_async(command, '1  4  10  22', loop=loop))
+        self.assertEqual(result, ('37\n', ''))
+        self.assertEqual(result.code, 0)
+
+        result = loop.run_until_complete(
+            run_shell_command_async(command, '1 p 5', loop=loop))
+        self.assertEqual(result, ('', 'INVALID INPUT\n'))
@@ -1,3 +1,5 @@
+import io
+import json
 import os
 import unittest
 from unittest.mock import patch
@@ -17,12 +19,14 @@ from coala_utils.ContextManagers import (
 from coalib.output.ConsoleInteraction import (
     acquire_actions_and_apply, acquire_settings, get_action_info, nothing_done,
     print_affected_files, print_result, print_results,
-    print_results_formatted, print_results_no_input, print_section_beginning,
+    print_results_formatted, print_results_json_lines, print_results_no_input,
+    print_section_beginning,
     show_bear, show_bears, ask_for_action_and_apply, print_diffs_info,
     show_language_bears_capabilities)
 from coalib.output.ConsoleInteraction import (BackgroundSourceRangeStyle,
                                               BackgroundMessageStyle,
                                               highlight_text)
+from coalib.output.JSONEncoder import create_json_encoder
 from coalib.output.printers.ListLogPrinter import ListLogPrinter
 from coalib.parsing.DefaultArgParser import default_arg_parser
 from coalib.results.Diff import Diff
@@ -1158,3 +1162,26 @@ class PrintFormattedResultsTest(unittest.TestCase):
             self.assertEqual(retval, 0)
             self.assertEqual(['JavaTestBear', 'SpaceConsistencyTestBear'],
                              [bear.strip() for bear in stdout.splitlines()])
+
+
+class PrintJSONLinesResultsTest(unittest.TestCase):
+
+    def test_print_results_json_lines(self):
+        stream = io.StringIO()
+        results = [Result('SomeBear', 'a'),
+                   Result.from_values('OtherBear', 'b', 'some_file', 5)]
+        print_results_json_lines(stream,
+                                 create_json_encoder(),
+                                 None,
+                                 Section('t'),
+                                 results,
+                                 {},
+                                 {})
+
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual([line['section'] for line in lines], ['t', 't'])
+        self.assertEqual([(line['result']['origin'], line['result']['message'])
+                          for line in lines],
+                         [('SomeBear', 'a'), ('OtherBear', 'b')])
+        self.assertEqual(
+            lines[1]['result']['affected_code'][0]['start']['line'], 5)
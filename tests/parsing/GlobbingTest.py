@@ -17,10 +17,12 @@ GlobTestDir
 import os
 import re
 import unittest
+from unittest.mock import patch
 
 from coalib.parsing.Globbing import (
     _iter_alternatives, _iter_choices, _position_is_bracketed, fnmatch, glob,
-    glob_escape)
+    glob_escape, iglob_files, GlobSet)
+from coalib.misc.Compatibility import scandir
 
 
 class TestFiles:
@@ -230,6 +232,55 @@ class FnmatchTest(unittest.TestCase):
         self._test_fnmatch(pattern, matches, non_matches)
 
 
+class GlobSetTest(unittest.TestCase):
+
+    def test_match(self):
+        glob_set = GlobSet(['*.py', os.path.join('**', 'src', '*.(c|h)'),
+                            'Makefile', 'README*', '*.p[ly]'])
+        for name in ('setup.py', 'x.pl', 'Makefile', 'README.md',
+                     os.path.join('a', 'src', 'main.c'),
+                     os.path.join('a', 'b', 'src', 'main.h')):
+            self.assertTrue(glob_set.match(name), name)
+
+        for name in ('setup.pyc', os.path.join('a', 'setup.py'), 'x.c',
+                     os.path.join('a', 'src', 'main.cpp'), 'Makefile.am',
+                     os.path.join('a', 'README')):
+            self.assertFalse(glob_set.match(name), name)
+
+    def test_matching_globs(self):
+        glob_set = GlobSet(['*.py', 'setup.(py|cfg)', 'setup*', '*.c', ''])
+        self.assertEqual(list(glob_set.iter_matching_globs('setup.py')),
+                         ['*.py', 'setup.(py|cfg)', 'setup*'])
+        self.assertEqual(list(glob_set.iter_matching_indexes('setup.cfg')),
+                         [1, 2])
+        self.assertEqual(glob_set.matching_glob('main.c'), '*.c')
+        self.assertIsNone(glob_set.matching_glob('main.h'))
+
+    def test_empty(self):
+        self.assertFalse(GlobSet([]).match('name'))
+        self.assertIsNone(GlobSet([]).matching_glob('name'))
+
+    def test_many_globs(self):
+        globs = ['file{}.*'.format(i) for i in range(250)]
+        glob_set = GlobSet(globs)
+        self.assertEqual(list(glob_set.iter_matching_globs('file200.py')),
+                         ['file200.*'])
+        self.assertFalse(glob_set.match('file250.py'))
+
+    def test_consistent_with_fnmatch(self):
+        globs = ['*.py', '**.c', os.path.join('*', 'file?.x'), '[!a]*',
+                 '(a|b)*.(y|z)']
+        names = ['a.py', os.path.join('dir', 'a.c'), 'b.z', 'a.x',
+                 os.path.join('dir', 'file1.x'), 'c.q']
+        glob_set = GlobSet(globs)
+        for name in names:
+            self.assertEqual(glob_set.match(name), any(
+                fnmatch(name, glob) for glob in globs), name)
+            self.assertEqual(
+                list(glob_set.iter_matching_globs(name)),
+                [glob for glob in globs if fnmatch(name, glob)])
+
+
 class GlobTest(unittest.TestCase):
 
     def setUp(self):
@@ -376,3 +427,103 @@ class GlobTest(unittest.TestCase):
         file_list = sorted([os.path.normcase(f) for f in file_list])
         self.assertEqual(results, file_list)
         os.curdir = old_curdir
+
+
+class IglobFilesTest(unittest.TestCase):
+
+    def _test_iglob_files(self, patterns, file_list, ignored_patterns=None):
+        results = sorted(os.path.normcase(path) for path, _ in
+                         iglob_files(patterns, ignored_patterns)
+                         if re.search(r'(__pycache__|\.pyc)', path) is None)
+        self.assertEqual(results,
+                         sorted(os.path.normcase(f) for f in file_list))
+
+    def test_patterns(self):
+        self._test_iglob_files(
+            os.path.join(TestFiles.glob_test_dir, 'Sub*', 'File1?.py'),
+            [TestFiles.file11, TestFiles.file12])
+        self._test_iglob_files(
+            [os.path.join(TestFiles.glob_test_dir, '**', 'File(1|3).*'),
+             TestFiles.file2,
+             os.path.join(TestFiles.glob_test_dir, 'Nonexisting')],
+            [TestFiles.file1, TestFiles.file3, TestFiles.file2])
+        self._test_iglob_files(
+            os.path.join(TestFiles.glob_test_dir, '**'),
+            [TestFiles.file1, TestFiles.file2, TestFiles.file3,
+             TestFiles.file11, TestFiles.file12, TestFiles.file_paren,
+             TestFiles.file_brack])
+        # Directories aren't collected.
+        self._test_iglob_files(
+            os.path.join(TestFiles.glob_test_dir, 'Sub*'), [])
+
+    def test_matching_patterns(self):
+        pattern1 = os.path.join(TestFiles.glob_test_dir, '*', '*.py')
+        pattern2 = os.path.join(TestFiles.glob_test_dir, '**', 'File11.py')
+        self.assertEqual(
+            sorted(iglob_files([pattern1, pattern2])),
+            sorted([(TestFiles.file11, pattern1),
+                    (TestFiles.file11, pattern2),
+                    (TestFiles.file12, pattern1)]))
+
+    def test_parent_directory_patterns(self):
+        other_files = [os.path.join(TestFiles.dir1, os.pardir, 'SubDir2',
+                                    os.path.basename(path))
+                       for path in (TestFiles.file_paren,
+                                    TestFiles.file_brack)]
+        self._test_iglob_files(
+            [os.path.join(TestFiles.dir1, '**.py'),
+             os.path.join(TestFiles.dir1, os.pardir, 'SubDir2', '*.txt')],
+            [TestFiles.file11, TestFiles.file12] + other_files)
+
+        cwd = os.getcwd()
+        os.chdir(TestFiles.dir1)
+        self.addCleanup(os.chdir, cwd)
+        self._test_iglob_files(
+            ['**.py', os.path.join(os.pardir, 'SubDir2', '*.txt')],
+            ['File11.py', 'File12.py'] +
+            [os.path.relpath(path) for path in other_files])
+
+    def test_ignored_patterns(self):
+        pattern = os.path.join(TestFiles.glob_test_dir, '**', '*.*')
+        for ignored in (TestFiles.dir1,
+                        TestFiles.dir1 + os.sep,
+                        os.path.join(TestFiles.dir1, '**'),
+                        os.path.join(TestFiles.glob_test_dir, '*1')):
+            self._test_iglob_files(
+                pattern,
+                [TestFiles.file1, TestFiles.file2, TestFiles.file3,
+                 TestFiles.file_paren, TestFiles.file_brack],
+                [ignored])
+
+        self._test_iglob_files(
+            [TestFiles.file11, os.path.join(TestFiles.dir1, '*')],
+            [],
+            [TestFiles.glob_test_dir])
+
+    def test_ignored_directories_not_walked(self):
+        scanned = []
+
+        def scandir_mock(path):
+            scanned.append(path)
+            return scandir(path)
+
+        with patch('coalib.parsing.Globbing.scandir', scandir_mock):
+            list(iglob_files(os.path.join(TestFiles.glob_test_dir, '**'),
+                             [TestFiles.dir1]))
+
+        self.assertIn(TestFiles.dir2, scanned)
+        self.assertNotIn(TestFiles.dir1, scanned)
+
+    def test_depth(self):
+        scanned = []
+
+        def scandir_mock(path):
+            scanned.append(path)
+            return scandir(path)
+
+        with patch('coalib.parsing.Globbing.scandir', scandir_mock):
+            self._test_iglob_files(
+                os.path.join(TestFiles.glob_test_dir, '*.x'),
+                [TestFiles.file1])
+
+        self.assertEqual(scanned, [TestFiles.glob_test_dir])
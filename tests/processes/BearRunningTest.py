@@ -1,4 +1,3 @@
-import multiprocessing
 import queue
 import unittest
 
@@ -92,6 +91,22 @@ class GlobalTestBear(GlobalBear):
         return result
 
 
+class BatchBear(LocalBear):
+
+    BATCH_SIZE = 2
+
+    def prepare_batch(self, filenames, files):
+        if 'fail' in filenames:
+            raise ValueError('Preparation failed.')
+        self.prepared = dict(zip(filenames, files))
+
+    def run(self, filename, file):
+        return [Result.from_values('BatchBear',
+                                   self.prepared.pop(filename,
+                                                     'not prepared'),
+                                   filename)]
+
+
 class UnexpectedBear1(LocalBear):
 
     def run(self, filename, file):
@@ -115,9 +130,6 @@ class BearRunningUnitTest(unittest.TestCase):
         self.global_bear_list = []
         self.global_bear_queue = queue.Queue()
         self.file_dict = {}
-        manager = multiprocessing.Manager()
-        self.local_result_dict = manager.dict()
-        self.global_result_dict = manager.dict()
         self.message_queue = queue.Queue()
         self.control_queue = queue.Queue()
 
@@ -151,18 +163,17 @@ class BearRunningUnitTest(unittest.TestCase):
         self.global_bear_list.append(DependentGlobalBear({},
                                                          self.settings,
                                                          self.message_queue))
-        self.global_bear_queue.put(1)
-        self.global_bear_queue.put(0)
-        self.file_name_queue.put('t')
+        self.global_bear_queue.put([0, 1])
+        self.file_name_queue.put((['t'], [0, 1]))
         self.file_dict['t'] = []
 
+        self.file_name_queue.put(None)
+        self.global_bear_queue.put(None)
         run(self.file_name_queue,
             self.local_bear_list,
             self.global_bear_list,
             self.global_bear_queue,
             self.file_dict,
-            self.local_result_dict,
-            self.global_result_dict,
             self.message_queue,
             self.control_queue)
 
@@ -173,22 +184,106 @@ class BearRunningUnitTest(unittest.TestCase):
         except queue.Empty:
             pass
 
+    def test_unresolved_global_dependencies(self):
+        self.global_bear_list.append(DependentGlobalBear({},
+                                                         self.settings,
+                                                         self.message_queue))
+        self.global_bear_queue.put([0])
+
+        self.file_name_queue.put(None)
+        self.global_bear_queue.put(None)
+        run(self.file_name_queue,
+            self.local_bear_list,
+            self.global_bear_list,
+            self.global_bear_queue,
+            self.file_dict,
+            self.message_queue,
+            self.control_queue)
+
+        self.assertEqual(self.message_queue.get(timeout=0).log_level,
+                         LOG_LEVEL.WARNING)
+        self.assertEqual(self.control_queue.get(timeout=0),
+                         (CONTROL_ELEMENT.LOCAL_FINISHED, {}))
+        self.assertEqual(self.control_queue.get(timeout=0),
+                         (CONTROL_ELEMENT.GLOBAL_FINISHED, None))
+
+    def test_unreadable_file(self):
+        class UnreadableFileDict(dict):
+            def __getitem__(self, key):
+                raise KeyError(key)
+
+        self.local_bear_list.append(SimpleBear(self.settings,
+                                               self.message_queue))
+        self.file_name_queue.put((['unreadable'], [0]))
+        self.file_name_queue.put(None)
+        self.global_bear_queue.put(None)
+        run(self.file_name_queue,
+            self.local_bear_list,
+            self.global_bear_list,
+            self.global_bear_queue,
+            UnreadableFileDict({'unreadable': None}),
+            self.message_queue,
+            self.control_queue)
+
+        self.assertTrue(self.message_queue.empty())
+        self.assertEqual(self.control_queue.get(timeout=0),
+                         (CONTROL_ELEMENT.LOCAL_FINISHED, {}))
+
+    def test_batch(self):
+        bear = BatchBear(self.settings, self.message_queue)
+        bear.prepared = {}
+        self.local_bear_list.append(bear)
+        self.file_dict.update({'a': 'content a', 'b': 'content b',
+                               'fail': 'content', 'c': 'content'})
+        self.file_name_queue.put((['a', 'b', 'unknown'], [0]))
+        self.file_name_queue.put((['fail', 'c'], [0]))
+
+        self.file_name_queue.put(None)
+        self.global_bear_queue.put(None)
+        run(self.file_name_queue,
+            self.local_bear_list,
+            self.global_bear_list,
+            self.global_bear_queue,
+            self.file_dict,
+            self.message_queue,
+            self.control_queue)
+
+        for filename in ('a', 'b'):
+            self.assertEqual(
+                self.control_queue.get(timeout=0),
+                (CONTROL_ELEMENT.LOCAL,
+                 (filename, [Result.from_values('BatchBear',
+                                                'content ' + filename,
+                                                filename)])))
+        self.assertEqual(bear.prepared, {})
+
+        # Bears failing to prepare a batch run on each file on their own.
+        for filename in ('fail', 'c'):
+            self.assertEqual(
+                self.control_queue.get(timeout=0),
+                (CONTROL_ELEMENT.LOCAL,
+                 (filename, [Result.from_values('BatchBear',
+                                                'not prepared',
+                                                filename)])))
+        self.assertTrue(any('Preparation failed.' in message.message
+                            for message in list(self.message_queue.queue)))
+
     def test_evil_bear(self):
         self.settings.append(Setting('cls', 'NotImplementedError'))
 
         self.local_bear_list.append(
             RaiseTestExecuteBear(self.settings, self.message_queue))
 
-        self.file_name_queue.put('t')
+        self.file_name_queue.put((['t'], [0]))
         self.file_dict['t'] = []
 
+        self.file_name_queue.put(None)
+        self.global_bear_queue.put(None)
         run(self.file_name_queue,
             self.local_bear_list,
             self.global_bear_list,
             self.global_bear_queue,
             self.file_dict,
-            self.local_result_dict,
-            self.global_result_dict,
             self.message_queue,
             self.control_queue)
 
@@ -199,32 +294,32 @@ class BearRunningUnitTest(unittest.TestCase):
         self.local_bear_list.append(
             RaiseTestExecuteBear(self.settings, self.message_queue))
 
-        self.file_name_queue.put('t')
+        self.file_name_queue.put((['t'], [0]))
         self.file_dict['t'] = []
 
         with self.assertRaisesRegex(KeyboardInterrupt, 'fake error'):
+            self.file_name_queue.put(None)
+            self.global_bear_queue.put(None)
             run(self.file_name_queue,
                 self.local_bear_list,
                 self.global_bear_list,
                 self.global_bear_queue,
                 self.file_dict,
-                self.local_result_dict,
-                self.global_result_dict,
                 self.message_queue,
                 self.control_queue,
                 debug=True,
                 )
 
-        self.file_name_queue.put('t')
+        self.file_name_queue.put((['t'], [0]))
         self.file_dict['t'] = []
 
+        self.file_name_queue.put(None)
+        self.global_bear_queue.put(None)
         run(self.file_name_queue,
             self.local_bear_list,
             self.global_bear_list,
             self.global_bear_queue,
             self.file_dict,
-            self.local_result_dict,
-            self.global_result_dict,
             self.message_queue,
             self.control_queue,
             debug=False,
@@ -237,29 +332,29 @@ class BearRunningUnitTest(unittest.TestCase):
         self.local_bear_list.append(
             RaiseTestExecuteBear(self.settings, self.message_queue))
 
-        self.file_name_queue.put('t')
+        self.file_name_queue.put((['t'], [0]))
         self.file_dict['t'] = []
 
         with self.assertRaisesRegex(OSError, 'fake error'):
+            self.file_name_queue.put(None)
+            self.global_bear_queue.put(None)
             run(self.file_name_queue,
                 self.local_bear_list,
                 self.global_bear_list,
                 self.global_bear_queue,
                 self.file_dict,
-                self.local_result_dict,
-                self.global_result_dict,
                 self.message_queue,
                 self.control_queue,
                 debug=True,
                 )
 
+        self.file_name_queue.put(None)
+        self.global_bear_queue.put(None)
         run(self.file_name_queue,
             self.local_bear_list,
             self.global_bear_list,
             self.global_bear_queue,
             self.file_dict,
-            self.local_result_dict,
-            self.global_result_dict,
             self.message_queue,
             self.control_queue,
             debug=False,
@@ -270,16 +365,16 @@ class BearRunningUnitTest(unittest.TestCase):
                                                     self.message_queue))
         self.local_bear_list.append(UnexpectedBear2(self.settings,
                                                     self.message_queue))
-        self.file_name_queue.put('t')
+        self.file_name_queue.put((['t'], [0, 1]))
         self.file_dict['t'] = []
 
+        self.file_name_queue.put(None)
+        self.global_bear_queue.put(None)
         run(self.file_name_queue,
             self.local_bear_list,
             self.global_bear_list,
             self.global_bear_queue,
             self.file_dict,
-            self.local_result_dict,
-            self.global_result_dict,
             self.message_queue,
             self.control_queue)
 
@@ -308,18 +403,15 @@ d
         self.global_bear_list = []
         self.global_bear_queue = queue.Queue()
         self.file_dict = {}
-        manager = multiprocessing.Manager()
-        self.local_result_dict = manager.dict()
-        self.global_result_dict = manager.dict()
         self.message_queue = queue.Queue()
         self.control_queue = queue.Queue()
 
         self.file1 = 'file1'
         self.file2 = 'arbitrary'
 
-        self.file_name_queue.put(self.file1)
-        self.file_name_queue.put(self.file2)
-        self.file_name_queue.put('invalid file')
+        self.file_name_queue.put(([self.file1], [0, 1]))
+        self.file_name_queue.put(([self.file2], [0, 1]))
+        self.file_name_queue.put((['invalid file'], [0, 1]))
         self.local_bear_list.append(LocalTestBear(self.settings,
                                                   self.message_queue))
         self.local_bear_list.append('not a valid bear')
@@ -329,17 +421,17 @@ d
                                                     self.settings,
                                                     self.message_queue))
         self.global_bear_list.append('not a valid bear')
-        self.global_bear_queue.put(0)
-        self.global_bear_queue.put(1)
+        self.global_bear_queue.put([0])
+        self.global_bear_queue.put([1])
 
     def test_run(self):
+        self.file_name_queue.put(None)
+        self.global_bear_queue.put(None)
         run(self.file_name_queue,
             self.local_bear_list,
             self.global_bear_list,
             self.global_bear_queue,
             self.file_dict,
-            self.local_result_dict,
-            self.global_result_dict,
             self.message_queue,
             self.control_queue)
 
@@ -362,9 +454,8 @@ d
                                                      'arbitrary')]
                                  ]
         for expected in local_result_expected:
-            control_elem, index = self.control_queue.get()
+            control_elem, (index, real) = self.control_queue.get()
             self.assertEqual(control_elem, CONTROL_ELEMENT.LOCAL)
-            real = self.local_result_dict[index]
             self.assertEqual(real, expected)
 
         global_results_expected = [Result.from_values(
@@ -380,18 +471,14 @@ d
 
         control_elem, index = self.control_queue.get()
         self.assertEqual(control_elem, CONTROL_ELEMENT.LOCAL_FINISHED)
-        control_elem, index = self.control_queue.get()
+        control_elem, (index, real) = self.control_queue.get()
         self.assertEqual(control_elem, CONTROL_ELEMENT.GLOBAL)
-        real = self.global_result_dict[index]
+        self.assertEqual(index, 'GlobalTestBear')
         self.assertEqual(sorted(global_results_expected), sorted(real))
 
         control_elem, none = self.control_queue.get(timeout=0)
         self.assertEqual(control_elem, CONTROL_ELEMENT.GLOBAL_FINISHED)
         self.assertEqual(none, None)
 
-        # The invalid bear gets a None in that dict for dependency resolution
-        self.assertEqual(len(self.global_result_dict), 2)
-        self.assertEqual(len(self.local_result_dict),
-                         len(local_result_expected))
         self.assertRaises(queue.Empty, self.message_queue.get, timeout=0)
         self.assertRaises(queue.Empty, self.control_queue.get, timeout=0)
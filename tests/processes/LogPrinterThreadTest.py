@@ -17,9 +17,7 @@ class LogPrinterThreadTest(unittest.TestCase):
         self.assertEqual(self.uut.message_queue.qsize(), 3)
         with LogCapture() as capture:
             self.uut.start()
-            while self.uut.message_queue.qsize() > 0:
-                continue
-            self.uut.running = False
+            self.uut.stop()
             self.uut.join()
         capture.check(
             ('root', 'INFO', 'Sample message 1'),
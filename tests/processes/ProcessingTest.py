@@ -2,11 +2,13 @@ import copy
 import logging
 import multiprocessing
 import os
+import pickle
 import platform
 import queue
 import subprocess
 import sys
 import unittest
+import unittest.mock
 
 from pyprint.ConsolePrinter import ConsolePrinter
 
@@ -14,13 +16,15 @@ from testfixtures import LogCapture, StringComparison
 
 from coalib.bears.Bear import Bear
 from coalib.output.printers.LogPrinter import LogPrinter
+from coalib.parsing.Globbing import fnmatch
 from coalib.output.printers.ListLogPrinter import ListLogPrinter
 from coalib.processes.CONTROL_ELEMENT import CONTROL_ELEMENT
 from coalib.processes.Processing import (
     ACTIONS, autoapply_actions, check_result_ignore, create_process_group,
     execute_section, get_default_actions, get_file_dict, print_result,
     process_queues, simplify_section_result, yield_ignore_ranges,
-    instantiate_bears)
+    instantiate_bears, get_bear_groups, get_local_bear_tasks, FileDict,
+    IgnoreRangeIndex, join_processes)
 from coalib.results.HiddenResult import HiddenResult
 from coalib.results.Result import RESULT_SEVERITY, Result
 from coalib.results.result_actions.ApplyPatchAction import ApplyPatchAction
@@ -45,6 +49,10 @@ p.terminate()
 """
 
 
+def put_large_payload(control_queue):
+    control_queue.put((CONTROL_ELEMENT.LOCAL, (0, ['x' * 1000000])))
+
+
 class DummyProcess(multiprocessing.Process):
 
     def __init__(self, control_queue, starts_dead=False):
@@ -235,14 +243,14 @@ class ProcessingTest(unittest.TestCase):
         #       is the same as expected will fail on Windows
         #       due to a problem with how coala handles path.
         self.assertEqual(self.unreadable_path.lower(),
-                         results[1].keys()[0].lower())
+                         list(results[1].keys())[0].lower())
 
         # HACK: This is due to the problem with how coala handles paths
         #       that makes it problematic for Windows compatibility
-        self.unreadable_path = results[1].keys()[0]
+        self.unreadable_path = list(results[1].keys())[0]
 
         self.assertEqual([bear.name for bear in self.global_bears['raw']],
-                         results[2].keys())
+                         list(results[2].keys()))
 
         self.assertEqual(results[1][self.unreadable_path],
                          [Result('LocalTestRawBear', 'test msg')])
@@ -255,24 +263,6 @@ class ProcessingTest(unittest.TestCase):
     def test_process_queues(self):
         ctrlq = queue.Queue()
 
-        # Append custom controlling sequences.
-
-        # Simulated process 1
-        ctrlq.put((CONTROL_ELEMENT.LOCAL, 1))
-        ctrlq.put((CONTROL_ELEMENT.LOCAL_FINISHED, None))
-        ctrlq.put((CONTROL_ELEMENT.GLOBAL, 1))
-
-        # Simulated process 2
-        ctrlq.put((CONTROL_ELEMENT.LOCAL, 2))
-
-        # Simulated process 1
-        ctrlq.put((CONTROL_ELEMENT.GLOBAL_FINISHED, None))
-
-        # Simulated process 2
-        ctrlq.put((CONTROL_ELEMENT.LOCAL_FINISHED, None))
-        ctrlq.put((CONTROL_ELEMENT.GLOBAL, 1))
-        ctrlq.put((CONTROL_ELEMENT.GLOBAL_FINISHED, None))
-
         first_local = Result.from_values('o', 'The first result.', file='f')
         second_local = Result.from_values('ABear',
                                           'The second result.',
@@ -287,24 +277,46 @@ class ProcessingTest(unittest.TestCase):
                                           file='f',
                                           line=7)
         first_global = Result('o', 'The one and only global result.')
+        local_results_1 = [first_local,
+                           second_local,
+                           third_local,
+                           # The following are to be ignored
+                           Result('o', 'm', severity=RESULT_SEVERITY.INFO),
+                           Result.from_values('ABear', 'u', 'f', 2, 1),
+                           Result.from_values('ABear', 'u', 'f', 3, 1)]
+        local_results_2 = [fourth_local,
+                           # The following are to be ignored
+                           HiddenResult('t', 'c'),
+                           Result.from_values('ABear', 'u', 'f', 5, 1),
+                           Result.from_values('ABear', 'u', 'f', 6, 1)]
+
+        # Append custom controlling sequences.
+
+        # Simulated process 1
+        ctrlq.put((CONTROL_ELEMENT.LOCAL, (1, local_results_1)))
+        ctrlq.put((CONTROL_ELEMENT.LOCAL_FINISHED, None))
+        ctrlq.put((CONTROL_ELEMENT.GLOBAL, (1, [first_global])))
+
+        # Simulated process 2
+        ctrlq.put((CONTROL_ELEMENT.LOCAL, (2, local_results_2)))
+
+        # Simulated process 1
+        ctrlq.put((CONTROL_ELEMENT.GLOBAL_FINISHED, None))
+
+        # Simulated process 2
+        ctrlq.put((CONTROL_ELEMENT.LOCAL_FINISHED, None))
+        ctrlq.put((CONTROL_ELEMENT.GLOBAL, (1, [first_global])))
+        ctrlq.put((CONTROL_ELEMENT.GLOBAL_FINISHED, None))
+
         section = Section('')
         section.append(Setting('min_severity', 'normal'))
+        local_result_dict = {}
+        global_result_dict = {}
         process_queues(
             [DummyProcess(control_queue=ctrlq) for i in range(3)],
             ctrlq,
-            {1: [first_local,
-                 second_local,
-                 third_local,
-                 # The following are to be ignored
-                 Result('o', 'm', severity=RESULT_SEVERITY.INFO),
-                 Result.from_values('ABear', 'u', 'f', 2, 1),
-                 Result.from_values('ABear', 'u', 'f', 3, 1)],
-             2: [fourth_local,
-                 # The following are to be ignored
-                 HiddenResult('t', 'c'),
-                 Result.from_values('ABear', 'u', 'f', 5, 1),
-                 Result.from_values('ABear', 'u', 'f', 6, 1)]},
-            {1: [first_global]},
+            local_result_dict,
+            global_result_dict,
             {'f': self.file_dict[self.factory_test_file]},
             lambda *args: self.queue.put(args[2]),
             section,
@@ -318,6 +330,127 @@ class ProcessingTest(unittest.TestCase):
         self.assertEqual(self.queue.get(timeout=0), ([first_global]))
         self.assertEqual(self.queue.get(timeout=0), ([first_global]))
 
+        self.assertEqual(local_result_dict, {1: [second_local, third_local],
+                                             2: [fourth_local]})
+        self.assertEqual(global_result_dict, {1: [first_global]})
+
+    def test_get_bear_groups(self):
+        class BearA:
+            BEAR_DEPS = set()
+
+        class BearB:
+            BEAR_DEPS = {BearA}
+
+        class BearC:
+            BEAR_DEPS = set()
+
+        class BearD:
+            BEAR_DEPS = {BearC, BearB}
+
+        class BearE:
+            # Dependencies outside of the list are ignored.
+            BEAR_DEPS = {Bear}
+
+        self.assertEqual(get_bear_groups([]), [])
+        self.assertEqual(
+            get_bear_groups(
+                [BearA(), BearC(), BearB(), BearE(), BearD(), 'invalid']),
+            [[0, 1, 2, 4], [3], [5]])
+
+    def test_get_local_bear_tasks(self):
+        class BearA:
+            BEAR_DEPS = set()
+
+        class BearB:
+            BEAR_DEPS = {BearA}
+
+        class BearC:
+            BEAR_DEPS = set()
+
+        small_file = self.unreadable_path
+        big_file = self.testcode_c_path
+        self.assertGreater(os.path.getsize(big_file),
+                           os.path.getsize(small_file))
+
+        bears = [BearA(), BearB(), BearC()]
+        self.assertEqual(get_local_bear_tasks(bears, [small_file, big_file]),
+                         [([big_file], [0, 1]),
+                          ([big_file], [2]),
+                          ([small_file], [0, 1]),
+                          ([small_file], [2])])
+
+        # Bears that took longer in previous runs are started first.
+        self.assertEqual(
+            get_local_bear_tasks(bears, [small_file, big_file],
+                                 {'BearA': 1.0, 'BearB': 1.0,
+                                  'BearC': 1000.0}),
+            [([big_file], [2]),
+             ([small_file], [2]),
+             ([big_file], [0, 1]),
+             ([small_file], [0, 1])])
+
+        # Bears without a time are assumed to take the average time.
+        self.assertEqual(
+            get_local_bear_tasks(bears, [big_file],
+                                 {'BearB': 1.0, 'BearC': 2.5}),
+            [([big_file], [0, 1]), ([big_file], [2])])
+
+        self.assertEqual(get_local_bear_tasks([], [small_file]),
+                         [([small_file], [])])
+
+    def test_get_local_bear_tasks_batches(self):
+        class BatchBear:
+            BEAR_DEPS = set()
+            BATCH_SIZE = 3
+
+        class DependentBatchBear:
+            BEAR_DEPS = {BatchBear}
+            BATCH_SIZE = 3
+
+        filenames = ['file{}'.format(i) for i in range(5)]
+        self.assertEqual(get_local_bear_tasks([BatchBear()], filenames),
+                         [(filenames[:3], [0]), (filenames[3:], [0])])
+
+        # Every process gets a batch.
+        self.assertEqual(
+            get_local_bear_tasks([BatchBear()], filenames, job_count=3),
+            [(filenames[:2], [0]), (filenames[2:4], [0]), (filenames[4:], [0])])
+
+        # Groups of multiple bears are not batched.
+        self.assertEqual(
+            get_local_bear_tasks([BatchBear(), DependentBatchBear()],
+                                 filenames[:2]),
+            [(filenames[:1], [0, 1]), (filenames[1:2], [0, 1])])
+
+    def test_process_queues_local_tasks(self):
+        ctrlq = queue.Queue()
+        first_result = Result('ABear', 'a', severity=RESULT_SEVERITY.MAJOR)
+        second_result = Result('BBear', 'b', severity=RESULT_SEVERITY.MAJOR)
+        cache = unittest.mock.Mock()
+        cache.get_ignore_ranges.return_value = []
+
+        ctrlq.put((CONTROL_ELEMENT.LOCAL, ('f', [first_result])))
+        ctrlq.put((CONTROL_ELEMENT.LOCAL, ('f', [second_result])))
+        ctrlq.put((CONTROL_ELEMENT.LOCAL_FINISHED, {'ABear': (1.0, 10)}))
+        ctrlq.put((CONTROL_ELEMENT.GLOBAL_FINISHED, None))
+
+        local_result_dict = {}
+        process_queues(
+            [DummyProcess(control_queue=ctrlq) for i in range(2)],
+            ctrlq,
+            local_result_dict,
+            {},
+            {'f': self.file_dict[self.factory_test_file]},
+            lambda *args: None,
+            Section(''),
+            cache,
+            self.log_printer,
+            self.console_printer)
+
+        self.assertEqual(local_result_dict,
+                         {'f': [first_result, second_result]})
+        cache.add_bear_times.assert_called_once_with({'ABear': (1.0, 10)})
+
     def test_dead_processes(self):
         ctrlq = queue.Queue()
         # Not enough FINISH elements in the queue, processes start already dead
@@ -351,6 +484,18 @@ class ProcessingTest(unittest.TestCase):
         with self.assertRaises(queue.Empty):
             self.queue.get(timeout=0)
 
+    def test_join_processes(self):
+        control_queue = multiprocessing.Queue()
+        process = multiprocessing.Process(target=put_large_payload,
+                                          args=(control_queue,))
+        process.start()
+
+        # The payload doesn't fit into the pipe, so the process can't exit
+        # before it is read.
+        join_processes([process], control_queue)
+        self.assertFalse(process.is_alive())
+        self.assertEqual(process.exitcode, 0)
+
     def test_create_process_group(self):
         p = create_process_group([sys.executable,
                                   '-c',
@@ -381,7 +526,7 @@ class ProcessingTest(unittest.TestCase):
     def test_get_file_dict_non_existent_file(self):
         with LogCapture() as capture:
             file_dict = get_file_dict(['non_existent_file'], self.log_printer)
-        self.assertEqual(file_dict, {})
+        self.assertEqual(len(file_dict), 0)
         capture.check(
             ('root', 'WARNING',
              StringComparison(r".*Failed to read file 'non_existent_file' "
@@ -392,7 +537,7 @@ class ProcessingTest(unittest.TestCase):
     def test_get_file_dict_allow_raw_file(self):
         file_dict = get_file_dict([self.unreadable_path], self.log_printer,
                                   True)
-        self.assertNotEqual(file_dict, {})
+        self.assertEqual(list(file_dict), [self.unreadable_path])
         self.assertEqual(file_dict[self.unreadable_path], None)
 
     def test_get_file_dict_forbid_raw_file(self):
@@ -400,13 +545,89 @@ class ProcessingTest(unittest.TestCase):
         with LogCapture() as capture:
             file_dict = get_file_dict([self.unreadable_path], log_printer,
                                       False)
-        self.assertEqual(file_dict, {})
+            # Files are only read when they are accessed.
+            self.assertEqual(len(file_dict), 1)
+            capture.check()
+            self.assertEqual(list(file_dict.items()), [])
+            with self.assertRaises(KeyError):
+                file_dict[self.unreadable_path]
+        # The file is reported only once.
         capture.check(
             ('root', 'WARNING', "Failed to read file '{}'. It seems to contain "
              'non-unicode characters. Leaving it out.'
                 .format(self.unreadable_path))
         )
 
+    def test_get_file_dict_lazy(self):
+        file_dict = get_file_dict([self.testcode_c_path,
+                                   self.unreadable_path])
+        file = dict.__getitem__(file_dict, self.testcode_c_path)
+        self.assertNotIn('lines', file.__dict__)
+
+        self.assertEqual(file_dict.get(self.testcode_c_path), file.lines)
+        self.assertEqual(file_dict.get(self.unreadable_path, 'default'),
+                         'default')
+        self.assertEqual(list(file_dict.values()), [file.lines])
+
+    def test_file_dict_unreadable_keys(self):
+        file_dict = get_file_dict([self.testcode_c_path,
+                                   self.unreadable_path])
+        files = dict.copy(file_dict)
+
+        # The keys are the names of all files, none of them is read.
+        self.assertEqual(len(file_dict), 2)
+        self.assertIn(self.unreadable_path, file_dict)
+        self.assertEqual(list(file_dict.keys()),
+                         [self.testcode_c_path, self.unreadable_path])
+        for file in files.values():
+            self.assertNotIn('lines', file.__dict__)
+
+        with LogCapture():
+            contents = {}
+            for filename in file_dict:
+                try:
+                    contents[filename] = file_dict[filename]
+                except KeyError:
+                    pass
+        self.assertEqual(contents,
+                         {self.testcode_c_path:
+                          files[self.testcode_c_path].lines})
+        self.assertEqual(dict(file_dict.items()), contents)
+        self.assertEqual(len(file_dict), 2)
+
+    def test_file_dict_subset(self):
+        file_dict = get_file_dict([self.testcode_c_path,
+                                   self.unreadable_path],
+                                  allow_raw_files=True)
+        subset = file_dict.subset([self.unreadable_path, 'other_file'])
+
+        self.assertIsInstance(subset, FileDict)
+        self.assertTrue(subset.allow_raw_files)
+        self.assertEqual(list(subset), [self.unreadable_path])
+        self.assertIs(dict.__getitem__(subset, self.unreadable_path),
+                      dict.__getitem__(file_dict, self.unreadable_path))
+        self.assertEqual(dict(subset.items()), {self.unreadable_path: None})
+
+    def test_file_dict_pickle(self):
+        file_dict = get_file_dict([self.testcode_c_path],
+                                  allow_raw_files=True)
+        lines = file_dict[self.testcode_c_path]
+        pickled = pickle.dumps(file_dict)
+        self.assertNotIn(lines[0].encode(), pickled)
+
+        unpickled = pickle.loads(pickled)
+        self.assertIsInstance(unpickled, FileDict)
+        self.assertTrue(unpickled.allow_raw_files)
+        self.assertEqual(unpickled, file_dict)
+
+    def test_file_dict_forked_process(self):
+        file_dict = get_file_dict([self.unreadable_path])
+        with LogCapture() as capture, \
+                unittest.mock.patch('os.getpid', return_value=-1):
+            self.assertEqual(dict(file_dict.items()), {})
+        # Only the process that created the file dict reports failures.
+        capture.check()
+
     def test_simplify_section_result(self):
         results = (True,
                    {'file1': [Result('a', 'b')], 'file2': None},
@@ -480,6 +701,42 @@ class ProcessingTest(unittest.TestCase):
                    SourceRange.from_values('d', 1, 1, 2, 2))]
         self.assertFalse(check_result_ignore(result, ranges))
 
+    def test_ignore_range_index(self):
+        ranges = [([], SourceRange.from_values('a', 5, 1, 5, 10)),
+                  (['xbear'], SourceRange.from_values('a', 1, 1, 20, 1)),
+                  (['y*'], SourceRange.from_values('a', 8, 1, 9, 1)),
+                  ([], SourceRange.from_values('b', 30, 1, 31, 1)),
+                  (['zbear'], SourceRange.from_values('b', None, None,
+                                                      None, None))]
+        index = IgnoreRangeIndex(ranges)
+
+        def result(origin, file, line=None, end_line=None):
+            return Result.from_values(origin, 'message', file=file,
+                                      line=line, end_line=end_line)
+
+        self.assertTrue(index.ignores(result('ABear', 'a', 5)))
+        self.assertFalse(index.ignores(result('ABear', 'a', 6)))
+        self.assertTrue(index.ignores(result('ABear', 'a', 2, 5)))
+        self.assertTrue(index.ignores(result('XBear (detail)', 'a', 19)))
+        self.assertFalse(index.ignores(result('XBear', 'a', 21)))
+        self.assertTrue(index.ignores(result('YBear', 'a', 9)))
+        self.assertFalse(index.ignores(result('YBear', 'a', 10)))
+        self.assertTrue(index.ignores(result('ABear', 'a')))
+        self.assertTrue(index.ignores(result('ZBear', 'b', 100)))
+        self.assertFalse(index.ignores(result('ABear', 'b', 29)))
+        self.assertFalse(index.ignores(result('ABear', 'c', 5)))
+        self.assertFalse(index.ignores(Result('ABear', 'message')))
+
+        for origin in ('ABear', 'XBear', 'YBear', 'ZBear'):
+            for file in ('a', 'b'):
+                for line in (None, 1, 5, 8, 10, 25, 30):
+                    result_ = result(origin, file, line)
+                    self.assertEqual(
+                        index.ignores(result_),
+                        any(result_.overlaps(range) and
+                            (not bears or fnmatch(origin.lower(), bears))
+                            for bears, range in ranges))
+
     def test_yield_ignore_ranges(self):
         test_file_dict_a = {'f': self.file_dict[self.a_bear_test_path]}
         test_ignore_range_a = list(yield_ignore_ranges(test_file_dict_a))